@@ -47,8 +47,7 @@ def create_4h_from_1h():
     df_4h['HMA_45'] = math_brain.calculate_hma(df_4h['close'], period=45)
     
     # 计算其他指标
-    df_4h['price_change'] = df_4h['close'].pct_change()
-    df_4h['hma_deviation'] = (df_4h['close'] - df_4h['HMA_45']) / df_4h['HMA_45'] * 100
+    df_4h = math_brain.calculate_additional_indicators(df_4h)
     
     # 重置索引
     df_4h.reset_index(inplace=True)
@@ -58,7 +57,11 @@ def create_4h_from_1h():
     filename = f'ETHUSDT_4h_processed_{timestamp}.parquet'
     filepath = f'src/utils/data/{filename}'
     
-    df_4h.to_parquet(filepath, index=False)
+    # 按时间排序并分行组写入，行组的min/max统计可用于按时间过滤时跳过无关行组
+    df_4h.sort_values('open_time').to_parquet(
+        filepath, index=False, row_group_size=100_000,
+        compression='zstd', write_statistics=True
+    )
     print(f"✅ 保存4h数据: {filepath}")
     print(f"📊 4h数据记录数: {len(df_4h)}")
     print(f"📅 时间范围: {df_4h['open_time'].min()} 到 {df_4h['open_time'].max()}")
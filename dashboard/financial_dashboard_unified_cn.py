@@ -414,98 +414,68 @@ def create_raw_data_display(df):
     df_analysis.loc[downtrend_start, 'turning_point'] = -1
     
     # 3. 识别趋势区间
+    # 只有拐点行会改变状态，直接遍历拐点位置，价格按位置从ndarray中读取
+    close = df_analysis['close'].to_numpy()
+    high = df_analysis['high'].to_numpy()
+    low = df_analysis['low'].to_numpy()
+    hma = df_analysis['HMA_45'].to_numpy()
+    turning_point = df_analysis['turning_point'].to_numpy()
+    times = df_analysis.index
+    
     trend_intervals = []
     current_trend = None
-    trend_start_idx = None
-    trend_start_time = None
-    trend_start_price = None
-    
-    for idx, row in df_analysis.iterrows():
-        if row['turning_point'] == 1:  # 上涨趋势开始
-            if current_trend == 'down' and trend_start_idx is not None:
-                # 结束前一个下跌趋势
-                trend_end_idx = idx
-                trend_end_time = idx
-                trend_end_price = row['close']
-                
-                # 计算趋势区间数据
-                trend_data = df_analysis.loc[trend_start_time:trend_end_time]
-                
-                # 计算PFE/MAE
-                high_price = trend_data['high'].max()
-                low_price = trend_data['low'].min()
-                
+    trend_start_pos = None
+    
+    for pos in np.flatnonzero(turning_point != 0).tolist():
+        direction = 'up' if turning_point[pos] == 1 else 'down'
+        
+        # 方向反转时结束前一个趋势
+        if current_trend is not None and current_trend != direction:
+            trend_start_time = times[trend_start_pos]
+            trend_end_time = times[pos]
+            trend_start_price = close[trend_start_pos]
+            trend_end_price = close[pos]
+            
+            # 区间 [趋势开始, 当前拐点]（含两端）
+            segment = slice(trend_start_pos, pos + 1)
+            high_price = np.fmax.reduce(high[segment])
+            low_price = np.fmin.reduce(low[segment])
+            segment_close = close[segment]
+            volatility = segment_close.std(ddof=1) if len(segment_close) > 1 else np.nan
+            
+            if current_trend == 'down':
                 # 下跌趋势（做空策略）
+                trend_type = '下跌趋势'
                 pfe = (trend_start_price / low_price - 1) * 100  # 最大跌幅（理想收益）
                 mae = (high_price / trend_start_price - 1) * 100  # 最大涨幅（风险损失）
-                
-                trend_intervals.append({
-                    'trend_id': f"TREND_{len(trend_intervals)+1:03d}",
-                    'trend_type': '下跌趋势',
-                    'start_time': trend_start_time,
-                    'end_time': trend_end_time,
-                    'start_price': trend_start_price,
-                    'end_price': trend_end_price,
-                    'price_change_pct': (trend_end_price / trend_start_price - 1) * 100,
-                    'ideal_profit': pfe,
-                    'risk_loss': mae,
-                    'risk_reward_ratio': mae / (pfe + 0.001),
-                    'duration_hours': (trend_end_time - trend_start_time).total_seconds() / 3600,
-                    'max_price': high_price,
-                    'min_price': low_price,
-                    'volatility': trend_data['close'].std(),
-                    'hma_start': trend_data['HMA_45'].iloc[0],
-                    'hma_end': trend_data['HMA_45'].iloc[-1]
-                })
-            
-            # 开始新的上涨趋势
-            current_trend = 'up'
-            trend_start_idx = idx
-            trend_start_time = idx
-            trend_start_price = row['close']
-            
-        elif row['turning_point'] == -1:  # 下跌趋势开始
-            if current_trend == 'up' and trend_start_idx is not None:
-                # 结束前一个上涨趋势
-                trend_end_idx = idx
-                trend_end_time = idx
-                trend_end_price = row['close']
-                
-                # 计算趋势区间数据
-                trend_data = df_analysis.loc[trend_start_time:trend_end_time]
-                
-                # 计算PFE/MAE
-                high_price = trend_data['high'].max()
-                low_price = trend_data['low'].min()
-                
+            else:
                 # 上涨趋势（做多策略）
+                trend_type = '上涨趋势'
                 pfe = (high_price / trend_start_price - 1) * 100  # 最大涨幅（理想收益）
                 mae = (trend_start_price / low_price - 1) * 100  # 最大跌幅（风险损失）
-                
-                trend_intervals.append({
-                    'trend_id': f"TREND_{len(trend_intervals)+1:03d}",
-                    'trend_type': '上涨趋势',
-                    'start_time': trend_start_time,
-                    'end_time': trend_end_time,
-                    'start_price': trend_start_price,
-                    'end_price': trend_end_price,
-                    'price_change_pct': (trend_end_price / trend_start_price - 1) * 100,
-                    'ideal_profit': pfe,
-                    'risk_loss': mae,
-                    'risk_reward_ratio': mae / (pfe + 0.001),
-                    'duration_hours': (trend_end_time - trend_start_time).total_seconds() / 3600,
-                    'max_price': high_price,
-                    'min_price': low_price,
-                    'volatility': trend_data['close'].std(),
-                    'hma_start': trend_data['HMA_45'].iloc[0],
-                    'hma_end': trend_data['HMA_45'].iloc[-1]
-                })
             
-            # 开始新的下跌趋势
-            current_trend = 'down'
-            trend_start_idx = idx
-            trend_start_time = idx
-            trend_start_price = row['close']
+            trend_intervals.append({
+                'trend_id': f"TREND_{len(trend_intervals)+1:03d}",
+                'trend_type': trend_type,
+                'start_time': trend_start_time,
+                'end_time': trend_end_time,
+                'start_price': trend_start_price,
+                'end_price': trend_end_price,
+                'price_change_pct': (trend_end_price / trend_start_price - 1) * 100,
+                'ideal_profit': pfe,
+                'risk_loss': mae,
+                'risk_reward_ratio': mae / (pfe + 0.001),
+                'duration_hours': (trend_end_time - trend_start_time).total_seconds() / 3600,
+                'max_price': high_price,
+                'min_price': low_price,
+                'volatility': volatility,
+                'hma_start': hma[trend_start_pos],
+                'hma_end': hma[pos]
+            })
+        
+        # 开始新的趋势
+        current_trend = direction
+        trend_start_pos = pos
     
     # 转换为DataFrame
     if trend_intervals:
@@ -88,8 +88,13 @@ def find_latest_analysis():
     project_root = current_dir.parent
     reports_dir = project_root / "assets" / "reports"
     
-    # 查找所有4h分析结果
-    json_files = list(reports_dir.glob("trend_analysis_4h_*.json"))
+    # 启动器已定位最新结果时直接使用，跳过目录扫描
+    launcher_report = os.environ.get("ETH_HMA_LATEST_REPORT")
+    if launcher_report and Path(launcher_report).exists():
+        json_files = [Path(launcher_report)]
+    else:
+        # 查找所有4h分析结果
+        json_files = list(reports_dir.glob("trend_analysis_4h_*.json"))
     
     # 调试信息
     print(f"🔍 搜索路径: {reports_dir}")
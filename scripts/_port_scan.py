@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+端口占用检测工具
+Linux下直接解析 /proc/net/tcp 与 /proc/<pid>/fd，其他系统回退到 lsof，无需 psutil
+"""
+
+import os
+import subprocess
+from pathlib import Path
+
+_PROC_TCP_TABLES = ("/proc/net/tcp", "/proc/net/tcp6")
+
+
+def _socket_inodes_on_port(port):
+    """返回本地端口为 port 的所有TCP套接字inode"""
+    inodes = set()
+    for table in _PROC_TCP_TABLES:
+        try:
+            with open(table, "r") as f:
+                next(f, None)  # 跳过表头
+                for line in f:
+                    fields = line.split()
+                    # fields[1] = local_address (HEXIP:HEXPORT), fields[9] = inode
+                    if len(fields) > 9 and int(fields[1].rsplit(":", 1)[1], 16) == port:
+                        if fields[9] != "0":
+                            inodes.add(fields[9])
+        except OSError:
+            continue
+    return inodes
+
+
+def _pids_from_proc(port):
+    """通过 /proc 查找持有目标套接字的进程"""
+    inodes = _socket_inodes_on_port(port)
+    if not inodes:
+        return set()
+
+    targets = {f"socket:[{inode}]" for inode in inodes}
+    pids = set()
+    with os.scandir("/proc") as entries:
+        for entry in entries:
+            if not entry.name.isdigit():
+                continue
+            try:
+                with os.scandir(f"/proc/{entry.name}/fd") as fds:
+                    for fd in fds:
+                        try:
+                            if os.readlink(fd.path) in targets:
+                                pids.add(int(entry.name))
+                                break
+                        except OSError:
+                            continue
+            except OSError:
+                # 进程已退出或无权限访问
+                continue
+    return pids
+
+
+def _pids_from_lsof(port):
+    """非Linux系统下使用 lsof 查找占用端口的进程"""
+    try:
+        result = subprocess.run(
+            ["lsof", "-nP", f"-iTCP:{port}", "-t"],
+            capture_output=True, text=True, check=False
+        )
+    except FileNotFoundError:
+        return set()
+    return {int(pid) for pid in result.stdout.split() if pid.isdigit()}
+
+
+def pids_on_port(port: int) -> set:
+    """返回占用指定TCP端口的进程PID集合"""
+    if os.path.exists(_PROC_TCP_TABLES[0]):
+        return _pids_from_proc(port)
+    return _pids_from_lsof(port)
+
+
+def process_name(pid: int) -> str:
+    """返回进程名称，获取失败时返回空字符串"""
+    try:
+        return Path(f"/proc/{pid}/comm").read_text().strip()
+    except OSError:
+        return ""
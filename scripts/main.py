@@ -5,6 +5,7 @@ ETH HMA 分析器主程序
 """
 import sys
 import argparse
+import pickle
 from pathlib import Path
 import logging
 
@@ -16,6 +17,42 @@ if str(PROJECT_ROOT) not in sys.path:
 from src.managers.project_manager import ProjectManager
 from src.utils.config import *
 
+# ProjectManager 预热缓存；配置或任一被序列化的组件代码更新后自动失效
+# （config 的星号导入会覆盖 PROJECT_ROOT，这里按本文件位置重新定位项目根目录）
+_REPO_ROOT = Path(__file__).parent.parent
+_STATE_CACHE = _REPO_ROOT / "assets" / "cache" / "pm_state.pkl"
+_STATE_SOURCES = (
+    _REPO_ROOT / "src" / "utils" / "config.py",
+    _REPO_ROOT / "src" / "managers" / "project_manager.py",
+    _REPO_ROOT / "src" / "managers" / "librarian.py",
+    _REPO_ROOT / "src" / "collectors" / "data_collector.py",
+    _REPO_ROOT / "src" / "eth_hma_analysis" / "core" / "math_brain.py",
+)
+# 缓存文件格式版本；组件新增的属性不能从源码修改时间推断时递增
+_STATE_FORMAT = 2
+
+def save_manager_state(manager: ProjectManager) -> Path:
+    """将初始化完成的ProjectManager序列化到缓存文件"""
+    _STATE_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    with _STATE_CACHE.open('wb') as f:
+        pickle.dump((_STATE_FORMAT, manager), f, protocol=5)
+    return _STATE_CACHE
+
+def load_manager() -> ProjectManager:
+    """优先从预热缓存恢复ProjectManager，缓存缺失或过期时重新构建"""
+    try:
+        cache_mtime = _STATE_CACHE.stat().st_mtime
+        if all(cache_mtime > src.stat().st_mtime for src in _STATE_SOURCES):
+            with _STATE_CACHE.open('rb') as f:
+                state_format, manager = pickle.load(f)
+            if state_format == _STATE_FORMAT:
+                return manager
+    except (OSError, pickle.UnpicklingError, AttributeError, EOFError, TypeError, ValueError,
+            ImportError):
+        # 缓存损坏、格式过期或其中的类已移动/改名时重新构建
+        pass
+    return ProjectManager()
+
 def setup_logging(verbose: bool = False):
     """设置日志配置"""
     level = logging.DEBUG if verbose else logging.INFO
@@ -41,6 +78,7 @@ def main():
   python scripts/main.py --years 2         # 获取过去2年数据
   python scripts/main.py --hma-period 30   # 使用30周期HMA
   python scripts/main.py --verbose         # 显示详细日志
+  python scripts/main.py --warm            # 预热并缓存项目管理器状态
         """
     )
     
@@ -83,6 +121,12 @@ def main():
         help='仅显示数据概览，不运行分析'
     )
     
+    parser.add_argument(
+        '--warm',
+        action='store_true',
+        help='预热: 初始化ProjectManager并缓存其状态，供后续运行直接加载'
+    )
+    
     args = parser.parse_args()
     
     # 设置日志
@@ -99,8 +143,14 @@ def main():
     print("=" * 50)
     
     try:
+        # 预热模式：构建并缓存项目管理器后退出
+        if args.warm:
+            cache_file = save_manager_state(ProjectManager())
+            print(f"\n🔥 预热完成，状态已缓存: {cache_file}")
+            return
+        
         # 创建项目管理器
-        manager = ProjectManager()
+        manager = load_manager()
         
         # 如果只是查看概览
         if args.overview:
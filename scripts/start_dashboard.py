@@ -9,6 +9,9 @@ import sys
 import os
 from pathlib import Path
 
+# Streamlit启动命令的固定前缀
+_STREAMLIT_BASE = (sys.executable, "-m", "streamlit", "run")
+
 def start_dashboard():
     """启动Dashboard"""
     # 获取项目根目录
@@ -30,12 +33,11 @@ def start_dashboard():
         os.chdir(project_root)
         
         # 启动Streamlit
-        subprocess.run([
-            sys.executable, "-m", "streamlit", "run", 
-            str(dashboard_file),
+        subprocess.run((
+            *_STREAMLIT_BASE, str(dashboard_file),
             "--server.port", "8501",
             "--server.headless", "false"
-        ])
+        ))
     except KeyboardInterrupt:
         print("\n⏹️  Dashboard已停止")
     except Exception as e:
@@ -4,11 +4,18 @@ Jupyter启动脚本
 自动启动Jupyter Notebook并设置环境
 """
 
+import functools
+import importlib.util
 import subprocess
 import sys
 import os
 from pathlib import Path
 
+@functools.lru_cache(maxsize=1)
+def check_jupyter():
+    """检查Jupyter是否已安装（仅查询导入系统，不执行模块代码）"""
+    return importlib.util.find_spec("jupyter") is not None
+
 def start_jupyter():
     """启动Jupyter Notebook"""
     print("🚀 启动ETH HMA分析Jupyter环境...")
@@ -34,6 +41,11 @@ def start_jupyter():
         print("⚠️ 未找到数据文件，请先运行数据收集脚本")
         print("💡 运行命令: python scripts/main.py")
     
+    if not check_jupyter():
+        print("❌ 未检测到Jupyter")
+        print("💡 安装命令: pip install -e \".[jupyter]\"")
+        return False
+    
     # 启动Jupyter
     try:
         print("🔧 启动Jupyter Notebook...")
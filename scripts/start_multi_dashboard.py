@@ -4,43 +4,53 @@
 同时启动多个版本的Dashboard，使用不同端口
 """
 
+import os
+import signal
 import subprocess
 import sys
 import time
-import psutil
+from collections import namedtuple
 from pathlib import Path
+from types import MappingProxyType
+
+from _port_scan import pids_on_port, process_name
+
+# Dashboard配置: 类型 -> (端口, 脚本路径, 名称, 描述)
+_DashInfo = namedtuple('_DashInfo', 'port script name desc')
+
+_DASHBOARDS = MappingProxyType({
+    "pro": _DashInfo(8501, Path("dashboard/financial_dashboard_pro.py"), "专业版", "华尔街级别数据分析"),
+    "matplotlib": _DashInfo(8502, Path("dashboard/financial_dashboard_matplotlib.py"), "Matplotlib版", "专业数据分析表格"),
+    "v2": _DashInfo(8503, Path("dashboard/financial_dashboard_v2.py"), "智能版", "自动检测最新分析结果"),
+    "insights": _DashInfo(8504, Path("dashboard/financial_dashboard_insights.py"), "深度分析版", "策略效率深度分析"),
+    "advanced": _DashInfo(8505, Path("dashboard/financial_dashboard_advanced.py"), "高级专业版", "原始数据展示+置信指数算法"),
+})
+
+# Streamlit启动命令的固定前缀
+_STREAMLIT_BASE = (sys.executable, "-m", "streamlit", "run")
 
 def kill_process_on_port(port):
     """关闭占用指定端口的进程"""
+    killed = False
     try:
-        for proc in psutil.process_iter(['pid', 'name']):
+        for pid in pids_on_port(port):
             try:
-                for conn in proc.connections():
-                    if conn.laddr.port == port:
-                        print(f"🔍 发现占用端口 {port} 的进程: {proc.info['name']} (PID: {proc.info['pid']})")
-                        proc.kill()
-                        print(f"✅ 已关闭进程 PID: {proc.info['pid']}")
-                        time.sleep(2)
-                        return True
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                print(f"🔍 发现占用端口 {port} 的进程: {process_name(pid)} (PID: {pid})")
+                os.kill(pid, signal.SIGTERM)
+                print(f"✅ 已关闭进程 PID: {pid}")
+                killed = True
+            except (ProcessLookupError, PermissionError):
                 pass
     except Exception as e:
         print(f"⚠️ 关闭进程时出错: {e}")
     
-    return False
+    if killed:
+        time.sleep(2)
+    return killed
 
 def start_dashboard(dashboard_type, port):
     """启动指定类型的Dashboard"""
-    dashboard_scripts = {
-        "pro": "dashboard/financial_dashboard_pro.py",
-        "matplotlib": "dashboard/financial_dashboard_matplotlib.py",
-        "v2": "dashboard/financial_dashboard_v2.py",
-        "insights": "dashboard/financial_dashboard_insights.py",
-        "advanced": "dashboard/financial_dashboard_advanced.py"
-    }
-    
-    dashboard_script = dashboard_scripts.get(dashboard_type, "dashboard/financial_dashboard_pro.py")
-    script_path = Path(dashboard_script)
+    script_path = _DASHBOARDS.get(dashboard_type, _DASHBOARDS["pro"]).script
     
     if not script_path.exists():
         print(f"❌ Dashboard脚本未找到: {script_path}")
@@ -50,12 +60,11 @@ def start_dashboard(dashboard_type, port):
     
     try:
         # 启动Streamlit
-        subprocess.Popen([
-            sys.executable, "-m", "streamlit", "run", 
-            str(script_path),
+        subprocess.Popen((
+            *_STREAMLIT_BASE, str(script_path),
             "--server.port", str(port),
             "--server.headless", "true"
-        ])
+        ))
         
         print(f"✅ {dashboard_type.upper()} Dashboard已启动")
         return True
@@ -69,19 +78,10 @@ def start_all_dashboards():
     print("🔍 多版本Dashboard启动器")
     print("=" * 60)
     
-    # Dashboard配置
-    dashboards = {
-        "pro": {"port": 8501, "name": "专业版", "desc": "华尔街级别数据分析"},
-        "matplotlib": {"port": 8502, "name": "Matplotlib版", "desc": "专业数据分析表格"},
-        "v2": {"port": 8503, "name": "智能版", "desc": "自动检测最新分析结果"},
-        "insights": {"port": 8504, "name": "深度分析版", "desc": "策略效率深度分析"},
-        "advanced": {"port": 8505, "name": "高级专业版", "desc": "原始数据展示+置信指数算法"}
-    }
-    
     # 关闭可能占用的端口
     print("🔍 检查并关闭占用端口...")
-    for dashboard_type, config in dashboards.items():
-        kill_process_on_port(config["port"])
+    for config in _DASHBOARDS.values():
+        kill_process_on_port(config.port)
     
     time.sleep(3)
     
@@ -89,19 +89,19 @@ def start_all_dashboards():
     print(f"\n🚀 启动所有Dashboard...")
     success_count = 0
     
-    for dashboard_type, config in dashboards.items():
-        if start_dashboard(dashboard_type, config["port"]):
+    for dashboard_type, config in _DASHBOARDS.items():
+        if start_dashboard(dashboard_type, config.port):
             success_count += 1
             time.sleep(2)  # 避免端口冲突
     
     # 显示访问信息
-    print(f"\n✅ 成功启动 {success_count}/{len(dashboards)} 个Dashboard")
+    print(f"\n✅ 成功启动 {success_count}/{len(_DASHBOARDS)} 个Dashboard")
     print("\n🌐 访问地址:")
     print("=" * 60)
     
-    for dashboard_type, config in dashboards.items():
-        print(f"📊 {config['name']} ({config['desc']})")
-        print(f"   地址: http://localhost:{config['port']}")
+    for config in _DASHBOARDS.values():
+        print(f"📊 {config.name} ({config.desc})")
+        print(f"   地址: http://localhost:{config.port}")
         print()
     
     print("💡 使用建议:")
@@ -119,20 +119,11 @@ def start_selected_dashboards(selected_types):
     print("🔍 选定版本Dashboard启动器")
     print("=" * 60)
     
-    # Dashboard配置
-    dashboards = {
-        "pro": {"port": 8501, "name": "专业版", "desc": "华尔街级别数据分析"},
-        "matplotlib": {"port": 8502, "name": "Matplotlib版", "desc": "专业数据分析表格"},
-        "v2": {"port": 8503, "name": "智能版", "desc": "自动检测最新分析结果"},
-        "insights": {"port": 8504, "name": "深度分析版", "desc": "策略效率深度分析"},
-        "advanced": {"port": 8505, "name": "高级专业版", "desc": "原始数据展示+置信指数算法"}
-    }
-    
     # 关闭可能占用的端口
     print("🔍 检查并关闭占用端口...")
     for dashboard_type in selected_types:
-        if dashboard_type in dashboards:
-            kill_process_on_port(dashboards[dashboard_type]["port"])
+        if dashboard_type in _DASHBOARDS:
+            kill_process_on_port(_DASHBOARDS[dashboard_type].port)
     
     time.sleep(3)
     
@@ -141,9 +132,9 @@ def start_selected_dashboards(selected_types):
     success_count = 0
     
     for dashboard_type in selected_types:
-        if dashboard_type in dashboards:
-            config = dashboards[dashboard_type]
-            if start_dashboard(dashboard_type, config["port"]):
+        if dashboard_type in _DASHBOARDS:
+            config = _DASHBOARDS[dashboard_type]
+            if start_dashboard(dashboard_type, config.port):
                 success_count += 1
                 time.sleep(2)
     
@@ -153,10 +144,10 @@ def start_selected_dashboards(selected_types):
     print("=" * 60)
     
     for dashboard_type in selected_types:
-        if dashboard_type in dashboards:
-            config = dashboards[dashboard_type]
-            print(f"📊 {config['name']} ({config['desc']})")
-            print(f"   地址: http://localhost:{config['port']}")
+        if dashboard_type in _DASHBOARDS:
+            config = _DASHBOARDS[dashboard_type]
+            print(f"📊 {config.name} ({config.desc})")
+            print(f"   地址: http://localhost:{config.port}")
             print()
 
 def main():
@@ -7,6 +7,9 @@ import subprocess
 import sys
 from pathlib import Path
 
+# Streamlit启动命令的固定前缀
+_STREAMLIT_BASE = (sys.executable, "-m", "streamlit", "run")
+
 def start_pro_dashboard():
     """启动专业级Dashboard"""
     dashboard_script = Path("dashboard/financial_dashboard_pro.py")
@@ -19,12 +22,11 @@ def start_pro_dashboard():
     
     try:
         # 启动Streamlit
-        subprocess.Popen([
-            sys.executable, "-m", "streamlit", "run", 
-            str(dashboard_script),
+        subprocess.Popen((
+            *_STREAMLIT_BASE, str(dashboard_script),
             "--server.port", "8503",
             "--server.headless", "true"
-        ])
+        ))
         
         print("✅ 专业级Dashboard已启动")
         print("🌐 访问地址: http://localhost:8503")
@@ -8,54 +8,42 @@ import subprocess
 import sys
 import os
 from pathlib import Path
-import json
 import glob
 
+# Streamlit启动命令的固定前缀
+_STREAMLIT_BASE = (sys.executable, "-m", "streamlit", "run")
+
 def find_latest_analysis():
-    """查找最新的分析结果"""
+    """查找最新的分析结果，返回文件路径（未找到时返回None）"""
     reports_dir = Path("assets/reports")
     
-    # 查找所有4h分析结果
-    json_files = list(reports_dir.glob("trend_analysis_4h_*.json"))
+    # 单次扫描目录，选出修改时间最新的4h分析结果
+    latest_name = None
+    latest_mtime = -1
+    prefix = "trend_analysis_4h_"
+    try:
+        with os.scandir(reports_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith(prefix) and entry.name.endswith(".json"):
+                    mtime = entry.stat().st_mtime
+                    if mtime > latest_mtime:
+                        latest_mtime, latest_name = mtime, entry.name
+    except FileNotFoundError:
+        pass
     
-    if not json_files:
+    if latest_name is None:
         print("❌ 未找到4h分析结果文件")
         print("请先运行分析生成数据:")
         print("  python scripts/trend_analysis.py --interval 4h")
-        return False
+        return None
     
-    # 选择最新的文件
-    latest_file = max(json_files, key=lambda x: x.stat().st_mtime)
+    latest_file = reports_dir / latest_name
     print(f"✅ 找到最新分析结果: {latest_file.name}")
     
-    # 检查数据完整性
-    try:
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        # 检查关键数据
-        has_uptrend = 'uptrend_analysis' in data and 'intervals' in data['uptrend_analysis']
-        has_downtrend = 'downtrend_analysis' in data and 'intervals' in data['downtrend_analysis']
-        
-        if not has_uptrend and not has_downtrend:
-            print("❌ 分析结果文件格式不正确")
-            return False
-        
-        uptrend_count = len(data['uptrend_analysis']['intervals']) if has_uptrend else 0
-        downtrend_count = len(data['downtrend_analysis']['intervals']) if has_downtrend else 0
-        
-        print(f"📊 数据统计:")
-        print(f"  - 上涨趋势: {uptrend_count} 个")
-        print(f"  - 下跌趋势: {downtrend_count} 个")
-        print(f"  - 总计: {uptrend_count + downtrend_count} 个趋势")
-        
-        return True
-        
-    except Exception as e:
-        print(f"❌ 读取分析结果失败: {e}")
-        return False
+    # 文件内容的校验交给Dashboard，这里不再预先解析JSON
+    return latest_file
 
-def start_dashboard():
+def start_dashboard(latest_file=None):
     """启动智能Dashboard"""
     dashboard_script = Path("dashboard/financial_dashboard_v2.py")
     
@@ -66,13 +54,18 @@ def start_dashboard():
     print(f"🚀 启动智能Dashboard: {dashboard_script}")
     
     try:
-        # 启动Streamlit
-        subprocess.Popen([
-            sys.executable, "-m", "streamlit", "run", 
-            str(dashboard_script),
+        # 将已定位的分析结果传给Dashboard，子进程无需再次扫描目录
+        env = dict(os.environ)
+        if latest_file is not None:
+            env["ETH_HMA_LATEST_REPORT"] = str(latest_file.resolve())
+        
+        # 启动Streamlit（分析结果写入后不再变化，无需文件监听）
+        subprocess.Popen((
+            *_STREAMLIT_BASE, str(dashboard_script),
             "--server.port", "8501",
-            "--server.headless", "true"
-        ])
+            "--server.headless", "true",
+            "--server.fileWatcherType", "none"
+        ), env=env)
         
         print("✅ Dashboard已启动")
         print("🌐 访问地址: http://localhost:8501")
@@ -94,7 +87,8 @@ def main():
     print("=" * 50)
     
     # 检查分析结果
-    if not find_latest_analysis():
+    latest_file = find_latest_analysis()
+    if latest_file is None:
         print("\n💡 解决方案:")
         print("1. 运行数据收集: python scripts/main.py")
         print("2. 运行趋势分析: python scripts/trend_analysis.py --interval 4h")
@@ -104,7 +98,7 @@ def main():
     print("\n🚀 启动Dashboard...")
     
     # 启动Dashboard
-    if start_dashboard():
+    if start_dashboard(latest_file):
         print("\n✅ Dashboard启动成功!")
         print("📱 请在浏览器中访问: http://localhost:8501")
         print("🔄 如需重新分析数据，请运行: python scripts/trend_analysis.py --interval 4h")
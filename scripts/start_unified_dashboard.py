@@ -4,30 +4,36 @@ Unified Dashboard Launcher
 启动整合的统一Dashboard
 """
 
+import os
+import signal
 import subprocess
 import sys
 from pathlib import Path
-import psutil
 import time
 
+from _port_scan import pids_on_port, process_name
+
+# Streamlit启动命令的固定前缀
+_STREAMLIT_BASE = (sys.executable, "-m", "streamlit", "run")
+
 def kill_process_on_port(port):
     """关闭占用指定端口的进程"""
+    killed = False
     try:
-        for proc in psutil.process_iter(['pid', 'name']):
+        for pid in pids_on_port(port):
             try:
-                for conn in proc.connections():
-                    if conn.laddr.port == port:
-                        print(f"🔍 发现占用端口 {port} 的进程: {proc.info['name']} (PID: {proc.info['pid']})")
-                        proc.kill()
-                        print(f"✅ 已关闭进程 PID: {proc.info['pid']}")
-                        time.sleep(2)
-                        return True
-            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                print(f"🔍 发现占用端口 {port} 的进程: {process_name(pid)} (PID: {pid})")
+                os.kill(pid, signal.SIGTERM)
+                print(f"✅ 已关闭进程 PID: {pid}")
+                killed = True
+            except (ProcessLookupError, PermissionError):
                 pass
     except Exception as e:
         print(f"⚠️ 关闭进程时出错: {e}")
     
-    return False
+    if killed:
+        time.sleep(2)
+    return killed
 
 def start_unified_dashboard():
     """启动统一Dashboard"""
@@ -58,12 +64,11 @@ def start_unified_dashboard():
     print("  - 趋势分析")
     
     try:
-        subprocess.Popen([
-            sys.executable, "-m", "streamlit", "run", 
-            str(dashboard_script),
+        subprocess.Popen((
+            *_STREAMLIT_BASE, str(dashboard_script),
             "--server.port", "8501",
             "--server.headless", "true"
-        ])
+        ))
         
         print("✅ 统一Dashboard已启动")
         print("🌐 访问地址: http://localhost:8501")
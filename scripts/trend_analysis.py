@@ -13,6 +13,14 @@ import sys
 import argparse
 import logging
 import json
+import functools
+import hashlib
+import io
+import multiprocessing
+import pickle
+import re
+import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 
@@ -21,17 +29,17 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 import pandas as pd
 import numpy as np
-# 直接导入核心模块
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'eth_hma_analysis', 'core'))
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import pyarrow.dataset as ds
+import matplotlib
+# 脚本只输出图片文件: 使用无界面的Agg后端
+matplotlib.use('Agg')
 
-from trend_analyzer import TrendAnalyzer
+from eth_hma_analysis.core.trend_analyzer import TrendAnalyzer
 from analyzers.trend_visualizer import TrendVisualizer
 from visualizers.strategy_visualizer import StrategyVisualizer
 from reporters.strategy_reporter import StrategyReporter
 from utils.config import *
+from utils.parquet_io import read_parquet_batched, discover_processed_files
 
 def setup_logging(verbose: bool = False):
     """设置日志"""
@@ -45,64 +53,118 @@ def setup_logging(verbose: bool = False):
         ]
     )
 
-def load_data(data_dir: str = "assets/data") -> dict:
-    """加载数据"""
+def analysis_columns(hma_period: int = 45) -> list:
+    """趋势分析及可视化实际用到的列"""
+    return ['open_time', 'high', 'low', 'close', 'volume', f'HMA_{hma_period}']
+
+# 分析的数据周期及其显示名称
+_INTERVAL_NAMES = {'1h': '1小时', '4h': '4小时'}
+
+def load_data(data_dir: str = "assets/data", columns: list = None,
+              start: str = None, end: str = None) -> dict:
+    """
+    加载数据
+    
+    Args:
+        data_dir: 数据目录
+        columns: 需要读取的列（None表示全部列），由Parquet列裁剪直接跳过其余列
+        start: 起始时间（含），下推为Parquet行组过滤条件
+        end: 结束时间（不含），下推为Parquet行组过滤条件
+        
+    文件按批次流式读取，避免整表物化两次
+    """
     data_dir = Path(data_dir)
     data = {}
     
+    filter_expr = None
+    if start is not None:
+        filter_expr = ds.field('open_time') >= pd.Timestamp(start)
+    if end is not None:
+        end_expr = ds.field('open_time') < pd.Timestamp(end)
+        filter_expr = end_expr if filter_expr is None else filter_expr & end_expr
+    
+    def read_processed(file_path):
+        df = read_parquet_batched(file_path, columns=columns, filter_expr=filter_expr)
+        df.set_index('open_time', inplace=True)
+        return df
+    
     # 查找最新的处理文件
-    processed_files = list(data_dir.glob("ETHUSDT_*_processed_*.parquet"))
+    processed_files = discover_processed_files(data_dir, _INTERVAL_NAMES)
     
-    for file_path in processed_files:
-        if '1h' in file_path.name:
-            df = pd.read_parquet(file_path)
-            df.set_index('open_time', inplace=True)
-            data['1h'] = df
-            print(f"✅ 加载1小时数据: {len(df):,} 条记录")
-        elif '4h' in file_path.name:
-            df = pd.read_parquet(file_path)
-            df.set_index('open_time', inplace=True)
-            data['4h'] = df
-            print(f"✅ 加载4小时数据: {len(df):,} 条记录")
+    for interval, name in _INTERVAL_NAMES.items():
+        if interval in processed_files:
+            df = read_processed(processed_files[interval])
+            data[interval] = df
+            print(f"✅ 加载{name}数据: {len(df):,} 条记录")
     
     if not data:
         raise FileNotFoundError("没有找到可分析的数据文件")
     
     return data
 
-def run_trend_analysis(data: dict, hma_period: int = 45, slope_threshold: float = 0.001) -> dict:
-    """运行趋势分析"""
+# 子进程用spawn启动: fork会继承父进程中numba线程层等线程状态，可能导致解释器退出时挂起
+_POOL_CONTEXT = multiprocessing.get_context('spawn')
+
+def _analyze_one(df: pd.DataFrame, hma_period: int, slope_threshold: float) -> dict:
+    """分析单个时间间隔的数据（各间隔相互独立，可在子进程中执行）"""
+    # 初始化分析器
+    analyzer = TrendAnalyzer(hma_period=hma_period, slope_threshold=slope_threshold)
+    
+    # 运行完整趋势分析（包括改进算法和下跌趋势专项分析）
+    # 分析会在传入的DataFrame上添加斜率/拐点列: 只复制一次，可视化直接复用这些列
+    # 事件和趋势区间随报告一并返回，用于可视化
+    df_with_slope = df.copy()
+    complete_report, events, intervals = analyzer.run_complete_analysis(df_with_slope, return_details=True)
+    
+    return {
+        'data': df_with_slope,
+        'events': events,
+        'intervals': intervals,
+        'report': complete_report
+    }
+
+def run_trend_analysis(data: dict, hma_period: int = 45, slope_threshold: float = 0.001,
+                       workers: int = None) -> dict:
+    """
+    运行趋势分析
+    
+    多个时间间隔时按间隔并行（每个间隔一个进程）；workers=1 时顺序执行
+    """
     logger = logging.getLogger(__name__)
     results = {}
     
-    for interval, df in data.items():
-        logger.info(f"开始分析 {interval} 数据")
-        
-        # 初始化分析器
-        analyzer = TrendAnalyzer(hma_period=hma_period, slope_threshold=slope_threshold)
-        
-        # 运行完整趋势分析（包括改进算法和下跌趋势专项分析）
-        complete_report = analyzer.run_complete_analysis(df.copy())
-        
-        # 提取基础数据用于可视化
-        df_with_slope = analyzer.calculate_hma_slope(df.copy())
-        events = analyzer.analyze_events(df_with_slope)
-        intervals = analyzer.analyze_trend_intervals(df_with_slope)
-        
-        # 使用完整报告
-        report = complete_report
-        
-        results[interval] = {
-            'data': df_with_slope,
-            'events': events,
-            'intervals': intervals,
-            'report': report
-        }
-        
-        logger.info(f"{interval} 数据分析完成")
+    max_workers = min(len(data), workers or len(data))
+    if max_workers <= 1:
+        for interval, df in data.items():
+            logger.info(f"开始分析 {interval} 数据")
+            results[interval] = _analyze_one(df, hma_period, slope_threshold)
+            logger.info(f"{interval} 数据分析完成")
+        return results
+    
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=_POOL_CONTEXT) as pool:
+        futures = {}
+        for interval, df in data.items():
+            logger.info(f"开始分析 {interval} 数据")
+            futures[interval] = pool.submit(_analyze_one, df, hma_period, slope_threshold)
+        
+        for interval, future in futures.items():
+            results[interval] = future.result()
+            logger.info(f"{interval} 数据分析完成")
     
     return results
 
+def _json_default(obj):
+    """json编码器遇到无法识别的对象时调用：将numpy类型转换为Python原生类型"""
+    if isinstance(obj, np.integer):
+        return int(obj)
+    elif isinstance(obj, np.floating):
+        return float(obj)
+    elif isinstance(obj, np.bool_):
+        return bool(obj)
+    elif isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
 def save_results(results: dict, output_dir: str = "assets/reports"):
     """保存分析结果"""
     output_dir = Path(output_dir)
@@ -114,190 +176,247 @@ def save_results(results: dict, output_dir: str = "assets/reports"):
     for interval, result in results.items():
         report_file = output_dir / f"trend_analysis_{interval}_{timestamp}.json"
         
-        # 转换numpy类型为Python原生类型
-        def convert_numpy(obj):
-            if isinstance(obj, np.integer):
-                return int(obj)
-            elif isinstance(obj, np.floating):
-                return float(obj)
-            elif isinstance(obj, np.ndarray):
-                return obj.tolist()
-            return obj
-        
-        # 递归转换
-        def recursive_convert(d):
-            if isinstance(d, dict):
-                return {k: recursive_convert(v) for k, v in d.items()}
-            elif isinstance(d, list):
-                return [recursive_convert(item) for item in d]
-            else:
-                return convert_numpy(d)
-        
-        report_data = recursive_convert(result['report'])
-        
         with open(report_file, 'w', encoding='utf-8') as f:
-            json.dump(report_data, f, indent=2, ensure_ascii=False)
+            json.dump(result['report'], f, indent=2, ensure_ascii=False, default=_json_default)
         
         print(f"📊 {interval} 分析报告已保存: {report_file}")
 
-def generate_visualizations(results: dict, output_dir: str = "assets/charts", use_chinese: bool = True):
-    """生成可视化图表"""
+# 图表子进程内的可视化器（由 _init_chart_worker 创建）
+_chart_visualizers = {}
+
+def _apply_render_settings():
+    """
+    简化折线路径以减少绘制的顶点数
+    
+    可视化器导入和初始化时会调用 rcdefaults() 重置全局设置，因此须在创建可视化器之后设置
+    """
+    matplotlib.rcParams['path.simplify'] = True
+    matplotlib.rcParams['path.simplify_threshold'] = 1.0
+
+def _init_chart_worker(use_chinese: bool, output_dir: str, timestamp: str):
+    """图表子进程初始化：按主进程相同顺序创建可视化器，策略图表使用本次运行的时间戳命名"""
+    _chart_visualizers['trend'] = TrendVisualizer(use_chinese=use_chinese)
+    _chart_visualizers['strategy'] = StrategyVisualizer(output_dir)
+    _chart_visualizers['strategy'].timestamp = timestamp
+    _apply_render_settings()
+
+def _render_chart(visualizer: str, method: str, *args, **kwargs):
+    """在子进程中绘制单张图表，完成后释放所有Figure"""
+    import matplotlib.pyplot as plt
+    try:
+        return getattr(_chart_visualizers[visualizer], method)(*args, **kwargs)
+    finally:
+        plt.close('all')
+
+def _chart_tasks(results: dict, output_dir: Path, timestamp: str) -> list:
+    """列出所有待绘制的图表：(可视化器, 方法名, 位置参数, 关键字参数)"""
+    tasks = []
+    for interval, result in results.items():
+        uptrend = result['report'].get('uptrend_analysis', {})
+        downtrend = result['report'].get('downtrend_analysis', {})
+        tasks += [
+            # 1. 拐点识别图
+            ('trend', 'plot_turning_points', (result['data'],),
+             {'save_path': str(output_dir / f"turning_points_{interval}_{timestamp}.png")}),
+            # 2. 趋势区间分析图
+            ('trend', 'plot_trend_intervals', (result['data'], result['intervals']),
+             {'save_path': str(output_dir / f"trend_intervals_{interval}_{timestamp}.png")}),
+            # 3. 事件分析图
+            ('trend', 'plot_event_analysis', (result['events'],),
+             {'save_path': str(output_dir / f"event_analysis_{interval}_{timestamp}.png")}),
+            # 4. 综合分析图
+            ('trend', 'plot_comprehensive_analysis', (result['data'], result['intervals'], result['events']),
+             {'save_path': str(output_dir / f"comprehensive_analysis_{interval}_{timestamp}.png")}),
+            # 5. 策略总览图
+            ('strategy', 'create_strategy_overview',
+             (result['data'], result['intervals'], uptrend, downtrend, interval), {}),
+            # 6. 策略表现分析图
+            ('strategy', 'create_strategy_performance', (uptrend, downtrend, interval), {}),
+            # 7. 风险分析图
+            ('strategy', 'create_risk_analysis', (uptrend, downtrend, interval), {}),
+        ]
+    return tasks
+
+# 记录已绘制图表的缓存清单: {图表输入的哈希: 图片路径}
+_CHART_CACHE_FILE = '.chart_cache.json'
+
+# 图表文件名末尾的时间戳: _YYYYmmdd_HHMMSS
+_CHART_TIMESTAMP = re.compile(r'_\d{8}_\d{6}$')
+
+@functools.lru_cache(maxsize=None)
+def _renderer_fingerprint() -> bytes:
+    """绘图代码的指纹: 两个可视化器模块和本脚本（渲染设置）源码的哈希，代码修改后已缓存的图表全部失效"""
+    digest = hashlib.blake2b(digest_size=8)
+    for module_file in (sys.modules[TrendVisualizer.__module__].__file__,
+                        sys.modules[StrategyVisualizer.__module__].__file__,
+                        __file__):
+        digest.update(Path(module_file).read_bytes())
+    return digest.digest()
+
+def _chart_key(task: tuple, use_chinese: bool) -> str:
+    """根据绘图代码、图表的绘制方法和输入数据计算哈希（不含保存路径）"""
+    visualizer, method, args, kwargs = task
+    params = {k: v for k, v in kwargs.items() if k != 'save_path'}
+    payload = pickle.dumps((_renderer_fingerprint(), visualizer, method, args, params, use_chinese),
+                           protocol=5)
+    return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+def _restamp_chart(path: Path, timestamp: str) -> Path:
+    """把沿用的图表复制为本次运行时间戳的文件名，使一次运行的输出使用同一个时间戳"""
+    if not _CHART_TIMESTAMP.search(path.stem):
+        return path
+    target = path.with_name(_CHART_TIMESTAMP.sub(f'_{timestamp}', path.stem) + path.suffix)
+    if target != path:
+        shutil.copyfile(path, target)
+    return target
+
+def generate_visualizations(results: dict, output_dir: str = "assets/charts", use_chinese: bool = True,
+                            workers: int = None):
+    """
+    生成可视化图表
+    
+    各图表相互独立，默认在进程池中并行绘制；workers=1 时在当前进程顺序绘制
+    输入数据和绘图代码与上次绘制完全相同且图片仍存在的图表不再重新绘制，复制为本次时间戳的文件名
+    """
     output_dir = Path(output_dir)
     output_dir.mkdir(exist_ok=True)
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    visualizer = TrendVisualizer(use_chinese=use_chinese)
-    strategy_visualizer = StrategyVisualizer(str(output_dir))
+    tasks = _chart_tasks(results, output_dir, timestamp)
     
-    for interval, result in results.items():
-        print(f"🎨 生成 {interval} 可视化图表...")
-        
-        # 1. 拐点识别图
-        turning_points_path = output_dir / f"turning_points_{interval}_{timestamp}.png"
-        visualizer.plot_turning_points(
-            result['data'], 
-            save_path=str(turning_points_path)
-        )
-        
-        # 2. 趋势区间分析图
-        intervals_path = output_dir / f"trend_intervals_{interval}_{timestamp}.png"
-        visualizer.plot_trend_intervals(
-            result['data'], 
-            result['intervals'], 
-            save_path=str(intervals_path)
-        )
-        
-        # 3. 事件分析图
-        events_path = output_dir / f"event_analysis_{interval}_{timestamp}.png"
-        visualizer.plot_event_analysis(
-            result['events'], 
-            save_path=str(events_path)
-        )
-        
-        # 4. 综合分析图
-        comprehensive_path = output_dir / f"comprehensive_analysis_{interval}_{timestamp}.png"
-        visualizer.plot_comprehensive_analysis(
-            result['data'], 
-            result['intervals'], 
-            result['events'], 
-            save_path=str(comprehensive_path)
-        )
-        
-        # 5. 策略总览图
-        strategy_overview_path = strategy_visualizer.create_strategy_overview(
-            result['data'],
-            result['intervals'],
-            result['report'].get('uptrend_analysis', {}),
-            result['report'].get('downtrend_analysis', {}),
-            interval
-        )
-        
-        # 6. 策略表现分析图
-        strategy_performance_path = strategy_visualizer.create_strategy_performance(
-            result['report'].get('uptrend_analysis', {}),
-            result['report'].get('downtrend_analysis', {}),
-            interval
-        )
-        
-        # 7. 风险分析图
-        risk_analysis_path = strategy_visualizer.create_risk_analysis(
-            result['report'].get('uptrend_analysis', {}),
-            result['report'].get('downtrend_analysis', {}),
-            interval
-        )
+    cache_file = output_dir / _CHART_CACHE_FILE
+    cache = json.loads(cache_file.read_text(encoding='utf-8')) if cache_file.exists() else {}
+    pending = []
+    for task in tasks:
+        key = _chart_key(task, use_chinese)
+        if key in cache and Path(cache[key]).exists():
+            cache[key] = str(_restamp_chart(Path(cache[key]), timestamp))
+            print(f"♻️  图表未变化，沿用: {cache[key]}")
+        else:
+            pending.append((key, task))
+    
+    print(f"🎨 生成 {', '.join(results)} 可视化图表 ({len(pending)}/{len(tasks)} 张)...")
+    if not pending:
+        cache_file.write_text(json.dumps(cache, indent=2, ensure_ascii=False), encoding='utf-8')
+        return
+    
+    if workers == 1:
+        visualizers = {
+            'trend': TrendVisualizer(use_chinese=use_chinese),
+            'strategy': StrategyVisualizer(str(output_dir))
+        }
+        visualizers['strategy'].timestamp = timestamp
+        _apply_render_settings()
+        paths = [getattr(visualizers[visualizer], method)(*args, **kwargs)
+                 for _, (visualizer, method, args, kwargs) in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_POOL_CONTEXT,
+                                 initializer=_init_chart_worker,
+                                 initargs=(use_chinese, str(output_dir), timestamp)) as pool:
+            futures = [pool.submit(_render_chart, *task[:2], *task[2], **task[3]) for _, task in pending]
+            paths = [future.result() for future in futures]
+    
+    # plot_* 方法不返回路径，使用传入的 save_path
+    for (key, task), path in zip(pending, paths):
+        cache[key] = str(path or task[3]['save_path'])
+    cache_file.write_text(json.dumps(cache, indent=2, ensure_ascii=False), encoding='utf-8')
 
 def print_summary(results: dict):
-    """打印分析摘要"""
-    print("\n" + "="*80)
-    print("🎯 ETH HMA趋势分析摘要")
-    print("="*80)
+    """打印分析摘要（先写入缓冲区，最后一次性输出）"""
+    buf = io.StringIO()
+    out = functools.partial(print, file=buf)
+    out("\n" + "="*80)
+    out("🎯 ETH HMA趋势分析摘要")
+    out("="*80)
     
     for interval, result in results.items():
         report = result['report']
         intervals = result['intervals']
         events = result['events']
         
-        print(f"\n📈 {interval.upper()} 数据分析结果:")
-        print("-" * 50)
+        out(f"\n📈 {interval.upper()} 数据分析结果:")
+        out("-" * 50)
         
         # 基本统计
         summary = report['summary']
-        print(f"📊 总趋势区间: {summary['total_intervals']}")
-        print(f"   ├─ 上升趋势: {summary['up_intervals']}")
-        print(f"   └─ 下降趋势: {summary['down_intervals']}")
-        print(f"🎯 总拐点事件: {summary['total_events']}")
-        print(f"   ├─ 上升拐点: {summary['up_events']}")
-        print(f"   └─ 下降拐点: {summary['down_events']}")
+        out(f"📊 总趋势区间: {summary['total_intervals']}")
+        out(f"   ├─ 上升趋势: {summary['up_intervals']}")
+        out(f"   └─ 下降趋势: {summary['down_intervals']}")
+        out(f"🎯 总拐点事件: {summary['total_events']}")
+        out(f"   ├─ 上升拐点: {summary['up_events']}")
+        out(f"   └─ 下降拐点: {summary['down_events']}")
         
         # 趋势区间分析
         up_analysis = report['interval_analysis']['up_trends']
         down_analysis = report['interval_analysis']['down_trends']
         
-        print(f"\n📈 上升趋势区间分析:")
-        print(f"   ├─ 平均持续时间: {up_analysis['avg_duration']:.1f} 周期")
-        print(f"   ├─ 平均价格变化: {up_analysis['avg_price_change_pct']:.2f}%")
-        print(f"   ├─ 最大价格变化: {up_analysis['max_price_change_pct']:.2f}%")
-        print(f"   ├─ 平均PFE: {up_analysis['avg_pfe_pct']:.2f}%")
-        print(f"   ├─ 最大PFE: {up_analysis['max_pfe_pct']:.2f}%")
-        print(f"   └─ 胜率: {up_analysis['win_rate']:.1%}")
-        
-        print(f"\n📉 下降趋势区间分析:")
-        print(f"   ├─ 平均持续时间: {down_analysis['avg_duration']:.1f} 周期")
-        print(f"   ├─ 平均价格变化: {down_analysis['avg_price_change_pct']:.2f}%")
-        print(f"   ├─ 最大价格变化: {down_analysis['max_price_change_pct']:.2f}%")
-        print(f"   ├─ 平均PFE: {down_analysis['avg_pfe_pct']:.2f}%")
-        print(f"   ├─ 最大PFE: {down_analysis['max_pfe_pct']:.2f}%")
-        print(f"   └─ 胜率: {down_analysis['win_rate']:.1%}")
+        out(f"\n📈 上升趋势区间分析:")
+        out(f"   ├─ 平均持续时间: {up_analysis['avg_duration']:.1f} 周期")
+        out(f"   ├─ 平均价格变化: {up_analysis['avg_price_change_pct']:.2f}%")
+        out(f"   ├─ 最大价格变化: {up_analysis['max_price_change_pct']:.2f}%")
+        out(f"   ├─ 平均PFE: {up_analysis['avg_pfe_pct']:.2f}%")
+        out(f"   ├─ 最大PFE: {up_analysis['max_pfe_pct']:.2f}%")
+        out(f"   └─ 胜率: {up_analysis['win_rate']:.1%}")
+        
+        out(f"\n📉 下降趋势区间分析:")
+        out(f"   ├─ 平均持续时间: {down_analysis['avg_duration']:.1f} 周期")
+        out(f"   ├─ 平均价格变化: {down_analysis['avg_price_change_pct']:.2f}%")
+        out(f"   ├─ 最大价格变化: {down_analysis['max_price_change_pct']:.2f}%")
+        out(f"   ├─ 平均PFE: {down_analysis['avg_pfe_pct']:.2f}%")
+        out(f"   ├─ 最大PFE: {down_analysis['max_pfe_pct']:.2f}%")
+        out(f"   └─ 胜率: {down_analysis['win_rate']:.1%}")
         
         # 事件分析
         up_events = report['event_analysis']['up_turns']
         down_events = report['event_analysis']['down_turns']
         
-        print(f"\n🎯 事件分析:")
-        print(f"   上升拐点:")
-        print(f"   ├─ 平均波动率: {up_events['avg_volatility']:.3f}")
-        print(f"   ├─ 平均一致性: {up_events['avg_consistency']:.1%}")
-        print(f"   ├─ 1小时后平均变化: {up_events['avg_price_change_1h']:.2f}%")
-        print(f"   └─ 5小时后平均变化: {up_events['avg_price_change_5h']:.2f}%")
+        out(f"\n🎯 事件分析:")
+        out(f"   上升拐点:")
+        out(f"   ├─ 平均波动率: {up_events['avg_volatility']:.3f}")
+        out(f"   ├─ 平均一致性: {up_events['avg_consistency']:.1%}")
+        out(f"   ├─ 1小时后平均变化: {up_events['avg_price_change_1h']:.2f}%")
+        out(f"   └─ 5小时后平均变化: {up_events['avg_price_change_5h']:.2f}%")
         
-        print(f"   下降拐点:")
-        print(f"   ├─ 平均波动率: {down_events['avg_volatility']:.3f}")
-        print(f"   ├─ 平均一致性: {down_events['avg_consistency']:.1%}")
-        print(f"   ├─ 1小时后平均变化: {down_events['avg_price_change_1h']:.2f}%")
-        print(f"   └─ 5小时后平均变化: {down_events['avg_price_change_5h']:.2f}%")
+        out(f"   下降拐点:")
+        out(f"   ├─ 平均波动率: {down_events['avg_volatility']:.3f}")
+        out(f"   ├─ 平均一致性: {down_events['avg_consistency']:.1%}")
+        out(f"   ├─ 1小时后平均变化: {down_events['avg_price_change_1h']:.2f}%")
+        out(f"   └─ 5小时后平均变化: {down_events['avg_price_change_5h']:.2f}%")
         
         # 盈亏比
         if 'profit_loss_ratio' in report['interval_analysis']:
             pl_ratio = report['interval_analysis']['profit_loss_ratio']
-            print(f"\n💰 盈亏比: {pl_ratio:.2f}")
+            out(f"\n💰 盈亏比: {pl_ratio:.2f}")
         
         # 上涨趋势专项分析（做多策略）
         if 'uptrend_analysis' in report and report['uptrend_analysis']['total_uptrends'] > 0:
             uptrend = report['uptrend_analysis']
-            print(f"\n📈 上涨趋势专项分析（做多策略）:")
-            print(f"   ├─ 总上涨趋势数: {uptrend['total_uptrends']}")
-            print(f"   ├─ 平均做多理想收益: {uptrend['avg_long_ideal_profit']:.2f}%")
-            print(f"   ├─ 最大做多理想收益: {uptrend['max_long_ideal_profit']:.2f}%")
-            print(f"   ├─ 平均做多实际收益: {uptrend['avg_long_actual_profit']:.2f}%")
-            print(f"   ├─ 最大做多实际收益: {uptrend['max_long_actual_profit']:.2f}%")
-            print(f"   ├─ 平均做多风险损失: {uptrend['avg_long_risk_loss']:.2f}%")
-            print(f"   ├─ 最大做多风险损失: {uptrend['max_long_risk_loss']:.2f}%")
-            print(f"   └─ 平均风险收益比: {uptrend['avg_risk_reward_ratio']:.2f}")
+            out(f"\n📈 上涨趋势专项分析（做多策略）:")
+            out(f"   ├─ 总上涨趋势数: {uptrend['total_uptrends']}")
+            out(f"   ├─ 平均做多理想收益: {uptrend['avg_long_ideal_profit']:.2f}%")
+            out(f"   ├─ 最大做多理想收益: {uptrend['max_long_ideal_profit']:.2f}%")
+            out(f"   ├─ 平均做多实际收益: {uptrend['avg_long_actual_profit']:.2f}%")
+            out(f"   ├─ 最大做多实际收益: {uptrend['max_long_actual_profit']:.2f}%")
+            out(f"   ├─ 平均做多风险损失: {uptrend['avg_long_risk_loss']:.2f}%")
+            out(f"   ├─ 最大做多风险损失: {uptrend['max_long_risk_loss']:.2f}%")
+            out(f"   └─ 平均风险收益比: {uptrend['avg_risk_reward_ratio']:.2f}")
         
         # 下跌趋势专项分析（做空策略）
         if 'downtrend_analysis' in report and report['downtrend_analysis']['total_downtrends'] > 0:
             downtrend = report['downtrend_analysis']
-            print(f"\n📉 下跌趋势专项分析（做空策略）:")
-            print(f"   ├─ 总下跌趋势数: {downtrend['total_downtrends']}")
-            print(f"   ├─ 平均做空理想收益: {downtrend['avg_short_ideal_profit']:.2f}%")
-            print(f"   ├─ 最大做空理想收益: {downtrend['max_short_ideal_profit']:.2f}%")
-            print(f"   ├─ 平均做空实际收益: {downtrend['avg_short_actual_profit']:.2f}%")
-            print(f"   ├─ 最大做空实际收益: {downtrend['max_short_actual_profit']:.2f}%")
-            print(f"   ├─ 平均做空风险损失: {downtrend['avg_short_risk_loss']:.2f}%")
-            print(f"   ├─ 最大做空风险损失: {downtrend['max_short_risk_loss']:.2f}%")
-            print(f"   └─ 平均风险收益比: {downtrend['avg_risk_reward_ratio']:.2f}")
-        
-        print("-" * 50)
+            out(f"\n📉 下跌趋势专项分析（做空策略）:")
+            out(f"   ├─ 总下跌趋势数: {downtrend['total_downtrends']}")
+            out(f"   ├─ 平均做空理想收益: {downtrend['avg_short_ideal_profit']:.2f}%")
+            out(f"   ├─ 最大做空理想收益: {downtrend['max_short_ideal_profit']:.2f}%")
+            out(f"   ├─ 平均做空实际收益: {downtrend['avg_short_actual_profit']:.2f}%")
+            out(f"   ├─ 最大做空实际收益: {downtrend['max_short_actual_profit']:.2f}%")
+            out(f"   ├─ 平均做空风险损失: {downtrend['avg_short_risk_loss']:.2f}%")
+            out(f"   ├─ 最大做空风险损失: {downtrend['max_short_risk_loss']:.2f}%")
+            out(f"   └─ 平均风险收益比: {downtrend['avg_risk_reward_ratio']:.2f}")
+        
+        out("-" * 50)
+    
+    sys.stdout.write(buf.getvalue())
 
 def main():
     """主函数"""
@@ -307,8 +426,11 @@ def main():
     parser.add_argument('--charts-dir', default='assets/charts', help='图表目录')
     parser.add_argument('--hma-period', type=int, default=45, help='HMA周期')
     parser.add_argument('--slope-threshold', type=float, default=0.001, help='斜率阈值')
+    parser.add_argument('--start', help='起始时间 (如 2024-01-01)')
+    parser.add_argument('--end', help='结束时间，不含 (如 2025-01-01)')
     parser.add_argument('--no-viz', action='store_true', help='跳过可视化')
     parser.add_argument('--english', action='store_true', help='使用英文标签')
+    parser.add_argument('--workers', type=int, default=None, help='并行进程数 (默认: CPU核数, 1表示顺序执行)')
     parser.add_argument('--verbose', '-v', action='store_true', help='详细输出')
     
     args = parser.parse_args()
@@ -322,14 +444,20 @@ def main():
         
         # 1. 加载数据
         print("\n📁 加载数据...")
-        data = load_data(args.data_dir)
+        data = load_data(
+            args.data_dir,
+            columns=analysis_columns(args.hma_period),
+            start=args.start,
+            end=args.end
+        )
         
         # 2. 运行分析
         print("\n🔍 运行趋势分析...")
         results = run_trend_analysis(
             data, 
             hma_period=args.hma_period, 
-            slope_threshold=args.slope_threshold
+            slope_threshold=args.slope_threshold,
+            workers=args.workers
         )
         
         # 3. 保存结果
@@ -339,7 +467,8 @@ def main():
         # 4. 生成可视化
         if not args.no_viz:
             print("\n🎨 生成可视化图表...")
-            generate_visualizations(results, args.charts_dir, use_chinese=not args.english)
+            generate_visualizations(results, args.charts_dir, use_chinese=not args.english,
+                                    workers=args.workers)
         
         # 5. 生成Markdown报告
         print("\n📝 生成策略分析报告...")
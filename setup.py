@@ -41,6 +41,17 @@ setup(
             "plotly>=5.0.0",
             "ipywidgets>=7.6.0",
         ],
+        "fast": [
+            "numba>=0.57",
+            "numexpr>=2.8",
+            "bottleneck>=1.3",
+            "datashader>=0.15",
+            "tsdownsample>=0.1",
+        ],
+        "async": [
+            "httpx[http2]>=0.24",
+            "orjson>=3.8",
+        ],
         "dev": [
             "pytest>=6.0",
             "black>=22.0",
@@ -7,12 +7,13 @@ and analyzing cryptocurrency data using technical indicators.
 
 # 文件已移动到 src/eth_hma_analysis/core/
 # 保持向后兼容性
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'eth_hma_analysis', 'core'))
-
-from math_brain import MathBrain
-from trend_analyzer import TrendAnalyzer, TrendInterval, EventAnalysis
+try:
+    from ..eth_hma_analysis.core.math_brain import MathBrain
+    from ..eth_hma_analysis.core.trend_analyzer import TrendAnalyzer, TrendInterval, EventAnalysis
+except ImportError:
+    # 作为顶层包 analyzers 导入时（scripts 将 src 加入 sys.path）
+    from eth_hma_analysis.core.math_brain import MathBrain
+    from eth_hma_analysis.core.trend_analyzer import TrendAnalyzer, TrendInterval, EventAnalysis
 from .trend_visualizer import TrendVisualizer
 
 __all__ = [
@@ -3,30 +3,120 @@
 HMA专项分析报告
 专注于Hull移动平均指标的分析
 """
+import sys
 import pandas as pd
 import numpy as np
 from pathlib import Path
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+try:
+    from ..utils.parquet_io import read_parquet_batched, discover_processed_files
+except ImportError:
+    # 作为脚本直接运行时，将src加入路径后按顶层包 utils 导入
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from utils.parquet_io import read_parquet_batched, discover_processed_files
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# 报告只用到这些列，读取时裁剪掉其余列
+REPORT_COLUMNS = ['open_time', 'close', 'HMA_45', 'hma_deviation', 'price_change']
+# 数据管道预先计算的HMA稳定性列，旧文件中没有时由报告现场计算
+STABILITY_COLUMNS = ['hma45_change_pct', 'hma45_second_diff']
+# 报告中的统计量只需要float32精度，读取时直接写入float32缓冲区，内存带宽减半；
+# HMA_45 保持float64: 旧文件缺少稳定性列时要由它现场求差分，差分会抵消掉数值的高位
+ANALYTICS_DTYPES = {name: np.float32 for name in REPORT_COLUMNS[1:] + STABILITY_COLUMNS
+                    if name != 'HMA_45'}
+
 def load_data():
     """加载数据"""
     data_dir = Path('data')
-    processed_files = list(data_dir.glob("ETHUSDT_*_processed_*.parquet"))
+    processed_files = discover_processed_files(data_dir, ('1h', '4h'))
     
     data = {}
-    for file_path in processed_files:
-        if '1h' in file_path.name:
-            df = pd.read_parquet(file_path)
-            df.set_index('open_time', inplace=True)
-            data['1h'] = df
-        elif '4h' in file_path.name:
-            df = pd.read_parquet(file_path)
-            df.set_index('open_time', inplace=True)
-            data['4h'] = df
+    for interval, file_path in processed_files.items():
+        df = read_parquet_batched(file_path, columns=REPORT_COLUMNS,
+                                  optional_columns=STABILITY_COLUMNS, dtypes=ANALYTICS_DTYPES)
+        df.set_index('open_time', inplace=True)
+        data[interval] = df
     
     return data
 
+def _price_hma_stats_numpy(price, hma):
+    """NumPy实现：价格/HMA的范围、均值及两者相关性"""
+    both = ~np.isnan(price) & ~np.isnan(hma)
+    return (
+        np.nanmin(price), np.nanmax(price), np.nanmean(price),
+        np.nanmin(hma), np.nanmax(hma), np.nanmean(hma),
+        np.corrcoef(price[both], hma[both])[0, 1],
+    )
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _price_hma_stats_numba(price, hma):
+        """单次遍历完成全部归约；协方差使用Welford增量更新以保证数值稳定"""
+        p_min = np.inf
+        p_max = -np.inf
+        p_sum = 0.0
+        p_n = 0
+        h_min = np.inf
+        h_max = -np.inf
+        h_sum = 0.0
+        h_n = 0
+        n = 0
+        mean_p = 0.0
+        mean_h = 0.0
+        m2_p = 0.0
+        m2_h = 0.0
+        c_ph = 0.0
+        for i in range(price.shape[0]):
+            p = price[i]
+            h = hma[i]
+            p_ok = p == p
+            h_ok = h == h
+            if p_ok:
+                p_n += 1
+                p_sum += p
+                p_min = min(p_min, p)
+                p_max = max(p_max, p)
+            if h_ok:
+                h_n += 1
+                h_sum += h
+                h_min = min(h_min, h)
+                h_max = max(h_max, h)
+            if p_ok and h_ok:
+                n += 1
+                dp = p - mean_p
+                mean_p += dp / n
+                dh = h - mean_h
+                mean_h += dh / n
+                m2_p += dp * (p - mean_p)
+                m2_h += dh * (h - mean_h)
+                c_ph += dp * (h - mean_h)
+        corr = c_ph / np.sqrt(m2_p * m2_h) if n > 1 else np.nan
+        return (
+            p_min, p_max, p_sum / p_n if p_n else np.nan,
+            h_min, h_max, h_sum / h_n if h_n else np.nan,
+            corr,
+        )
+
+def price_hma_stats(price, hma):
+    """
+    价格与HMA的基本统计
+    
+    Returns:
+        (价格最小值, 价格最大值, 价格均值, HMA最小值, HMA最大值, HMA均值, 相关系数)
+    """
+    price = np.ascontiguousarray(price, dtype=np.float64)
+    hma = np.ascontiguousarray(hma, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        return _price_hma_stats_numba(price, hma)
+    return _price_hma_stats_numpy(price, hma)
+
 def analyze_hma_effectiveness(data):
     """分析HMA有效性"""
     print("🔍 HMA有效性分析")
@@ -36,19 +126,21 @@ def analyze_hma_effectiveness(data):
         print(f"\n⏰ {interval} 数据:")
         print("-" * 40)
         
-        # HMA基本统计
-        hma = df['HMA_45'].dropna()
-        price = df['close']
+        # HMA基本统计（单次遍历完成）
+        hma_valid = int(df['HMA_45'].notna().sum())
+        (price_min, price_max, price_mean,
+         hma_min, hma_max, hma_mean, correlation) = price_hma_stats(
+            df['close'].to_numpy(), df['HMA_45'].to_numpy()
+        )
         
         print(f"📊 HMA基本统计:")
-        print(f"   有效值数量: {len(hma):,} / {len(df):,} ({len(hma)/len(df)*100:.1f}%)")
-        print(f"   价格范围: ${price.min():.2f} - ${price.max():.2f}")
-        print(f"   HMA范围: ${hma.min():.2f} - ${hma.max():.2f}")
-        print(f"   平均价格: ${price.mean():.2f}")
-        print(f"   平均HMA: ${hma.mean():.2f}")
+        print(f"   有效值数量: {hma_valid:,} / {len(df):,} ({hma_valid/len(df)*100:.1f}%)")
+        print(f"   价格范围: ${price_min:.2f} - ${price_max:.2f}")
+        print(f"   HMA范围: ${hma_min:.2f} - ${hma_max:.2f}")
+        print(f"   平均价格: ${price_mean:.2f}")
+        print(f"   平均HMA: ${hma_mean:.2f}")
         
         # HMA与价格的相关性
-        correlation = price.corr(hma)
         print(f"   价格与HMA相关性: {correlation:.4f}")
         
         # 偏离度分析
@@ -70,38 +162,27 @@ def analyze_hma_signals(data):
         print(f"\n⏰ {interval} 数据:")
         print("-" * 40)
         
-        # 创建交易信号
-        df_signal = df.copy()
-        df_signal['hma_signal'] = np.where(df_signal['close'] > df_signal['HMA_45'], 1, -1)
-        df_signal['signal_change'] = df_signal['hma_signal'].diff()
+        # 创建交易信号: 直接在列的ndarray视图上比较，不复制也不修改df
+        above = (df['close'].to_numpy() > df['HMA_45'].to_numpy()).astype(np.int8)
+        crossings = np.diff(above)
         
         # 信号统计
-        buy_signals = (df_signal['signal_change'] == 2).sum()  # 从-1到1
-        sell_signals = (df_signal['signal_change'] == -2).sum()  # 从1到-1
+        buy_signals = int((crossings == 1).sum())  # 从-1到1
+        sell_signals = int((crossings == -1).sum())  # 从1到-1
         
         print(f"📊 交易信号统计:")
         print(f"   买入信号: {buy_signals:,} 次")
         print(f"   卖出信号: {sell_signals:,} 次")
         print(f"   信号频率: {(buy_signals + sell_signals) / len(df) * 100:.2f}%")
         
-        # 信号持续时间分析
-        signal_durations = []
-        current_duration = 0
-        current_signal = None
-        
-        for signal in df_signal['hma_signal'].dropna():
-            if signal == current_signal:
-                current_duration += 1
-            else:
-                if current_signal is not None and current_duration > 0:
-                    signal_durations.append(current_duration)
-                current_signal = signal
-                current_duration = 1
-        
-        if signal_durations:
-            print(f"   平均信号持续时间: {np.mean(signal_durations):.1f} 期")
-            print(f"   最长信号持续时间: {max(signal_durations)} 期")
-            print(f"   最短信号持续时间: {min(signal_durations)} 期")
+        # 信号持续时间分析: 按信号变化点切分游程，最后一段尚未结束的信号不计入
+        change_points = np.flatnonzero(crossings) + 1
+        signal_durations = np.diff(np.concatenate(([0], change_points)))
+        
+        if len(signal_durations):
+            print(f"   平均信号持续时间: {signal_durations.mean():.1f} 期")
+            print(f"   最长信号持续时间: {signal_durations.max()} 期")
+            print(f"   最短信号持续时间: {signal_durations.min()} 期")
 
 def analyze_hma_performance(data):
     """分析HMA性能表现"""
@@ -112,36 +193,41 @@ def analyze_hma_performance(data):
         print(f"\n⏰ {interval} 数据:")
         print("-" * 40)
         
-        # 计算HMA跟踪误差
-        hma = df['HMA_45'].dropna()
-        price = df['close'].loc[hma.index]
+        # 计算HMA跟踪误差: 在原始数组上用同一个掩码取有效样本，避免dropna与索引对齐
+        hma = df['HMA_45'].to_numpy()
+        price = df['close'].to_numpy()
+        valid = ~np.isnan(hma)
+        error = price[valid] - hma[valid]
         
-        tracking_error = np.sqrt(np.mean((price - hma) ** 2))
-        mae = np.mean(np.abs(price - hma))
+        tracking_error = np.sqrt(np.nanmean(error ** 2))
+        mae = np.nanmean(np.abs(error))
         
         print(f"📊 HMA跟踪性能:")
         print(f"   均方根误差(RMSE): ${tracking_error:.2f}")
         print(f"   平均绝对误差(MAE): ${mae:.2f}")
-        print(f"   相对误差: {tracking_error / price.mean() * 100:.2f}%")
+        print(f"   相对误差: {tracking_error / np.nanmean(price[valid]) * 100:.2f}%")
         
         # 分析不同市场条件下的HMA表现
-        price_changes = df['price_change'].dropna()
+        price_change = df['price_change'].to_numpy()
+        deviation = df['hma_deviation'].to_numpy()
         
         # 上涨市场
-        up_market = df[df['price_change'] > 0.01]  # 涨幅>1%
-        if len(up_market) > 0:
-            up_deviation = up_market['hma_deviation'].dropna()
+        up_market = price_change > 0.01  # 涨幅>1%
+        if up_market.any():
+            up_deviation = deviation[up_market]
+            up_deviation = up_deviation[~np.isnan(up_deviation)]
             print(f"\n📈 上涨市场表现 (涨幅>1%):")
-            print(f"   样本数量: {len(up_market):,}")
+            print(f"   样本数量: {up_market.sum():,}")
             print(f"   平均偏离度: {up_deviation.mean():.3f}%")
             print(f"   正偏离比例: {(up_deviation > 0).sum() / len(up_deviation) * 100:.1f}%")
         
         # 下跌市场
-        down_market = df[df['price_change'] < -0.01]  # 跌幅>1%
-        if len(down_market) > 0:
-            down_deviation = down_market['hma_deviation'].dropna()
+        down_market = price_change < -0.01  # 跌幅>1%
+        if down_market.any():
+            down_deviation = deviation[down_market]
+            down_deviation = down_deviation[~np.isnan(down_deviation)]
             print(f"\n📉 下跌市场表现 (跌幅>1%):")
-            print(f"   样本数量: {len(down_market):,}")
+            print(f"   样本数量: {down_market.sum():,}")
             print(f"   平均偏离度: {down_deviation.mean():.3f}%")
             print(f"   负偏离比例: {(down_deviation < 0).sum() / len(down_deviation) * 100:.1f}%")
 
@@ -154,18 +240,26 @@ def analyze_hma_stability(data):
         print(f"\n⏰ {interval} 数据:")
         print("-" * 40)
         
-        # 计算HMA变化率
-        hma = df['HMA_45'].dropna()
-        hma_change = hma.pct_change().dropna()
+        # HMA变化率与二阶差分: 优先读取数据管道预先计算的列，否则在ndarray上现场计算
+        if all(col in df.columns for col in STABILITY_COLUMNS):
+            hma_change = df['hma45_change_pct'].to_numpy()
+            hma_change = hma_change[~np.isnan(hma_change)]
+            hma_second_diff = df['hma45_second_diff'].to_numpy()
+            hma_second_diff = hma_second_diff[~np.isnan(hma_second_diff)]
+        else:
+            # HMA_45 按float64读取（见 ANALYTICS_DTYPES），差分在原精度上计算
+            hma = df['HMA_45'].to_numpy()
+            hma = hma[~np.isnan(hma)]
+            hma_change = hma[1:] / hma[:-1] - 1
+            hma_second_diff = np.diff(hma, n=2)
         
         print(f"📊 HMA变化率统计:")
         print(f"   平均变化率: {hma_change.mean()*100:.4f}%")
-        print(f"   变化率标准差: {hma_change.std()*100:.4f}%")
+        print(f"   变化率标准差: {hma_change.std(ddof=1)*100:.4f}%")
         print(f"   最大变化率: {hma_change.max()*100:.2f}%")
         print(f"   最小变化率: {hma_change.min()*100:.2f}%")
         
         # 分析HMA平滑度
-        hma_second_diff = hma.diff().diff().dropna()
         smoothness = 1 / (1 + np.std(hma_second_diff))
         
         print(f"\n📈 HMA平滑度:")
@@ -178,25 +272,39 @@ def generate_hma_summary(data):
     print("=" * 60)
     
     total_records = sum(len(df) for df in data.values())
-    total_hma_values = sum(len(df['HMA_45'].dropna()) for df in data.values())
+    total_hma_values = sum(int(df['HMA_45'].count()) for df in data.values())
     
     print(f"📊 数据概览:")
     print(f"   总记录数: {total_records:,}")
     print(f"   有效HMA值: {total_hma_values:,}")
     print(f"   HMA覆盖率: {total_hma_values/total_records*100:.1f}%")
     
-    # 计算整体HMA性能
-    all_deviations = []
+    # 计算整体HMA性能: 逐个周期合并均值/方差（Chan并行Welford），不拼接全部偏离度
+    count, mean, m2 = 0, 0.0, 0.0
+    dev_min, dev_max, high_count = np.inf, -np.inf, 0
     for df in data.values():
-        deviations = df['hma_deviation'].dropna()
-        all_deviations.extend(deviations.tolist())
+        dev = df['hma_deviation'].to_numpy()
+        dev = dev[~np.isnan(dev)]
+        n = len(dev)
+        if n == 0:
+            continue
+        batch_mean = dev.mean()
+        batch_m2 = np.square(dev - batch_mean).sum()
+        delta = batch_mean - mean
+        total = count + n
+        mean += delta * n / total
+        m2 += batch_m2 + delta ** 2 * count * n / total
+        count = total
+        dev_min = min(dev_min, dev.min())
+        dev_max = max(dev_max, dev.max())
+        high_count += int((np.abs(dev) > 5).sum())
     
-    if all_deviations:
+    if count:
         print(f"\n🎯 整体HMA性能:")
-        print(f"   平均偏离度: {np.mean(all_deviations):.3f}%")
-        print(f"   偏离度标准差: {np.std(all_deviations):.3f}%")
-        print(f"   偏离度范围: {min(all_deviations):.2f}% 到 {max(all_deviations):.2f}%")
-        print(f"   高偏离度比例(>5%): {sum(abs(d) > 5 for d in all_deviations)/len(all_deviations)*100:.1f}%")
+        print(f"   平均偏离度: {mean:.3f}%")
+        print(f"   偏离度标准差: {np.sqrt(m2 / count):.3f}%")
+        print(f"   偏离度范围: {dev_min:.2f}% 到 {dev_max:.2f}%")
+        print(f"   高偏离度比例(>5%): {high_count/count*100:.1f}%")
     
     print(f"\n✅ HMA指标表现:")
     print(f"   • HMA与价格高度相关，跟踪效果良好")
@@ -3,152 +3,194 @@
 快速可视化分析
 生成关键图表进行HMA分析
 """
+import sys
 import pandas as pd
 import numpy as np
+import matplotlib
 import matplotlib.pyplot as plt
 from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from ..utils.downsample import lttb_indices
+except ImportError:
+    # 作为脚本直接运行时，将src加入路径后按顶层包 utils 导入
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from utils.downsample import lttb_indices
+
 # 设置中文字体支持
 plt.rcParams['font.sans-serif'] = ['Arial Unicode MS', 'SimHei', 'DejaVu Sans']
 plt.rcParams['axes.unicode_minus'] = False
 
+# 长序列折线: 合并同一像素内的顶点，并分块光栅化
+plt.rcParams['path.simplify'] = True
+plt.rcParams['path.simplify_threshold'] = 1.0
+plt.rcParams['agg.path.chunksize'] = 10000
+
+# 价格/HMA折线降采样后的点数
+PLOT_MAX_POINTS = 2000
+
+# 综合分析图表的全部面板，create_comprehensive_analysis 可只绘制其中一部分
+ALL_PANELS = ('price', 'deviation', 'signals', 'correlation', 'distribution', 'stats')
+
+# 综合分析图表实际用到的列，其余指标列不读取
+PLOT_COLUMNS = ['open_time', 'close', 'HMA_45', 'hma_deviation', 'price_change']
+
 def load_data():
-    """加载数据"""
+    """加载数据（只读取绘图所需的列）"""
     data_dir = Path('data')
     processed_files = list(data_dir.glob("ETHUSDT_*_processed_*.parquet"))
     
     data = {}
     for file_path in processed_files:
         if '1h' in file_path.name:
-            df = pd.read_parquet(file_path)
-            df.set_index('open_time', inplace=True)
-            data['1h'] = df
+            interval = '1h'
         elif '4h' in file_path.name:
-            df = pd.read_parquet(file_path)
-            df.set_index('open_time', inplace=True)
-            data['4h'] = df
+            interval = '4h'
+        else:
+            continue
+        data[interval] = pd.read_parquet(file_path, columns=PLOT_COLUMNS,
+                                         engine='pyarrow').set_index('open_time')
     
     return data
 
-def create_comprehensive_analysis(data):
-    """创建综合分析图表"""
+def create_comprehensive_analysis(data, dpi=150, panels=ALL_PANELS):
+    """
+    创建综合分析图表
+    
+    Args:
+        data: {'1h': DataFrame, '4h': DataFrame}
+        dpi: 保存图片的分辨率
+        panels: 需要绘制的面板（ALL_PANELS 的子集），未列出的面板不创建坐标轴
+    """
+    panels = set(panels)
     fig = plt.figure(figsize=(20, 15))
     
     # 创建子图布局
     gs = fig.add_gridspec(4, 3, hspace=0.3, wspace=0.3)
     
-    # 1. 价格与HMA对比 (1小时)
-    ax1 = fig.add_subplot(gs[0, :2])
     df_1h = data['1h']
-    ax1.plot(df_1h.index, df_1h['close'], label='ETH价格', linewidth=0.8, alpha=0.8, color='blue')
-    ax1.plot(df_1h.index, df_1h['HMA_45'], label='HMA_45', linewidth=1.2, alpha=0.9, color='red')
-    ax1.fill_between(df_1h.index, df_1h['close'], df_1h['HMA_45'], 
-                    where=(df_1h['close'] >= df_1h['HMA_45']), 
-                    color='green', alpha=0.2)
-    ax1.fill_between(df_1h.index, df_1h['close'], df_1h['HMA_45'], 
-                    where=(df_1h['close'] < df_1h['HMA_45']), 
-                    color='red', alpha=0.2)
-    ax1.set_title('ETH价格与HMA对比 (1小时)', fontsize=14, fontweight='bold')
-    ax1.set_ylabel('价格 (USDT)')
-    ax1.legend()
-    ax1.grid(True, alpha=0.3)
+    df_4h = data['4h']
+    deviation_1h = df_1h['hma_deviation'].dropna()
+    deviation_4h = df_4h['hma_deviation'].dropna()
+    plot_1h = df_1h.iloc[lttb_indices(df_1h['close'].to_numpy(), PLOT_MAX_POINTS)]
+    
+    # 交易信号: 价格在HMA上方为1，否则为-1（int8，不复制df），信号变化为±2处即买卖点
+    close_1h = df_1h['close'].to_numpy()
+    hma_signal = np.where(close_1h > df_1h['HMA_45'].to_numpy(), np.int8(1), np.int8(-1))
+    signal_change = np.diff(hma_signal)
+    buy_idx = np.flatnonzero(signal_change == 2) + 1
+    sell_idx = np.flatnonzero(signal_change == -2) + 1
+    
+    # 1. 价格与HMA对比 (1小时)
+    if 'price' in panels:
+        ax1 = fig.add_subplot(gs[0, :2])
+        ax1.plot(plot_1h.index, plot_1h['close'], label='ETH价格', linewidth=0.8, alpha=0.8, color='blue')
+        ax1.plot(plot_1h.index, plot_1h['HMA_45'], label='HMA_45', linewidth=1.2, alpha=0.9, color='red')
+        ax1.fill_between(plot_1h.index, plot_1h['close'], plot_1h['HMA_45'], 
+                        where=(plot_1h['close'] >= plot_1h['HMA_45']), 
+                        color='green', alpha=0.2)
+        ax1.fill_between(plot_1h.index, plot_1h['close'], plot_1h['HMA_45'], 
+                        where=(plot_1h['close'] < plot_1h['HMA_45']), 
+                        color='red', alpha=0.2)
+        ax1.set_title('ETH价格与HMA对比 (1小时)', fontsize=14, fontweight='bold')
+        ax1.set_ylabel('价格 (USDT)')
+        ax1.legend()
+        ax1.grid(True, alpha=0.3)
     
     # 2. HMA偏离度 (1小时)
-    ax2 = fig.add_subplot(gs[0, 2])
-    deviation_1h = df_1h['hma_deviation'].dropna()
-    ax2.hist(deviation_1h, bins=50, alpha=0.7, color='purple', edgecolor='black')
-    ax2.axvline(x=0, color='red', linestyle='--', alpha=0.7)
-    ax2.axvline(x=deviation_1h.mean(), color='green', linestyle='-', alpha=0.7)
-    ax2.set_title('HMA偏离度分布 (1小时)')
-    ax2.set_xlabel('偏离度 (%)')
-    ax2.set_ylabel('频次')
-    ax2.grid(True, alpha=0.3)
+    if 'deviation' in panels:
+        ax2 = fig.add_subplot(gs[0, 2])
+        ax2.hist(deviation_1h, bins=50, alpha=0.7, color='purple', edgecolor='black')
+        ax2.axvline(x=0, color='red', linestyle='--', alpha=0.7)
+        ax2.axvline(x=deviation_1h.mean(), color='green', linestyle='-', alpha=0.7)
+        ax2.set_title('HMA偏离度分布 (1小时)')
+        ax2.set_xlabel('偏离度 (%)')
+        ax2.set_ylabel('频次')
+        ax2.grid(True, alpha=0.3)
     
     # 3. 价格与HMA对比 (4小时)
-    ax3 = fig.add_subplot(gs[1, :2])
-    df_4h = data['4h']
-    ax3.plot(df_4h.index, df_4h['close'], label='ETH价格', linewidth=0.8, alpha=0.8, color='blue')
-    ax3.plot(df_4h.index, df_4h['HMA_45'], label='HMA_45', linewidth=1.2, alpha=0.9, color='red')
-    ax3.fill_between(df_4h.index, df_4h['close'], df_4h['HMA_45'], 
-                    where=(df_4h['close'] >= df_4h['HMA_45']), 
-                    color='green', alpha=0.2)
-    ax3.fill_between(df_4h.index, df_4h['close'], df_4h['HMA_45'], 
-                    where=(df_4h['close'] < df_4h['HMA_45']), 
-                    color='red', alpha=0.2)
-    ax3.set_title('ETH价格与HMA对比 (4小时)', fontsize=14, fontweight='bold')
-    ax3.set_ylabel('价格 (USDT)')
-    ax3.legend()
-    ax3.grid(True, alpha=0.3)
+    if 'price' in panels:
+        ax3 = fig.add_subplot(gs[1, :2])
+        plot_4h = df_4h.iloc[lttb_indices(df_4h['close'].to_numpy(), PLOT_MAX_POINTS)]
+        ax3.plot(plot_4h.index, plot_4h['close'], label='ETH价格', linewidth=0.8, alpha=0.8, color='blue')
+        ax3.plot(plot_4h.index, plot_4h['HMA_45'], label='HMA_45', linewidth=1.2, alpha=0.9, color='red')
+        ax3.fill_between(plot_4h.index, plot_4h['close'], plot_4h['HMA_45'], 
+                        where=(plot_4h['close'] >= plot_4h['HMA_45']), 
+                        color='green', alpha=0.2)
+        ax3.fill_between(plot_4h.index, plot_4h['close'], plot_4h['HMA_45'], 
+                        where=(plot_4h['close'] < plot_4h['HMA_45']), 
+                        color='red', alpha=0.2)
+        ax3.set_title('ETH价格与HMA对比 (4小时)', fontsize=14, fontweight='bold')
+        ax3.set_ylabel('价格 (USDT)')
+        ax3.legend()
+        ax3.grid(True, alpha=0.3)
     
     # 4. HMA偏离度 (4小时)
-    ax4 = fig.add_subplot(gs[1, 2])
-    deviation_4h = df_4h['hma_deviation'].dropna()
-    ax4.hist(deviation_4h, bins=50, alpha=0.7, color='purple', edgecolor='black')
-    ax4.axvline(x=0, color='red', linestyle='--', alpha=0.7)
-    ax4.axvline(x=deviation_4h.mean(), color='green', linestyle='-', alpha=0.7)
-    ax4.set_title('HMA偏离度分布 (4小时)')
-    ax4.set_xlabel('偏离度 (%)')
-    ax4.set_ylabel('频次')
-    ax4.grid(True, alpha=0.3)
+    if 'deviation' in panels:
+        ax4 = fig.add_subplot(gs[1, 2])
+        ax4.hist(deviation_4h, bins=50, alpha=0.7, color='purple', edgecolor='black')
+        ax4.axvline(x=0, color='red', linestyle='--', alpha=0.7)
+        ax4.axvline(x=deviation_4h.mean(), color='green', linestyle='-', alpha=0.7)
+        ax4.set_title('HMA偏离度分布 (4小时)')
+        ax4.set_xlabel('偏离度 (%)')
+        ax4.set_ylabel('频次')
+        ax4.grid(True, alpha=0.3)
     
     # 5. 交易信号分析 (1小时)
-    ax5 = fig.add_subplot(gs[2, :])
-    df_signal = df_1h.copy()
-    df_signal['hma_signal'] = np.where(df_signal['close'] > df_signal['HMA_45'], 1, -1)
-    df_signal['signal_change'] = df_signal['hma_signal'].diff()
-    
-    ax5.plot(df_signal.index, df_signal['close'], label='ETH价格', linewidth=0.8, alpha=0.8)
-    ax5.plot(df_signal.index, df_signal['HMA_45'], label='HMA_45', linewidth=1.2, alpha=0.9)
-    
-    # 标记交易信号
-    buy_signals = df_signal[df_signal['signal_change'] == 2]
-    sell_signals = df_signal[df_signal['signal_change'] == -2]
-    
-    ax5.scatter(buy_signals.index, buy_signals['close'], 
-               color='green', alpha=0.7, s=15, label=f'买入信号 ({len(buy_signals)})', marker='^')
-    ax5.scatter(sell_signals.index, sell_signals['close'], 
-               color='red', alpha=0.7, s=15, label=f'卖出信号 ({len(sell_signals)})', marker='v')
-    
-    ax5.set_title('HMA交易信号分析 (1小时)', fontsize=14, fontweight='bold')
-    ax5.set_ylabel('价格 (USDT)')
-    ax5.legend()
-    ax5.grid(True, alpha=0.3)
+    if 'signals' in panels:
+        ax5 = fig.add_subplot(gs[2, :])
+        ax5.plot(plot_1h.index, plot_1h['close'], label='ETH价格', linewidth=0.8, alpha=0.8)
+        ax5.plot(plot_1h.index, plot_1h['HMA_45'], label='HMA_45', linewidth=1.2, alpha=0.9)
+        
+        # 标记交易信号
+        ax5.scatter(df_1h.index[buy_idx], close_1h[buy_idx], 
+                   color='green', alpha=0.7, s=15, label=f'买入信号 ({len(buy_idx)})', marker='^')
+        ax5.scatter(df_1h.index[sell_idx], close_1h[sell_idx], 
+                   color='red', alpha=0.7, s=15, label=f'卖出信号 ({len(sell_idx)})', marker='v')
+        
+        ax5.set_title('HMA交易信号分析 (1小时)', fontsize=14, fontweight='bold')
+        ax5.set_ylabel('价格 (USDT)')
+        ax5.legend()
+        ax5.grid(True, alpha=0.3)
     
     # 6. 相关性分析
-    ax6 = fig.add_subplot(gs[3, 0])
-    corr_data = df_1h[['close', 'HMA_45', 'price_change', 'hma_deviation']].corr()
-    im = ax6.imshow(corr_data, cmap='coolwarm', aspect='auto', vmin=-1, vmax=1)
-    ax6.set_xticks(range(len(corr_data.columns)))
-    ax6.set_yticks(range(len(corr_data.columns)))
-    ax6.set_xticklabels(corr_data.columns, rotation=45)
-    ax6.set_yticklabels(corr_data.columns)
-    ax6.set_title('变量相关性矩阵')
-    
-    # 添加数值标注
-    for i in range(len(corr_data.columns)):
-        for j in range(len(corr_data.columns)):
-            text = ax6.text(j, i, f'{corr_data.iloc[i, j]:.3f}',
-                           ha="center", va="center", color="black", fontsize=8)
+    if 'correlation' in panels:
+        ax6 = fig.add_subplot(gs[3, 0])
+        corr_data = df_1h[['close', 'HMA_45', 'price_change', 'hma_deviation']].corr()
+        im = ax6.imshow(corr_data, cmap='coolwarm', aspect='auto', vmin=-1, vmax=1)
+        ax6.set_xticks(range(len(corr_data.columns)))
+        ax6.set_yticks(range(len(corr_data.columns)))
+        ax6.set_xticklabels(corr_data.columns, rotation=45)
+        ax6.set_yticklabels(corr_data.columns)
+        ax6.set_title('变量相关性矩阵')
+        
+        # 添加数值标注
+        for i in range(len(corr_data.columns)):
+            for j in range(len(corr_data.columns)):
+                text = ax6.text(j, i, f'{corr_data.iloc[i, j]:.3f}',
+                               ha="center", va="center", color="black", fontsize=8)
     
     # 7. 价格变化分布
-    ax7 = fig.add_subplot(gs[3, 1])
-    price_changes = df_1h['price_change'].dropna() * 100
-    ax7.hist(price_changes, bins=100, alpha=0.7, color='skyblue', edgecolor='black')
-    ax7.axvline(x=0, color='red', linestyle='--', alpha=0.7)
-    ax7.axvline(x=price_changes.mean(), color='green', linestyle='-', alpha=0.7)
-    ax7.set_title('价格变化分布')
-    ax7.set_xlabel('价格变化 (%)')
-    ax7.set_ylabel('频次')
-    ax7.grid(True, alpha=0.3)
+    if 'distribution' in panels:
+        ax7 = fig.add_subplot(gs[3, 1])
+        price_changes = df_1h['price_change'].dropna() * 100
+        ax7.hist(price_changes, bins=100, alpha=0.7, color='skyblue', edgecolor='black')
+        ax7.axvline(x=0, color='red', linestyle='--', alpha=0.7)
+        ax7.axvline(x=price_changes.mean(), color='green', linestyle='-', alpha=0.7)
+        ax7.set_title('价格变化分布')
+        ax7.set_xlabel('价格变化 (%)')
+        ax7.set_ylabel('频次')
+        ax7.grid(True, alpha=0.3)
     
     # 8. 统计信息
-    ax8 = fig.add_subplot(gs[3, 2])
-    ax8.axis('off')
+    if 'stats' in panels:
+        ax8 = fig.add_subplot(gs[3, 2])
+        ax8.axis('off')
     
-    # 计算统计信息
-    stats_text = f"""
+        # 计算统计信息
+        stats_text = f"""
     📊 HMA分析统计
     
     1小时数据:
@@ -168,18 +210,22 @@ def create_comprehensive_analysis(data):
     • 偏离度标准差: {deviation_4h.std():.3f}%
     
     交易信号:
-    • 买入信号: {len(buy_signals):,} 次
-    • 卖出信号: {len(sell_signals):,} 次
-    • 信号频率: {(len(buy_signals) + len(sell_signals)) / len(df_1h) * 100:.1f}%
+    • 买入信号: {len(buy_idx):,} 次
+    • 卖出信号: {len(sell_idx):,} 次
+    • 信号频率: {(len(buy_idx) + len(sell_idx)) / len(df_1h) * 100:.1f}%
     """
     
-    ax8.text(0.05, 0.95, stats_text, transform=ax8.transAxes, fontsize=10,
-             verticalalignment='top', fontfamily='monospace',
-             bbox=dict(boxstyle='round', facecolor='lightgray', alpha=0.8))
+        ax8.text(0.05, 0.95, stats_text, transform=ax8.transAxes, fontsize=10,
+                 verticalalignment='top', fontfamily='monospace',
+                 bbox=dict(boxstyle='round', facecolor='lightgray', alpha=0.8))
     
     plt.suptitle('ETH HMA 综合分析报告', fontsize=18, fontweight='bold', y=0.98)
-    plt.savefig('ETH_HMA_Comprehensive_Analysis.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    plt.savefig('ETH_HMA_Comprehensive_Analysis.png', dpi=dpi, bbox_inches='tight')
+    # 无界面后端(Agg)下 show() 没有意义，直接释放图表
+    if matplotlib.get_backend().lower() == 'agg':
+        plt.close(fig)
+    else:
+        plt.show()
 
 def main():
     """主函数"""
@@ -11,24 +11,287 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-import seaborn as sns
+import matplotlib.dates as mdates
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.markers import MarkerStyle
 from typing import List, Dict, Optional
 import logging
+from functools import lru_cache
+from types import MappingProxyType
 from pathlib import Path
 # 导入已移动到core目录的模块
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'eth_hma_analysis', 'core'))
-from trend_analyzer import TrendInterval, EventAnalysis
+try:
+    from ..eth_hma_analysis.core.trend_analyzer import TrendInterval, EventAnalysis
+    from ..eth_hma_analysis.core._event_stats_numba import mean_std_axis0
+except ImportError:
+    # 作为顶层包 analyzers 导入时（scripts 将 src 加入 sys.path）
+    from eth_hma_analysis.core.trend_analyzer import TrendInterval, EventAnalysis
+    from eth_hma_analysis.core._event_stats_numba import mean_std_axis0
 
 logger = logging.getLogger(__name__)
 
 # 字体设置将在TrendVisualizer类中根据语言选择进行
 
+# 当前已应用到全局rcParams的seaborn样式名（None表示未应用或已被 rcdefaults 重置）
+_STYLE_APPLIED = None
+
+
+def _apply_style(style: str) -> None:
+    """应用seaborn样式；seaborn在此处才导入，只做数值分析而不画图的流程不必加载它"""
+    global _STYLE_APPLIED
+    if _STYLE_APPLIED == style:
+        return
+    import seaborn as sns
+    sns.set_style(style)
+    _STYLE_APPLIED = style
+
+
+# 固定子图边距（按中文12号字、英文10号字两种标签都不重叠取值），代替每次重新求解的 tight_layout
+_LAYOUT_STACKED = MappingProxyType(dict(left=0.065, right=0.985, bottom=0.07, top=0.915, hspace=0.22))
+_LAYOUT_GRID = MappingProxyType(dict(left=0.065, right=0.985, bottom=0.07, top=0.915, wspace=0.14, hspace=0.25))
+
+# 保存为矢量格式时，栅格化的密集曲线/成交量/区间色带使用的分辨率
+VECTOR_FORMATS = ('.pdf', '.svg', '.eps')
+VECTOR_RASTER_DPI = 150
+
+
+# 图表标签（只读，所有TrendVisualizer实例共享）
+_LABELS_ZH = MappingProxyType({
+    'title_turning_points': 'HMA拐点识别分析',
+    'title_price_trend': '价格走势与HMA拐点',
+    'title_slope_change': 'HMA斜率变化',
+    'title_volume': '成交量',
+    'title_volume_no_data': '成交量 (无数据)',
+    'price_label': 'ETH价格',
+    'hma_label': 'HMA45',
+    'slope_label': 'HMA斜率',
+    'volume_label': '成交量',
+    'up_turn': '上拐点',
+    'down_turn': '下拐点',
+    'time_label': '时间',
+    'price_usdt': '价格 (USDT)',
+    'slope_value': '斜率',
+    'volume_value': '成交量',
+    'title_trend_intervals': '趋势区间分析',
+    'title_price_trend_intervals': '价格走势与趋势区间',
+    'title_price_change_dist': '区间价格变化分布',
+    'title_pfe_vs_mae': 'PFE vs MAE 分析',
+    'title_duration_dist': '区间持续时间分布',
+    'up_trend': '上升趋势',
+    'down_trend': '下降趋势',
+    'price_change_pct': '价格变化 (%)',
+    'frequency': '频次',
+    'duration_cycles': '持续时间 (周期)',
+    'title_event_analysis': '事件分析 - 斜率改变时的价格行为',
+    'title_price_change_trend': '事件后价格变化趋势',
+    'title_volatility_dist': '事件窗口波动率分布',
+    'title_consistency_dist': '事件预测一致性分布',
+    'title_event_time_dist': '事件时间分布',
+    'avg_price_change_pct': '平均价格变化 (%)',
+    'periods_after_event': '事件后周期数',
+    'annualized_volatility': '年化波动率',
+    'consistency_pct': '一致性 (%)',
+    'event_type': '事件类型',
+    'up': '上升',
+    'down': '下降',
+    'title_comprehensive': 'ETH HMA趋势分析 - 综合分析报告',
+    'title_price_trend_comprehensive': 'ETH价格走势与HMA拐点分析',
+    'title_interval_count': '趋势区间数量',
+    'title_avg_returns': '平均价格变化',
+    'title_max_capture': '最大有利偏移 (PFE)',
+    'title_event_consistency': '事件预测一致性分析',
+    'count': '数量',
+    'change_pct': '变化 (%)',
+    'max_pfe_up': '上升最大PFE',
+    'max_pfe_down': '下降最大PFE',
+    'consistency_up': '上升拐点一致性',
+    'consistency_down': '下降拐点一致性',
+    'baseline_50': '50%基准线'
+})
+
+_LABELS_EN = MappingProxyType({
+    'title_turning_points': 'HMA Turning Points Analysis',
+    'title_price_trend': 'Price Trend with HMA Turning Points',
+    'title_slope_change': 'HMA Slope Changes',
+    'title_volume': 'Volume',
+    'title_volume_no_data': 'Volume (No Data)',
+    'price_label': 'ETH Price',
+    'hma_label': 'HMA45',
+    'slope_label': 'HMA Slope',
+    'volume_label': 'Volume',
+    'up_turn': 'Up Turn',
+    'down_turn': 'Down Turn',
+    'time_label': 'Time',
+    'price_usdt': 'Price (USDT)',
+    'slope_value': 'Slope',
+    'volume_value': 'Volume',
+    'title_trend_intervals': 'Trend Intervals Analysis',
+    'title_price_trend_intervals': 'Price Trend with Trend Intervals',
+    'title_price_change_dist': 'Price Change Distribution',
+    'title_pfe_vs_mae': 'PFE vs MAE Analysis',
+    'title_duration_dist': 'Duration Distribution',
+    'up_trend': 'Up Trend',
+    'down_trend': 'Down Trend',
+    'price_change_pct': 'Price Change (%)',
+    'frequency': 'Frequency',
+    'duration_cycles': 'Duration (Cycles)',
+    'title_event_analysis': 'Event Analysis - Price Behavior at Slope Changes',
+    'title_price_change_trend': 'Price Change Trend After Events',
+    'title_volatility_dist': 'Volatility Distribution',
+    'title_consistency_dist': 'Consistency Distribution',
+    'title_event_time_dist': 'Event Time Distribution',
+    'avg_price_change_pct': 'Average Price Change (%)',
+    'periods_after_event': 'Periods After Event',
+    'annualized_volatility': 'Annualized Volatility',
+    'consistency_pct': 'Consistency (%)',
+    'event_type': 'Event Type',
+    'up': 'Up',
+    'down': 'Down',
+    'title_comprehensive': 'ETH HMA Trend Analysis - Comprehensive Report',
+    'title_price_trend_comprehensive': 'ETH Price Trend with HMA Turning Points',
+    'title_interval_count': 'Trend Interval Count',
+    'title_avg_returns': 'Average Price Change',
+    'title_max_capture': 'Maximum Favorable Excursion (PFE)',
+    'title_event_consistency': 'Event Prediction Consistency Analysis',
+    'count': 'Count',
+    'change_pct': 'Change (%)',
+    'max_pfe_up': 'Max PFE Up',
+    'max_pfe_down': 'Max PFE Down',
+    'consistency_up': 'Up Turn Consistency',
+    'consistency_down': 'Down Turn Consistency',
+    'baseline_50': '50% Baseline'
+})
+
+
+# 中文字体候选（按优先级），取第一个已安装的
+CHINESE_FONT_CANDIDATES = ('SimHei', 'Microsoft YaHei', 'PingFang SC', 'Noto Sans CJK SC',
+                           'Source Han Sans SC', 'WenQuanYi Micro Hei', 'Arial Unicode MS')
+
+
+@lru_cache(maxsize=2)
+def _resolve_chinese_font(use_chinese: bool) -> Optional[str]:
+    """
+    在已安装字体中查找可用的中文字体，未找到时返回None
+    
+    遍历 fontManager.ttflist 只在首次调用时进行，之后创建可视化器直接使用缓存结果
+    """
+    if not use_chinese:
+        return None
+    import matplotlib.font_manager as fm
+    installed = {f.name for f in fm.fontManager.ttflist}
+    return next((name for name in CHINESE_FONT_CANDIDATES if name in installed), None)
+
+
+def _f32(values) -> np.ndarray:
+    """绘图用float32数组；Agg渲染本身按float32处理坐标，传入float64只会多一倍内存搬运"""
+    return np.asarray(values).astype(np.float32, copy=False)
+
+
+def _paired_hist(ax, up: np.ndarray, down: np.ndarray, bins: int, up_label: str, down_label: str) -> None:
+    """
+    上升（绿）/下降（红）两组数据的直方图: 先用NumPy按两组共享的bin边界计数，
+    每组只画一个填充的StepPatch，不再为每个柱子创建Rectangle；非有限值不参与统计
+    """
+    up = up[np.isfinite(up)]
+    down = down[np.isfinite(down)]
+    if not (up.size or down.size):
+        return
+    edges = np.histogram_bin_edges(np.concatenate([up, down]), bins=bins)
+    for values, label, color in ((up, up_label, 'green'), (down, down_label, 'red')):
+        if values.size:
+            counts, _ = np.histogram(values, bins=edges)
+            ax.stairs(counts, edges, fill=True, alpha=0.7, label=label, color=color)
+
+
+def _marker_path(marker: str):
+    """标记的单位路径（与 scatter 对单一标记的处理相同）"""
+    style = MarkerStyle(marker)
+    return style.get_path().transformed(style.get_transform())
+
+
+_UP_MARKER_PATH = _marker_path('^')
+_DOWN_MARKER_PATH = _marker_path('v')
+
+
+def _scatter_turning_points(ax, x: np.ndarray, y: np.ndarray, mask_up: np.ndarray, mask_down: np.ndarray,
+                            s: float, up_label: Optional[str] = None, down_label: Optional[str] = None) -> None:
+    """
+    上拐点（绿色^）和下拐点（红色v）画在同一个PathCollection中，逐点指定颜色和标记路径
+    
+    图例条目由不含数据的Line2D提供
+    """
+    selected = mask_up | mask_down
+    is_up = mask_up[selected]
+    points = ax.scatter(x[selected], y[selected], c=np.where(is_up, 'green', 'red'), s=s, zorder=5)
+    points.set_paths([_UP_MARKER_PATH if up else _DOWN_MARKER_PATH for up in is_up])
+    for label, marker, color in ((up_label, '^', 'green'), (down_label, 'v', 'red')):
+        if label:
+            ax.plot([], [], linestyle='none', marker=marker, color=color, markersize=np.sqrt(s), label=label)
+
+
+def _stack_price_changes(events: List[EventAnalysis]) -> np.ndarray:
+    """
+    将各事件的后续价格变化写入预分配的 (事件数, K) float32 数组
+    
+    K为最长的价格变化序列长度；数据末尾的事件后续周期不足K个，缺少的部分为NaN
+    """
+    width = max((len(e.price_changes) for e in events), default=0)
+    buf = np.full((len(events), width), np.nan, dtype=np.float32)
+    for row, event in zip(buf, events):
+        row[:len(event.price_changes)] = event.price_changes
+    return buf
+
+
+def _intervals_to_soa(intervals: List[TrendInterval]) -> Dict[str, np.ndarray]:
+    """趋势区间列表转换为按字段存放的数组（每个对象只访问一次），各图表按方向掩码切片"""
+    n = len(intervals)
+    is_up = np.fromiter((i.trend_direction == 'up' for i in intervals), dtype=bool, count=n)
+    return {
+        'is_up': is_up,
+        'color': np.where(is_up, 'green', 'red'),
+        'start_time': pd.DatetimeIndex([i.start_time for i in intervals]),
+        'end_time': pd.DatetimeIndex([i.end_time for i in intervals]),
+        'start_price': np.fromiter((i.start_price for i in intervals), dtype=np.float64, count=n),
+        'end_price': np.fromiter((i.end_price for i in intervals), dtype=np.float64, count=n),
+        'duration': np.fromiter((i.duration for i in intervals), dtype=np.int64, count=n),
+        'price_change_pct': np.fromiter((i.price_change_pct for i in intervals), dtype=np.float64, count=n),
+        'pfe_pct': np.fromiter((i.pfe_pct for i in intervals), dtype=np.float64, count=n),
+        'mae_pct': np.fromiter((i.mae_pct for i in intervals), dtype=np.float64, count=n),
+    }
+
+
+def _events_to_soa(events: List[EventAnalysis]) -> Dict[str, np.ndarray]:
+    """事件列表转换为按字段存放的数组"""
+    n = len(events)
+    return {
+        'is_up': np.fromiter((e.event_type == 'up_turn' for e in events), dtype=bool, count=n),
+        'event_time': pd.DatetimeIndex([e.event_time for e in events]),
+        'volatility': np.fromiter((e.volatility for e in events), dtype=np.float64, count=n),
+        'consistency': np.fromiter((e.consistency for e in events), dtype=np.float64, count=n),
+    }
+
+
+def _shade_intervals(ax, soa: Dict[str, np.ndarray], alpha: float) -> None:
+    """
+    用一个PolyCollection绘制全部趋势区间的竖向色带（上升绿色、下降红色）
+    
+    与逐个 axvspan 的效果相同：x为数据坐标，y覆盖整个坐标轴高度，但只产生一个artist
+    """
+    x0 = mdates.date2num(soa['start_time'])
+    x1 = mdates.date2num(soa['end_time'])
+    verts = np.empty((len(x0), 4, 2))
+    verts[:, :, 0] = np.column_stack([x0, x0, x1, x1])
+    verts[:, :, 1] = [0, 1, 1, 0]
+    ax.add_collection(PolyCollection(verts, facecolors=soa['color'], edgecolors=soa['color'], alpha=alpha,
+                                     transform=ax.get_xaxis_transform(), rasterized=True), autolim=False)
+
+
 class TrendVisualizer:
     """趋势分析可视化器"""
     
-    def __init__(self, figsize: tuple = (15, 10), style: str = 'whitegrid', use_chinese: bool = False):
+    def __init__(self, figsize: tuple = (15, 10), style: str = 'whitegrid', use_chinese: bool = False,
+                 backend: Optional[str] = None):
         """
         初始化可视化器
         
@@ -36,121 +299,23 @@ class TrendVisualizer:
             figsize: 图表尺寸
             style: 图表样式
             use_chinese: 是否使用中文标签
+            backend: matplotlib后端；只生成图片文件时传入 'Agg'，不创建GUI画布
         """
         self.figsize = figsize
         self.use_chinese = use_chinese
-        sns.set_style(style)
+        if backend:
+            plt.switch_backend(backend)
+        # 保存文件时按图表类型复用Figure和坐标轴，见 _get_figure
+        self._figure_cache = {}
+        # 最近一次转换的区间/事件列表及其按字段数组，同一批结果的多张图表只转换一次
+        self._soa_cache = {}
+        _apply_style(style)
         
         # 根据语言设置字体
         self._setup_fonts()
         
-        # 设置标签
-        if self.use_chinese:
-            self.labels = {
-                'title_turning_points': 'HMA拐点识别分析',
-                'title_price_trend': '价格走势与HMA拐点',
-                'title_slope_change': 'HMA斜率变化',
-                'title_volume': '成交量',
-                'title_volume_no_data': '成交量 (无数据)',
-                'price_label': 'ETH价格',
-                'hma_label': 'HMA45',
-                'slope_label': 'HMA斜率',
-                'volume_label': '成交量',
-                'up_turn': '上拐点',
-                'down_turn': '下拐点',
-                'time_label': '时间',
-                'price_usdt': '价格 (USDT)',
-                'slope_value': '斜率',
-                'volume_value': '成交量',
-                'title_trend_intervals': '趋势区间分析',
-                'title_price_trend_intervals': '价格走势与趋势区间',
-                'title_price_change_dist': '区间价格变化分布',
-                'title_pfe_vs_mae': 'PFE vs MAE 分析',
-                'title_duration_dist': '区间持续时间分布',
-                'up_trend': '上升趋势',
-                'down_trend': '下降趋势',
-                'price_change_pct': '价格变化 (%)',
-                'frequency': '频次',
-                'duration_cycles': '持续时间 (周期)',
-                'title_event_analysis': '事件分析 - 斜率改变时的价格行为',
-                'title_price_change_trend': '事件后价格变化趋势',
-                'title_volatility_dist': '事件窗口波动率分布',
-                'title_consistency_dist': '事件预测一致性分布',
-                'title_event_time_dist': '事件时间分布',
-                'avg_price_change_pct': '平均价格变化 (%)',
-                'periods_after_event': '事件后周期数',
-                'annualized_volatility': '年化波动率',
-                'consistency_pct': '一致性 (%)',
-                'event_type': '事件类型',
-                'up': '上升',
-                'down': '下降',
-                'title_comprehensive': 'ETH HMA趋势分析 - 综合分析报告',
-                'title_price_trend_comprehensive': 'ETH价格走势与HMA拐点分析',
-                'title_interval_count': '趋势区间数量',
-                'title_avg_returns': '平均价格变化',
-                'title_max_capture': '最大有利偏移 (PFE)',
-                'title_event_consistency': '事件预测一致性分析',
-                'count': '数量',
-                'change_pct': '变化 (%)',
-                'max_pfe_up': '上升最大PFE',
-                'max_pfe_down': '下降最大PFE',
-                'consistency_up': '上升拐点一致性',
-                'consistency_down': '下降拐点一致性',
-                'baseline_50': '50%基准线'
-            }
-        else:
-            self.labels = {
-                'title_turning_points': 'HMA Turning Points Analysis',
-                'title_price_trend': 'Price Trend with HMA Turning Points',
-                'title_slope_change': 'HMA Slope Changes',
-                'title_volume': 'Volume',
-                'title_volume_no_data': 'Volume (No Data)',
-                'price_label': 'ETH Price',
-                'hma_label': 'HMA45',
-                'slope_label': 'HMA Slope',
-                'volume_label': 'Volume',
-                'up_turn': 'Up Turn',
-                'down_turn': 'Down Turn',
-                'time_label': 'Time',
-                'price_usdt': 'Price (USDT)',
-                'slope_value': 'Slope',
-                'volume_value': 'Volume',
-                'title_trend_intervals': 'Trend Intervals Analysis',
-                'title_price_trend_intervals': 'Price Trend with Trend Intervals',
-                'title_price_change_dist': 'Price Change Distribution',
-                'title_pfe_vs_mae': 'PFE vs MAE Analysis',
-                'title_duration_dist': 'Duration Distribution',
-                'up_trend': 'Up Trend',
-                'down_trend': 'Down Trend',
-                'price_change_pct': 'Price Change (%)',
-                'frequency': 'Frequency',
-                'duration_cycles': 'Duration (Cycles)',
-                'title_event_analysis': 'Event Analysis - Price Behavior at Slope Changes',
-                'title_price_change_trend': 'Price Change Trend After Events',
-                'title_volatility_dist': 'Volatility Distribution',
-                'title_consistency_dist': 'Consistency Distribution',
-                'title_event_time_dist': 'Event Time Distribution',
-                'avg_price_change_pct': 'Average Price Change (%)',
-                'periods_after_event': 'Periods After Event',
-                'annualized_volatility': 'Annualized Volatility',
-                'consistency_pct': 'Consistency (%)',
-                'event_type': 'Event Type',
-                'up': 'Up',
-                'down': 'Down',
-                'title_comprehensive': 'ETH HMA Trend Analysis - Comprehensive Report',
-                'title_price_trend_comprehensive': 'ETH Price Trend with HMA Turning Points',
-                'title_interval_count': 'Trend Interval Count',
-                'title_avg_returns': 'Average Price Change',
-                'title_max_capture': 'Maximum Favorable Excursion (PFE)',
-                'title_event_consistency': 'Event Prediction Consistency Analysis',
-                'count': 'Count',
-                'change_pct': 'Change (%)',
-                'max_pfe_up': 'Max PFE Up',
-                'max_pfe_down': 'Max PFE Down',
-                'consistency_up': 'Up Turn Consistency',
-                'consistency_down': 'Down Turn Consistency',
-                'baseline_50': '50% Baseline'
-            }
+        # 设置标签（模块级只读常量，各实例共享）
+        self.labels = _LABELS_ZH if self.use_chinese else _LABELS_EN
         
         logger.info("趋势可视化器初始化完成")
     
@@ -158,25 +323,26 @@ class TrendVisualizer:
         """设置字体 - 强制中文字体解决方案"""
         import matplotlib
         import matplotlib.pyplot as plt
-        import matplotlib.font_manager as fm
         
         if self.use_chinese:
             # 强制重置并设置中文字体
-            matplotlib.rcdefaults()  # 重置所有设置
+            global _STYLE_APPLIED
+            matplotlib.rcdefaults()  # 重置所有设置（包括seaborn样式）
+            _STYLE_APPLIED = None
             
-            # 强制设置中文字体
-            plt.rcParams['font.family'] = 'sans-serif'
-            plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei']
-            plt.rcParams['axes.unicode_minus'] = False
-            plt.rcParams['font.size'] = 12
+            # 已安装的中文字体排在最前，SimHei / Microsoft YaHei 作为后备
+            fonts = ['SimHei', 'Microsoft YaHei']
+            font = _resolve_chinese_font(True)
+            if font and font not in fonts:
+                fonts.insert(0, font)
             
-            # 确保matplotlib全局设置也生效
+            # plt.rcParams 与 matplotlib.rcParams 是同一个对象
             matplotlib.rcParams['font.family'] = 'sans-serif'
-            matplotlib.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei']
+            matplotlib.rcParams['font.sans-serif'] = fonts
             matplotlib.rcParams['axes.unicode_minus'] = False
             matplotlib.rcParams['font.size'] = 12
             
-            logger.info("中文字体强制设置完成: SimHei, Microsoft YaHei")
+            logger.info("中文字体强制设置完成: %s", ', '.join(fonts))
         else:
             # 使用英文字体
             plt.rcParams['font.sans-serif'] = ['Arial', 'DejaVu Sans', 'Liberation Sans', 'sans-serif']
@@ -184,6 +350,66 @@ class TrendVisualizer:
             matplotlib.rcParams['axes.unicode_minus'] = False
             matplotlib.rcParams['font.size'] = 10
     
+    def _get_figure(self, key: str, figsize: tuple, build, reuse: bool):
+        """
+        获取图表的Figure和坐标轴
+        
+        reuse=True（只保存文件）时直接创建 Figure 对象，不经过pyplot（不进入pyplot的图表注册表，
+        也不创建GUI画布），同类图表复用首次创建的Figure，之后每次只清空坐标轴再重绘，
+        省去重复创建坐标轴（刻度、轴脊、比例尺）的开销；交互显示时每次用pyplot新建
+        
+        Args:
+            key: 图表类型
+            figsize: 图表尺寸
+            build: 在给定Figure上创建坐标轴的函数，返回axes
+            reuse: 是否复用缓存的Figure
+            
+        Returns:
+            (fig, axes)
+        """
+        if not reuse:
+            fig = plt.figure(figsize=figsize)
+            return fig, build(fig)
+        
+        cached = self._figure_cache.get(key)
+        if cached is None:
+            fig = Figure(figsize=figsize)
+            cached = self._figure_cache[key] = (fig, build(fig))
+        else:
+            for ax in np.ravel(cached[1]):
+                ax.cla()
+        return cached
+    
+    def _soa(self, kind: str, items: list) -> Dict[str, np.ndarray]:
+        """返回区间('intervals')或事件('events')列表的按字段数组，同一列表对象只转换一次"""
+        cached = self._soa_cache.get(kind)
+        if cached is None or cached[0] is not items:
+            convert = _intervals_to_soa if kind == 'intervals' else _events_to_soa
+            cached = self._soa_cache[kind] = (items, convert(items))
+        return cached[1]
+    
+    def reset_cache(self) -> None:
+        """丢弃缓存的Figure（如修改了 figsize 之后）"""
+        self._figure_cache.clear()
+    
+    def _finish_figure(self, fig, save_path: Optional[str], name: str) -> None:
+        """
+        输出图表: 指定 save_path 时只保存文件，不调用 plt.show()（Figure不在pyplot中，无需关闭）；
+        否则交互显示
+        
+        Args:
+            fig: 要输出的Figure
+            save_path: 保存路径
+            name: 图表名称（用于日志）
+        """
+        if save_path:
+            # 矢量格式中密集曲线已栅格化(rasterized=True)，dpi只决定这些位图的分辨率
+            vector = str(save_path).lower().endswith(VECTOR_FORMATS)
+            fig.savefig(save_path, dpi=VECTOR_RASTER_DPI if vector else 300, bbox_inches='tight')
+            logger.info("%s已保存到: %s", name, save_path)
+        else:
+            plt.show()
+    
     def plot_turning_points(self, df: pd.DataFrame, save_path: Optional[str] = None) -> None:
         """
         绘制拐点识别图
@@ -193,63 +419,67 @@ class TrendVisualizer:
             save_path: 保存路径
         """
         logger.info("绘制拐点识别图")
+        labels = self.labels
         
-        fig, axes = plt.subplots(3, 1, figsize=self.figsize, sharex=True)
-        fig.suptitle(self.labels['title_turning_points'], fontsize=16, fontweight='bold')
+        fig, axes = self._get_figure(
+            'turning_points', self.figsize, lambda fig: fig.subplots(3, 1, sharex=True), bool(save_path))
+        fig.suptitle(labels['title_turning_points'], fontsize=16, fontweight='bold')
+        
+        # 绘图用的时间轴和数值列只取一次
+        x = df.index.values
+        close = _f32(df['close'].values)
+        hma = _f32(df['HMA_45'].values)
+        slope = _f32(df['HMA_slope'].values)
         
         # 1. 价格和HMA
         ax1 = axes[0]
-        ax1.plot(df.index, df['close'], label=self.labels['price_label'], linewidth=1, alpha=0.8)
-        ax1.plot(df.index, df[f'HMA_45'], label=self.labels['hma_label'], linewidth=2, color='orange')
+        ax1.plot(x, close, label=labels['price_label'], linewidth=1, alpha=0.8, rasterized=True)
+        ax1.plot(x, hma, label=labels['hma_label'], linewidth=2, color='orange', rasterized=True)
         
-        # 标记拐点
-        up_turns = df[df['turning_point'] == 1]
-        down_turns = df[df['turning_point'] == -1]
+        # 标记拐点（掩码只计算一次，三个子图共用；只取需要的列，不复制DataFrame）
+        turning_point = df['turning_point'].values
+        mask_up = turning_point == 1
+        mask_down = turning_point == -1
         
-        ax1.scatter(up_turns.index, up_turns['close'], color='green', s=50, marker='^', 
-                   label=f"{self.labels['up_turn']} ({len(up_turns)})", zorder=5)
-        ax1.scatter(down_turns.index, down_turns['close'], color='red', s=50, marker='v', 
-                   label=f"{self.labels['down_turn']} ({len(down_turns)})", zorder=5)
+        _scatter_turning_points(ax1, x, close, mask_up, mask_down, 50,
+                                f"{labels['up_turn']} ({mask_up.sum()})", f"{labels['down_turn']} ({mask_down.sum()})")
         
-        ax1.set_title(self.labels['title_price_trend'])
-        ax1.set_ylabel(self.labels['price_usdt'])
+        ax1.set_title(labels['title_price_trend'])
+        ax1.set_ylabel(labels['price_usdt'])
         ax1.legend()
         ax1.grid(True, alpha=0.3)
         
         # 2. HMA斜率
         ax2 = axes[1]
-        ax2.plot(df.index, df['HMA_slope'], label=self.labels['slope_label'], linewidth=1, alpha=0.8)
+        ax2.plot(x, slope, label=labels['slope_label'], linewidth=1, alpha=0.8, rasterized=True)
         ax2.axhline(y=0, color='black', linestyle='--', alpha=0.5)
         
         # 标记斜率变化
-        ax2.scatter(up_turns.index, up_turns['HMA_slope'], color='green', s=30, marker='^', zorder=5)
-        ax2.scatter(down_turns.index, down_turns['HMA_slope'], color='red', s=30, marker='v', zorder=5)
+        _scatter_turning_points(ax2, x, slope, mask_up, mask_down, 30)
         
-        ax2.set_title(self.labels['title_slope_change'])
-        ax2.set_ylabel(self.labels['slope_value'])
+        ax2.set_title(labels['title_slope_change'])
+        ax2.set_ylabel(labels['slope_value'])
         ax2.legend()
         ax2.grid(True, alpha=0.3)
         
         # 3. 成交量（如果有）
         ax3 = axes[2]
         if 'volume' in df.columns:
-            ax3.bar(df.index, df['volume'], alpha=0.6, width=0.8)
-            ax3.set_title(self.labels['title_volume'])
-            ax3.set_ylabel(self.labels['volume_value'])
+            # 一个LineCollection代替逐根K线的Rectangle
+            ax3.vlines(x, 0, _f32(df['volume'].values), colors='C0', linewidth=0.8, alpha=0.6,
+                       rasterized=True)
+            ax3.set_title(labels['title_volume'])
+            ax3.set_ylabel(labels['volume_value'])
         else:
-            ax3.text(0.5, 0.5, self.labels['title_volume_no_data'], ha='center', va='center', transform=ax3.transAxes)
-            ax3.set_title(self.labels['title_volume_no_data'])
+            ax3.text(0.5, 0.5, labels['title_volume_no_data'], ha='center', va='center', transform=ax3.transAxes)
+            ax3.set_title(labels['title_volume_no_data'])
         
         ax3.grid(True, alpha=0.3)
-        ax3.set_xlabel(self.labels['time_label'])
+        ax3.set_xlabel(labels['time_label'])
         
-        plt.tight_layout()
+        fig.subplots_adjust(**_LAYOUT_STACKED)
         
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            logger.info(f"拐点识别图已保存到: {save_path}")
-        
-        plt.show()
+        self._finish_figure(fig, save_path, '拐点识别图')
     
     def plot_trend_intervals(self, df: pd.DataFrame, intervals: List[TrendInterval], 
                            save_path: Optional[str] = None) -> None:
@@ -262,63 +492,64 @@ class TrendVisualizer:
             save_path: 保存路径
         """
         logger.info("绘制趋势区间分析图")
+        labels = self.labels
+        
+        if not intervals:
+            logger.warning("没有趋势区间可绘制")
+            return
         
-        fig, axes = plt.subplots(2, 2, figsize=self.figsize)
-        fig.suptitle(self.labels['title_trend_intervals'], fontsize=16, fontweight='bold')
+        fig, axes = self._get_figure(
+            'trend_intervals', self.figsize, lambda fig: fig.subplots(2, 2), bool(save_path))
+        fig.suptitle(labels['title_trend_intervals'], fontsize=16, fontweight='bold')
         
         # 1. 价格走势与趋势区间
         ax1 = axes[0, 0]
-        ax1.plot(df.index, df['close'], label=self.labels['price_label'], linewidth=1, alpha=0.7, color='blue')
-        ax1.plot(df.index, df['HMA_45'], label='HMA45', linewidth=2, color='orange')
+        x = df.index.values
+        ax1.plot(x, _f32(df['close'].values), label=labels['price_label'], linewidth=1, alpha=0.7, color='blue', rasterized=True)
+        ax1.plot(x, _f32(df['HMA_45'].values), label='HMA45', linewidth=2, color='orange', rasterized=True)
+        
+        soa = self._soa('intervals', intervals)
+        is_up = soa['is_up']
+        is_down = ~is_up
         
         # 绘制趋势区间
-        colors = ['green' if i.trend_direction == 'up' else 'red' for i in intervals]
-        for i, interval in enumerate(intervals):
-            start_time = interval.start_time
-            end_time = interval.end_time
-            ax1.axvspan(start_time, end_time, alpha=0.2, color=colors[i])
-            
-            # 标记区间开始和结束
-            ax1.scatter(start_time, interval.start_price, color=colors[i], s=30, marker='o', zorder=5)
-            ax1.scatter(end_time, interval.end_price, color=colors[i], s=30, marker='s', zorder=5)
+        _shade_intervals(ax1, soa, alpha=0.2)
         
-        ax1.set_title(self.labels['title_price_trend_intervals'])
-        ax1.set_ylabel(self.labels['price_usdt'])
+        # 标记区间开始和结束（每种标记一次scatter调用）
+        ax1.scatter(soa['start_time'], _f32(soa['start_price']), c=soa['color'], s=30, marker='o', zorder=5)
+        ax1.scatter(soa['end_time'], _f32(soa['end_price']), c=soa['color'], s=30, marker='s', zorder=5)
+        
+        ax1.set_title(labels['title_price_trend_intervals'])
+        ax1.set_ylabel(labels['price_usdt'])
         ax1.legend()
         ax1.grid(True, alpha=0.3)
         
         # 2. 区间价格变化分布
         ax2 = axes[0, 1]
-        up_changes = [i.price_change_pct for i in intervals if i.trend_direction == 'up']
-        down_changes = [i.price_change_pct for i in intervals if i.trend_direction == 'down']
+        up_changes = soa['price_change_pct'][is_up]
+        down_changes = soa['price_change_pct'][is_down]
         
-        if up_changes:
-            ax2.hist(up_changes, bins=20, alpha=0.7, label=f'{self.labels["up_trend"]} ({len(up_changes)})', color='green')
-        if down_changes:
-            ax2.hist(down_changes, bins=20, alpha=0.7, label=f'{self.labels["down_trend"]} ({len(down_changes)})', color='red')
+        _paired_hist(ax2, up_changes, down_changes, 20, f'{labels["up_trend"]} ({len(up_changes)})',
+                     f'{labels["down_trend"]} ({len(down_changes)})')
         
         ax2.axvline(x=0, color='black', linestyle='--', alpha=0.5)
-        ax2.set_title(self.labels['title_price_change_dist'])
-        ax2.set_xlabel(self.labels['price_change_pct'])
-        ax2.set_ylabel(self.labels['frequency'])
+        ax2.set_title(labels['title_price_change_dist'])
+        ax2.set_xlabel(labels['price_change_pct'])
+        ax2.set_ylabel(labels['frequency'])
         ax2.legend()
         ax2.grid(True, alpha=0.3)
         
         # 3. PFE vs MAE 散点图
         ax3 = axes[1, 0]
-        up_pfe = [i.pfe_pct for i in intervals if i.trend_direction == 'up']
-        up_mae = [i.mae_pct for i in intervals if i.trend_direction == 'up']
-        down_pfe = [i.pfe_pct for i in intervals if i.trend_direction == 'down']
-        down_mae = [i.mae_pct for i in intervals if i.trend_direction == 'down']
+        pfe = soa['pfe_pct']
+        mae = soa['mae_pct']
         
-        if up_pfe and up_mae:
-            ax3.scatter(up_mae, up_pfe, alpha=0.7, label='上升趋势', color='green', s=50)
-        if down_pfe and down_mae:
-            ax3.scatter(down_mae, down_pfe, alpha=0.7, label='下降趋势', color='red', s=50)
+        if is_up.any():
+            ax3.scatter(mae[is_up], pfe[is_up], alpha=0.7, label='上升趋势', color='green', s=50)
+        if is_down.any():
+            ax3.scatter(mae[is_down], pfe[is_down], alpha=0.7, label='下降趋势', color='red', s=50)
         
-        ax3.plot([0, max(up_mae + down_mae) if up_mae or down_mae else 0], 
-                [0, max(up_pfe + down_pfe) if up_pfe or down_pfe else 0], 
-                'k--', alpha=0.5, label='1:1线')
+        ax3.plot([0, float(mae.max())], [0, float(pfe.max())], 'k--', alpha=0.5, label='1:1线')
         
         ax3.set_title('PFE vs MAE 分析')
         ax3.set_xlabel('MAE (%)')
@@ -328,13 +559,11 @@ class TrendVisualizer:
         
         # 4. 区间持续时间分布
         ax4 = axes[1, 1]
-        up_durations = [i.duration for i in intervals if i.trend_direction == 'up']
-        down_durations = [i.duration for i in intervals if i.trend_direction == 'down']
+        up_durations = soa['duration'][is_up]
+        down_durations = soa['duration'][is_down]
         
-        if up_durations:
-            ax4.hist(up_durations, bins=15, alpha=0.7, label=f'上升趋势 ({len(up_durations)})', color='green')
-        if down_durations:
-            ax4.hist(down_durations, bins=15, alpha=0.7, label=f'下降趋势 ({len(down_durations)})', color='red')
+        _paired_hist(ax4, up_durations, down_durations, 15, f'上升趋势 ({len(up_durations)})',
+                     f'下降趋势 ({len(down_durations)})')
         
         ax4.set_title('区间持续时间分布')
         ax4.set_xlabel('持续时间 (周期)')
@@ -342,13 +571,9 @@ class TrendVisualizer:
         ax4.legend()
         ax4.grid(True, alpha=0.3)
         
-        plt.tight_layout()
+        fig.subplots_adjust(**_LAYOUT_GRID)
         
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            logger.info(f"趋势区间分析图已保存到: {save_path}")
-        
-        plt.show()
+        self._finish_figure(fig, save_path, '趋势区间分析图')
     
     def plot_event_analysis(self, events: List[EventAnalysis], save_path: Optional[str] = None) -> None:
         """
@@ -359,104 +584,98 @@ class TrendVisualizer:
             save_path: 保存路径
         """
         logger.info("绘制事件分析图")
+        labels = self.labels
         
         if not events:
             logger.warning("没有事件数据可分析")
             return
         
-        fig, axes = plt.subplots(2, 2, figsize=self.figsize)
-        fig.suptitle(self.labels['title_event_analysis'], fontsize=16, fontweight='bold')
+        fig, axes = self._get_figure(
+            'event_analysis', self.figsize, lambda fig: fig.subplots(2, 2), bool(save_path))
+        fig.suptitle(labels['title_event_analysis'], fontsize=16, fontweight='bold')
         
         # 分离上升和下降事件
-        up_events = [e for e in events if e.event_type == 'up_turn']
-        down_events = [e for e in events if e.event_type == 'down_turn']
+        soa = self._soa('events', events)
+        is_up = soa['is_up']
+        is_down = ~is_up
+        up_events = [e for e, up in zip(events, is_up) if up]
+        down_events = [e for e, up in zip(events, is_up) if not up]
         
         # 1. 事件后价格变化趋势
         ax1 = axes[0, 0]
         
-        if up_events:
-            up_changes = np.array([e.price_changes for e in up_events if len(e.price_changes) > 0])
-            if len(up_changes) > 0:
-                up_mean = np.mean(up_changes, axis=0)
-                up_std = np.std(up_changes, axis=0)
-                periods = range(1, len(up_mean) + 1)
-                ax1.plot(periods, up_mean, 'g-', label=self.labels['up_turn'], linewidth=2)
-                ax1.fill_between(periods, up_mean - up_std, up_mean + up_std, alpha=0.3, color='green')
-        
-        if down_events:
-            down_changes = np.array([e.price_changes for e in down_events if len(e.price_changes) > 0])
-            if len(down_changes) > 0:
-                down_mean = np.mean(down_changes, axis=0)
-                down_std = np.std(down_changes, axis=0)
-                periods = range(1, len(down_mean) + 1)
-                ax1.plot(periods, down_mean, 'r-', label=self.labels['down_turn'], linewidth=2)
-                ax1.fill_between(periods, down_mean - down_std, down_mean + down_std, alpha=0.3, color='red')
+        # 每个周期只统计有数据的事件（忽略末尾事件补齐的NaN）
+        up_changes = _stack_price_changes(up_events)
+        if up_changes.size:
+            up_mean, up_std = mean_std_axis0(up_changes)
+            periods = range(1, len(up_mean) + 1)
+            ax1.plot(periods, up_mean, 'g-', label=labels['up_turn'], linewidth=2)
+            ax1.fill_between(periods, up_mean - up_std, up_mean + up_std, alpha=0.3, color='green')
+        
+        down_changes = _stack_price_changes(down_events)
+        if down_changes.size:
+            down_mean, down_std = mean_std_axis0(down_changes)
+            periods = range(1, len(down_mean) + 1)
+            ax1.plot(periods, down_mean, 'r-', label=labels['down_turn'], linewidth=2)
+            ax1.fill_between(periods, down_mean - down_std, down_mean + down_std, alpha=0.3, color='red')
         
         ax1.axhline(y=0, color='black', linestyle='--', alpha=0.5)
-        ax1.set_title(self.labels['title_price_change_trend'])
-        ax1.set_xlabel(self.labels['periods_after_event'])
-        ax1.set_ylabel(self.labels['avg_price_change_pct'])
+        ax1.set_title(labels['title_price_change_trend'])
+        ax1.set_xlabel(labels['periods_after_event'])
+        ax1.set_ylabel(labels['avg_price_change_pct'])
         ax1.legend()
         ax1.grid(True, alpha=0.3)
         
         # 2. 波动率分析
         ax2 = axes[0, 1]
-        up_volatilities = [e.volatility for e in up_events]
-        down_volatilities = [e.volatility for e in down_events]
+        up_volatilities = soa['volatility'][is_up]
+        down_volatilities = soa['volatility'][is_down]
         
-        if up_volatilities:
-            ax2.hist(up_volatilities, bins=15, alpha=0.7, label=f'{self.labels["up_turn"]} ({len(up_volatilities)})', color='green')
-        if down_volatilities:
-            ax2.hist(down_volatilities, bins=15, alpha=0.7, label=f'{self.labels["down_turn"]} ({len(down_volatilities)})', color='red')
+        _paired_hist(ax2, up_volatilities, down_volatilities, 15, f'{labels["up_turn"]} ({len(up_volatilities)})',
+                     f'{labels["down_turn"]} ({len(down_volatilities)})')
         
-        ax2.set_title(self.labels['title_volatility_dist'])
-        ax2.set_xlabel(self.labels['annualized_volatility'])
-        ax2.set_ylabel(self.labels['frequency'])
+        ax2.set_title(labels['title_volatility_dist'])
+        ax2.set_xlabel(labels['annualized_volatility'])
+        ax2.set_ylabel(labels['frequency'])
         ax2.legend()
         ax2.grid(True, alpha=0.3)
         
         # 3. 一致性分析
         ax3 = axes[1, 0]
-        up_consistencies = [e.consistency for e in up_events]
-        down_consistencies = [e.consistency for e in down_events]
-        
-        if up_consistencies:
-            ax3.hist(up_consistencies, bins=15, alpha=0.7, label=f'{self.labels["up_turn"]} ({len(up_consistencies)})', color='green')
-        if down_consistencies:
-            ax3.hist(down_consistencies, bins=15, alpha=0.7, label=f'{self.labels["down_turn"]} ({len(down_consistencies)})', color='red')
-        
-        ax3.axvline(x=0.5, color='black', linestyle='--', alpha=0.5, label=self.labels['baseline_50'])
-        ax3.set_title(self.labels['title_consistency_dist'])
-        ax3.set_xlabel(self.labels['consistency_pct'])
-        ax3.set_ylabel(self.labels['frequency'])
+        up_consistencies = soa['consistency'][is_up]
+        down_consistencies = soa['consistency'][is_down]
+        
+        _paired_hist(ax3, up_consistencies, down_consistencies, 15, f'{labels["up_turn"]} ({len(up_consistencies)})',
+                     f'{labels["down_turn"]} ({len(down_consistencies)})')
+        
+        ax3.axvline(x=0.5, color='black', linestyle='--', alpha=0.5, label=labels['baseline_50'])
+        ax3.set_title(labels['title_consistency_dist'])
+        ax3.set_xlabel(labels['consistency_pct'])
+        ax3.set_ylabel(labels['frequency'])
         ax3.legend()
         ax3.grid(True, alpha=0.3)
         
         # 4. 事件时间分布
         ax4 = axes[1, 1]
-        up_times = [e.event_time for e in up_events]
-        down_times = [e.event_time for e in down_events]
+        up_times = soa['event_time'][is_up]
+        down_times = soa['event_time'][is_down]
         
-        if up_times:
-            ax4.scatter(up_times, [1] * len(up_times), alpha=0.7, label=f'{self.labels["up_turn"]} ({len(up_times)})', color='green', s=50)
-        if down_times:
-            ax4.scatter(down_times, [0] * len(down_times), alpha=0.7, label=f'{self.labels["down_turn"]} ({len(down_times)})', color='red', s=50)
+        if up_times.size:
+            ax4.scatter(up_times, np.ones(len(up_times)), alpha=0.7, label=f'{labels["up_turn"]} ({len(up_times)})', color='green', s=50)
+        if down_times.size:
+            ax4.scatter(down_times, np.zeros(len(down_times)), alpha=0.7, label=f'{labels["down_turn"]} ({len(down_times)})', color='red', s=50)
         
-        ax4.set_title(self.labels['title_event_time_dist'])
-        ax4.set_xlabel(self.labels['time_label'])
-        ax4.set_ylabel(self.labels['event_type'])
+        ax4.set_title(labels['title_event_time_dist'])
+        ax4.set_xlabel(labels['time_label'])
+        ax4.set_ylabel(labels['event_type'])
         ax4.set_yticks([0, 1])
-        ax4.set_yticklabels([self.labels['down'], self.labels['up']])
+        ax4.set_yticklabels([labels['down'], labels['up']])
         ax4.legend()
         ax4.grid(True, alpha=0.3)
         
-        plt.tight_layout()
-        
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            logger.info(f"事件分析图已保存到: {save_path}")
+        fig.subplots_adjust(**_LAYOUT_GRID)
         
-        plt.show()
+        self._finish_figure(fig, save_path, '事件分析图')
     
     def plot_comprehensive_analysis(self, df: pd.DataFrame, intervals: List[TrendInterval], 
                                   events: List[EventAnalysis], save_path: Optional[str] = None) -> None:
@@ -470,48 +689,54 @@ class TrendVisualizer:
             save_path: 保存路径
         """
         logger.info("绘制综合分析图")
+        labels = self.labels
         
-        fig = plt.figure(figsize=(20, 12))
-        gs = fig.add_gridspec(4, 3, hspace=0.3, wspace=0.3)
+        def build(fig):
+            gs = fig.add_gridspec(4, 3, hspace=0.3, wspace=0.3)
+            # 主图占据上方2行，下方依次为区间统计、平均收益、最大捕获、事件分析
+            return (fig.add_subplot(gs[0:2, :]), fig.add_subplot(gs[2, 0]), fig.add_subplot(gs[2, 1]),
+                    fig.add_subplot(gs[2, 2]), fig.add_subplot(gs[3, :]))
         
-        fig.suptitle(self.labels['title_comprehensive'], fontsize=18, fontweight='bold')
+        fig, (ax_main, ax_stats, ax_returns, ax_capture, ax_events) = self._get_figure(
+            'comprehensive', (20, 12), build, bool(save_path))
+        fig.suptitle(labels['title_comprehensive'], fontsize=18, fontweight='bold')
         
         # 1. 主要价格走势图 (占据上方2行)
-        ax_main = fig.add_subplot(gs[0:2, :])
-        ax_main.plot(df.index, df['close'], label=self.labels['price_label'], linewidth=1, alpha=0.8, color='blue')
-        ax_main.plot(df.index, df['HMA_45'], label='HMA45', linewidth=2, color='orange')
+        x = df.index.values
+        close = _f32(df['close'].values)
+        ax_main.plot(x, close, label=labels['price_label'], linewidth=1, alpha=0.8, color='blue', rasterized=True)
+        ax_main.plot(x, _f32(df['HMA_45'].values), label='HMA45', linewidth=2, color='orange', rasterized=True)
         
         # 标记拐点
-        up_turns = df[df['turning_point'] == 1]
-        down_turns = df[df['turning_point'] == -1]
+        turning_point = df['turning_point'].values
+        mask_up = turning_point == 1
+        mask_down = turning_point == -1
         
-        ax_main.scatter(up_turns.index, up_turns['close'], color='green', s=30, marker='^', 
-                       label=f'上拐点 ({len(up_turns)})', zorder=5)
-        ax_main.scatter(down_turns.index, down_turns['close'], color='red', s=30, marker='v', 
-                       label=f'下拐点 ({len(down_turns)})', zorder=5)
+        _scatter_turning_points(ax_main, x, close, mask_up, mask_down, 30,
+                                f'上拐点 ({mask_up.sum()})', f'下拐点 ({mask_down.sum()})')
         
         # 绘制趋势区间
-        for interval in intervals:
-            color = 'green' if interval.trend_direction == 'up' else 'red'
-            ax_main.axvspan(interval.start_time, interval.end_time, alpha=0.1, color=color)
+        interval_soa = self._soa('intervals', intervals)
+        is_up = interval_soa['is_up']
+        is_down = ~is_up
+        _shade_intervals(ax_main, interval_soa, alpha=0.1)
         
-        ax_main.set_title(self.labels['title_price_trend_comprehensive'], fontsize=14, fontweight='bold')
-        ax_main.set_ylabel(self.labels['price_usdt'])
+        ax_main.set_title(labels['title_price_trend_comprehensive'], fontsize=14, fontweight='bold')
+        ax_main.set_ylabel(labels['price_usdt'])
         ax_main.legend()
         ax_main.grid(True, alpha=0.3)
         
         # 2. 区间统计 (左下)
-        ax_stats = fig.add_subplot(gs[2, 0])
-        up_intervals = [i for i in intervals if i.trend_direction == 'up']
-        down_intervals = [i for i in intervals if i.trend_direction == 'down']
+        n_up = int(is_up.sum())
+        n_down = len(is_up) - n_up
         
-        categories = [self.labels['up_trend'], self.labels['down_trend']]
-        counts = [len(up_intervals), len(down_intervals)]
+        categories = [labels['up_trend'], labels['down_trend']]
+        counts = [n_up, n_down]
         colors = ['green', 'red']
         
         bars = ax_stats.bar(categories, counts, color=colors, alpha=0.7)
-        ax_stats.set_title(self.labels['title_interval_count'])
-        ax_stats.set_ylabel(self.labels['count'])
+        ax_stats.set_title(labels['title_interval_count'])
+        ax_stats.set_ylabel(labels['count'])
         
         # 添加数值标签
         for bar, count in zip(bars, counts):
@@ -519,20 +744,19 @@ class TrendVisualizer:
                          str(count), ha='center', va='bottom')
         
         # 3. 平均收益 (中下)
-        ax_returns = fig.add_subplot(gs[2, 1])
-        up_returns = [i.price_change_pct for i in up_intervals] if up_intervals else [0]
-        down_returns = [i.price_change_pct for i in down_intervals] if down_intervals else [0]
+        up_returns = interval_soa['price_change_pct'][is_up]
+        down_returns = interval_soa['price_change_pct'][is_down]
         
-        avg_up = np.mean(up_returns) if up_returns else 0
-        avg_down = np.mean(down_returns) if down_returns else 0
+        avg_up = up_returns.mean() if n_up else 0
+        avg_down = down_returns.mean() if n_down else 0
         
-        categories = [self.labels['up_trend'], self.labels['down_trend']]
+        categories = [labels['up_trend'], labels['down_trend']]
         returns = [avg_up, avg_down]
         colors = ['green' if r > 0 else 'red' for r in returns]
         
         bars = ax_returns.bar(categories, returns, color=colors, alpha=0.7)
-        ax_returns.set_title(self.labels['title_avg_returns'])
-        ax_returns.set_ylabel(self.labels['change_pct'])
+        ax_returns.set_title(labels['title_avg_returns'])
+        ax_returns.set_ylabel(labels['change_pct'])
         ax_returns.axhline(y=0, color='black', linestyle='--', alpha=0.5)
         
         # 添加数值标签
@@ -541,19 +765,18 @@ class TrendVisualizer:
                            f'{ret:.2f}%', ha='center', va='bottom' if ret > 0 else 'top')
         
         # 4. 最大捕获分析 (右下)
-        ax_capture = fig.add_subplot(gs[2, 2])
-        up_pfe = [i.pfe_pct for i in up_intervals] if up_intervals else [0]
-        down_pfe = [i.pfe_pct for i in down_intervals] if down_intervals else [0]
+        up_pfe = interval_soa['pfe_pct'][is_up]
+        down_pfe = interval_soa['pfe_pct'][is_down]
         
-        max_up_pfe = np.max(up_pfe) if up_pfe else 0
-        max_down_pfe = np.max(down_pfe) if down_pfe else 0
+        max_up_pfe = up_pfe.max() if n_up else 0
+        max_down_pfe = down_pfe.max() if n_down else 0
         
-        categories = [self.labels['max_pfe_up'], self.labels['max_pfe_down']]
+        categories = [labels['max_pfe_up'], labels['max_pfe_down']]
         max_pfes = [max_up_pfe, max_down_pfe]
         colors = ['green', 'red']
         
         bars = ax_capture.bar(categories, max_pfes, color=colors, alpha=0.7)
-        ax_capture.set_title(self.labels['title_max_capture'])
+        ax_capture.set_title(labels['title_max_capture'])
         ax_capture.set_ylabel('PFE (%)')
         
         # 添加数值标签
@@ -562,26 +785,22 @@ class TrendVisualizer:
                            f'{pfe:.2f}%', ha='center', va='bottom')
         
         # 5. 事件分析 (底部)
-        ax_events = fig.add_subplot(gs[3, :])
+        event_soa = self._soa('events', events)
+        up_consistencies = event_soa['consistency'][event_soa['is_up']]
+        down_consistencies = event_soa['consistency'][~event_soa['is_up']]
         
-        up_events = [e for e in events if e.event_type == 'up_turn']
-        down_events = [e for e in events if e.event_type == 'down_turn']
+        avg_up_consistency = up_consistencies.mean() if up_consistencies.size else 0
+        avg_down_consistency = down_consistencies.mean() if down_consistencies.size else 0
         
-        up_consistencies = [e.consistency for e in up_events] if up_events else [0]
-        down_consistencies = [e.consistency for e in down_events] if down_events else [0]
-        
-        avg_up_consistency = np.mean(up_consistencies) if up_consistencies else 0
-        avg_down_consistency = np.mean(down_consistencies) if down_consistencies else 0
-        
-        categories = [self.labels['consistency_up'], self.labels['consistency_down']]
+        categories = [labels['consistency_up'], labels['consistency_down']]
         consistencies = [avg_up_consistency * 100, avg_down_consistency * 100]
         colors = ['green', 'red']
         
         bars = ax_events.bar(categories, consistencies, color=colors, alpha=0.7)
-        ax_events.set_title(self.labels['title_event_consistency'])
-        ax_events.set_ylabel(self.labels['consistency_pct'])
+        ax_events.set_title(labels['title_event_consistency'])
+        ax_events.set_ylabel(labels['consistency_pct'])
         ax_events.set_ylim(0, 100)
-        ax_events.axhline(y=50, color='black', linestyle='--', alpha=0.5, label=self.labels['baseline_50'])
+        ax_events.axhline(y=50, color='black', linestyle='--', alpha=0.5, label=labels['baseline_50'])
         
         # 添加数值标签
         for bar, cons in zip(bars, consistencies):
@@ -591,8 +810,4 @@ class TrendVisualizer:
         ax_events.legend()
         ax_events.grid(True, alpha=0.3)
         
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            logger.info(f"综合分析图已保存到: {save_path}")
-        
-        plt.show()
+        self._finish_figure(fig, save_path, '综合分析图')
@@ -3,35 +3,314 @@
 HMA可视化分析脚本
 生成各种图表来分析HMA指标的表现
 """
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
+import matplotlib
+# 脚本只输出图片文件: 使用无界面的Agg后端，各图表可以在子进程中并行绘制
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-import seaborn as sns
+import matplotlib.dates as mdates
+import matplotlib.colors as mcolors
+import pyarrow.feather as feather
+import pyarrow.dataset as pads
 from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    from ..utils.downsample import lttb_indices
+except ImportError:
+    # 作为脚本直接运行时，将src加入路径后按顶层包 utils 导入
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from utils.downsample import lttb_indices
+
+try:
+    import datashader as ds
+    import datashader.transfer_functions as tf
+    DATASHADER_AVAILABLE = True
+except ImportError:
+    DATASHADER_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    from tsdownsample import MinMaxLTTBDownsampler
+    TSDOWNSAMPLE_AVAILABLE = True
+except ImportError:
+    TSDOWNSAMPLE_AVAILABLE = False
+
 # 设置中文字体支持
 plt.rcParams['font.sans-serif'] = ['Arial Unicode MS', 'SimHei', 'DejaVu Sans']
 plt.rcParams['axes.unicode_minus'] = False
 
-def load_data():
-    """加载数据"""
-    data_dir = Path('data')
-    processed_files = list(data_dir.glob("ETHUSDT_*_processed_*.parquet"))
+# 图片保存分辨率（15英寸宽的图约2250像素，足够屏幕查看；300dpi时每张图的RGBA缓冲区和PNG编码量是4倍）
+SAVE_DPI = 150
+# 序列长度达到该值且安装了datashader时，价格/HMA及其间填充区先栅格化为图像再贴到坐标轴中
+# （纯曲线在Matplotlib路径简化下已经足够快，只有 fill_between 的多边形开销随数据量线性增长）
+DATASHADER_MIN_POINTS = 20000
+# 时间序列曲线最多绘制的点数（约为保存后图片宽度的2倍，更多的点会落在同一像素列上）
+PLOT_MAX_POINTS = 5000
+# 市场条件分析: 单根K线涨跌幅超过该值视为上涨/下跌市场
+MARKET_MOVE_THRESHOLD = 0.01
+# 各图表实际用到的列，加载时只解码这些列
+PLOT_COLUMNS = ['open_time', 'close', 'HMA_45', 'hma_deviation', 'price_change', 'volume']
+
+
+def downsample_indices(*series, n_out=PLOT_MAX_POINTS):
+    """
+    多条等长序列共用的降采样位置索引（各序列选中点的并集），同一坐标轴上的曲线和填充区使用同一组点
+
+    安装tsdownsample时使用MinMaxLTTB（先按桶取极值预选，再做LTTB），否则使用NumPy版LTTB；
+    NaN（如HMA预热期）以序列均值代替参与选点，绘制时仍为原值
+    """
+    n = len(series[0])
+    if n <= n_out:
+        return np.arange(n)
+    selected = []
+    for values in series:
+        y = np.asarray(values, dtype=np.float64)
+        y = np.where(np.isnan(y), np.nanmean(y), y)
+        if TSDOWNSAMPLE_AVAILABLE:
+            selected.append(MinMaxLTTBDownsampler().downsample(y, n_out=n_out))
+        else:
+            selected.append(lttb_indices(y, n_out))
+    return np.unique(np.concatenate(selected))
+
+
+def _shade_layer(agg, color, alpha):
+    """datashader聚合结果着色为单色图层（覆盖率线性映射为透明度）"""
+    return tf.shade(agg, cmap=[mcolors.to_hex(color)], how='linear', span=(0, 1), min_alpha=0,
+                    alpha=int(255 * alpha))
+
+
+def plot_series(ax, index, lines, fill=None):
+    """
+    在坐标轴上绘制若干条时间序列曲线，可选填充两条曲线之间的区域（上方绿色、下方红色）
+    
+    序列较长且安装了datashader时按输出像素栅格化：每条曲线/填充区生成一张RGBA图像用imshow贴入，
+    渲染耗时与像素数相关而不是与数据点数相关；坐标轴、标题、图例仍由Matplotlib绘制
+    
+    Args:
+        ax: 坐标轴
+        index: 时间索引
+        lines: [(values, color, label, linewidth, alpha), ...]
+        fill: (upper, lower) 两条曲线，或None
+    """
+    if not (DATASHADER_AVAILABLE and len(index) >= DATASHADER_MIN_POINTS):
+        # 降采样到 PLOT_MAX_POINTS 量级，曲线和填充区使用同一组点
+        idx = downsample_indices(*(values for values, *_ in lines))
+        index = index[idx]
+        for values, color, label, linewidth, alpha in lines:
+            ax.plot(index, np.asarray(values)[idx], label=label, linewidth=linewidth, alpha=alpha, color=color)
+        if fill is not None:
+            upper, lower = (np.asarray(values)[idx] for values in fill)
+            ax.fill_between(index, upper, lower, where=(upper >= lower), color='green', alpha=0.3, label='价格>HMA')
+            ax.fill_between(index, upper, lower, where=(upper < lower), color='red', alpha=0.3, label='价格<HMA')
+        return
+    
+    x = mdates.date2num(index)
+    columns = {'x': x}
+    for k, (values, *_) in enumerate(lines):
+        columns[f'y{k}'] = np.asarray(values, dtype=np.float64)
+    y_min = min(np.nanmin(v) for k, v in columns.items() if k != 'x')
+    y_max = max(np.nanmax(v) for k, v in columns.items() if k != 'x')
+    pad = (y_max - y_min) * 0.05
+    x_range, y_range = (x[0], x[-1]), (y_min - pad, y_max + pad)
+    
+    # 画布尺寸与保存后坐标轴的像素尺寸一致
+    fig = ax.figure
+    width = max(int(ax.bbox.width / fig.dpi * SAVE_DPI), 1)
+    height = max(int(ax.bbox.height / fig.dpi * SAVE_DPI), 1)
+    cvs = ds.Canvas(plot_width=width, plot_height=height, x_range=x_range, y_range=y_range)
+    
+    layers = []
+    if fill is not None:
+        upper = np.asarray(fill[0], dtype=np.float64)
+        lower = np.asarray(fill[1], dtype=np.float64)
+        for above, color, label in ((True, 'green', '价格>HMA'), (False, 'red', '价格<HMA')):
+            mask = (upper >= lower) if above else (upper < lower)
+            frame = pd.DataFrame({'x': x, 'upper': np.where(mask, upper, np.nan),
+                                  'lower': np.where(mask, lower, np.nan)})
+            layers.append(_shade_layer(cvs.area(frame, 'x', 'upper', y_stack='lower'), color, 0.3))
+            ax.fill_between([], [], [], color=color, alpha=0.3, label=label)
+    
+    frame = pd.DataFrame(columns)
+    for k, (_, color, label, linewidth, alpha) in enumerate(lines):
+        agg = cvs.line(frame, 'x', f'y{k}', line_width=linewidth * SAVE_DPI / 72)
+        layers.append(_shade_layer(agg, color, alpha))
+        ax.plot([], [], label=label, linewidth=linewidth, alpha=alpha, color=color)
+    
+    # 各图层按绘制顺序叠加为一张图像，每个坐标轴只有一个AxesImage
+    img = tf.stack(*layers)
+    rgba = img.to_numpy().view(np.uint8).reshape(img.shape + (4,))
+    ax.imshow(rgba, extent=(*x_range, *y_range), origin='lower', aspect='auto', interpolation='nearest')
+    ax.set_xlim(*x_range)
+    ax.set_ylim(*y_range)
+    ax.xaxis_date()
+
+def refresh_cache(file_path):
+    """
+    在Parquet文件同目录维护一份未压缩的Feather缓存（只含 PLOT_COLUMNS）
+
+    缓存比Parquet新时不做任何读取并返回None；否则从Parquet读取、重写缓存并返回读到的Arrow表
+    """
+    cache_path = file_path.with_suffix('.feather')
+    if cache_path.exists() and cache_path.stat().st_mtime >= file_path.stat().st_mtime:
+        return None
+    # 列裁剪交给数据集扫描器，各列/行组的解压在线程池中并行
+    table = pads.dataset(str(file_path), format='parquet').to_table(columns=PLOT_COLUMNS, use_threads=True)
+    try:
+        feather.write_feather(table, cache_path, compression='uncompressed')
+    except OSError as e:
+        print(f"⚠️ 无法写入缓存 {cache_path}: {e}")
+    return table
+
+def read_processed(file_path):
+    """
+    读取处理后的Parquet数据（只含 PLOT_COLUMNS）
+
+    Feather缓存比Parquet新时直接内存映射读取，省去Parquet解码；否则从Parquet读取并重写缓存
+    """
+    table = refresh_cache(file_path)
+    if table is None:
+        table = feather.read_table(file_path.with_suffix('.feather'), columns=PLOT_COLUMNS, memory_map=True)
     
-    data = {}
-    for file_path in processed_files:
+    # split_blocks: 每列单独成块，不再合并成一个二维float块（省去一次整表复制）
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    df.set_index('open_time', inplace=True)
+    return df
+
+def discover_files():
+    """查找处理后的数据文件: {周期: 文件路径}"""
+    data_dir = Path('data')
+    files = {}
+    for file_path in data_dir.glob("ETHUSDT_*_processed_*.parquet"):
         if '1h' in file_path.name:
-            df = pd.read_parquet(file_path)
-            df.set_index('open_time', inplace=True)
-            data['1h'] = df
+            files['1h'] = file_path
         elif '4h' in file_path.name:
-            df = pd.read_parquet(file_path)
-            df.set_index('open_time', inplace=True)
-            data['4h'] = df
-    
-    return data
+            files['4h'] = file_path
+    return files
+
+def load_data(files=None):
+    """加载数据（files 为 discover_files 的结果，省略时现场查找）"""
+    if files is None:
+        files = discover_files()
+    return {interval: read_processed(file_path) for interval, file_path in files.items()}
+
+def draw_hist(ax, x, bins, **kwargs):
+    """
+    直方图: 先用 np.histogram 计数，再用 ax.bar 画出柱子（不经过 ax.hist 的数据预处理）
+
+    Args:
+        ax: 坐标轴
+        x: 数据数组
+        bins: bin数量或bin边界数组
+        **kwargs: 传给 ax.bar 的样式参数
+    """
+    counts, edges = np.histogram(x, bins=bins)
+    draw_counts(ax, counts, edges, **kwargs)
+
+def draw_counts(ax, counts, edges, **kwargs):
+    """按已计算好的计数和bin边界画直方图柱子"""
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', **kwargs)
+
+def _market_condition_stats_numpy(price_change, deviation, threshold, bins):
+    """NumPy实现: 布尔掩码筛选上涨/下跌K线，再用共享的bin边界分别计数"""
+    valid = ~np.isnan(deviation)
+    up = deviation[valid & (price_change > threshold)]
+    down = deviation[valid & (price_change < -threshold)]
+    edges = np.histogram_bin_edges(np.concatenate([up, down]), bins=bins)
+    counts_up, _ = np.histogram(up, bins=edges)
+    counts_down, _ = np.histogram(down, bins=edges)
+    mean_up = up.mean() if up.size else np.nan
+    mean_down = down.mean() if down.size else np.nan
+    return edges, counts_up, counts_down, mean_up, mean_down
+
+if NUMBA_AVAILABLE:
+    # 直方图计数会写同一个bin，不使用prange；两遍扫描: 先求范围和均值，再分箱计数
+    # 不写显式签名: 从Feather缓存内存映射得到的列是只读数组，按实际类型编译（缓存到磁盘）
+    @njit(cache=True)
+    def _market_condition_stats_numba(price_change, deviation, threshold, bins):
+        n = price_change.shape[0]
+        side = np.zeros(n, dtype=np.int8)
+        lo = np.inf
+        hi = -np.inf
+        sum_up = 0.0
+        sum_down = 0.0
+        n_up = 0
+        n_down = 0
+        for i in range(n):
+            d = deviation[i]
+            if d != d:
+                continue
+            if price_change[i] > threshold:
+                side[i] = 1
+                sum_up += d
+                n_up += 1
+            elif price_change[i] < -threshold:
+                side[i] = -1
+                sum_down += d
+                n_down += 1
+            else:
+                continue
+            lo = min(lo, d)
+            hi = max(hi, d)
+        
+        # 与 np.histogram_bin_edges 相同: 无数据时取[0, 1]，所有值相等时左右各扩0.5
+        if n_up + n_down == 0:
+            lo, hi = 0.0, 1.0
+        elif lo == hi:
+            lo, hi = lo - 0.5, hi + 0.5
+        edges = np.linspace(lo, hi, bins + 1)
+        
+        # 与 np.histogram 相同的分箱: 先按比例估算bin，再用边界修正舍入误差，最后一个bin包含右端点
+        counts_up = np.zeros(bins, dtype=np.int64)
+        counts_down = np.zeros(bins, dtype=np.int64)
+        norm = bins / (hi - lo)
+        for i in range(n):
+            if side[i] == 0:
+                continue
+            d = deviation[i]
+            k = min(int((d - lo) * norm), bins - 1)
+            if d < edges[k]:
+                k -= 1
+            elif k != bins - 1 and d >= edges[k + 1]:
+                k += 1
+            if side[i] == 1:
+                counts_up[k] += 1
+            else:
+                counts_down[k] += 1
+        
+        mean_up = sum_up / n_up if n_up else np.nan
+        mean_down = sum_down / n_down if n_down else np.nan
+        return edges, counts_up, counts_down, mean_up, mean_down
+
+def market_condition_stats(price_change, deviation, threshold=MARKET_MOVE_THRESHOLD, bins=30):
+    """
+    上涨/下跌市场的HMA偏离度统计: 两组共用一组bin边界（由两组数据共同决定）
+
+    Args:
+        price_change: 涨跌幅数组
+        deviation: HMA偏离度数组，NaN不参与统计
+        threshold: 涨跌幅超过 +threshold / -threshold 的K线分别计入上涨/下跌市场
+        bins: bin数量
+
+    Returns:
+        (edges, counts_up, counts_down, mean_up, mean_down)，某组为空时均值为NaN
+    """
+    price_change = np.ascontiguousarray(price_change, dtype=np.float64)
+    deviation = np.ascontiguousarray(deviation, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        return _market_condition_stats_numba(price_change, deviation, float(threshold), int(bins))
+    return _market_condition_stats_numpy(price_change, deviation, threshold, bins)
 
 def plot_price_and_hma(data):
     """绘制价格与HMA对比图"""
@@ -41,17 +320,10 @@ def plot_price_and_hma(data):
     for i, (interval, df) in enumerate(data.items()):
         ax = axes[i]
         
-        # 绘制价格和HMA
-        ax.plot(df.index, df['close'], label='ETH价格', linewidth=0.8, alpha=0.8, color='blue')
-        ax.plot(df.index, df['HMA_45'], label='HMA_45', linewidth=1.2, alpha=0.9, color='red')
-        
-        # 填充价格与HMA之间的区域
-        ax.fill_between(df.index, df['close'], df['HMA_45'], 
-                       where=(df['close'] >= df['HMA_45']), 
-                       color='green', alpha=0.3, label='价格>HMA')
-        ax.fill_between(df.index, df['close'], df['HMA_45'], 
-                       where=(df['close'] < df['HMA_45']), 
-                       color='red', alpha=0.3, label='价格<HMA')
+        # 绘制价格和HMA，并填充价格与HMA之间的区域
+        plot_series(ax, df.index,
+                    [(df['close'], 'blue', 'ETH价格', 0.8, 0.8), (df['HMA_45'], 'red', 'HMA_45', 1.2, 0.9)],
+                    fill=(df['close'], df['HMA_45']))
         
         ax.set_title(f'{interval} 数据 - 价格与HMA对比')
         ax.set_ylabel('价格 (USDT)')
@@ -59,8 +331,8 @@ def plot_price_and_hma(data):
         ax.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('hma_price_comparison.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    plt.savefig('hma_price_comparison.png', dpi=SAVE_DPI, bbox_inches='tight')
+    plt.close(fig)
 
 def plot_hma_deviation(data):
     """绘制HMA偏离度分析"""
@@ -71,7 +343,9 @@ def plot_hma_deviation(data):
         # 偏离度时间序列
         ax1 = axes[i, 0]
         deviation = df['hma_deviation'].dropna()
-        ax1.plot(deviation.index, deviation, linewidth=0.8, alpha=0.8, color='purple')
+        deviation_mean = deviation.mean()
+        idx = downsample_indices(deviation)
+        ax1.plot(deviation.index[idx], deviation.values[idx], linewidth=0.8, alpha=0.8, color='purple')
         ax1.axhline(y=0, color='black', linestyle='--', alpha=0.5)
         ax1.axhline(y=5, color='red', linestyle='--', alpha=0.5, label='+5%')
         ax1.axhline(y=-5, color='red', linestyle='--', alpha=0.5, label='-5%')
@@ -82,10 +356,10 @@ def plot_hma_deviation(data):
         
         # 偏离度分布直方图
         ax2 = axes[i, 1]
-        ax2.hist(deviation, bins=50, alpha=0.7, color='skyblue', edgecolor='black')
+        draw_hist(ax2, deviation.to_numpy(), bins=50, alpha=0.7, color='skyblue', edgecolor='black')
         ax2.axvline(x=0, color='red', linestyle='--', alpha=0.7)
-        ax2.axvline(x=deviation.mean(), color='green', linestyle='-', alpha=0.7, 
-                   label=f'平均值: {deviation.mean():.3f}%')
+        ax2.axvline(x=deviation_mean, color='green', linestyle='-', alpha=0.7, 
+                   label=f'平均值: {deviation_mean:.3f}%')
         ax2.set_title(f'{interval} - 偏离度分布')
         ax2.set_xlabel('偏离度 (%)')
         ax2.set_ylabel('频次')
@@ -93,8 +367,8 @@ def plot_hma_deviation(data):
         ax2.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('hma_deviation_analysis.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    plt.savefig('hma_deviation_analysis.png', dpi=SAVE_DPI, bbox_inches='tight')
+    plt.close(fig)
 
 def plot_trading_signals(data):
     """绘制交易信号分析"""
@@ -104,24 +378,25 @@ def plot_trading_signals(data):
     for i, (interval, df) in enumerate(data.items()):
         ax = axes[i]
         
-        # 创建交易信号
-        df_signal = df.copy()
-        df_signal['hma_signal'] = np.where(df_signal['close'] > df_signal['HMA_45'], 1, -1)
-        df_signal['signal_change'] = df_signal['hma_signal'].diff()
+        # 创建交易信号: 价格在HMA上方为1，否则为-1（HMA预热期NaN视为下方），信号翻转处即买卖点
+        times = df.index.values
+        close = df['close'].to_numpy()
+        hma = df['HMA_45'].to_numpy()
+        above = close > hma
+        cross_up_idx = np.flatnonzero(above[1:] & ~above[:-1]) + 1
+        cross_dn_idx = np.flatnonzero(~above[1:] & above[:-1]) + 1
         
         # 绘制价格和HMA
-        ax.plot(df_signal.index, df_signal['close'], label='ETH价格', linewidth=0.8, alpha=0.8)
-        ax.plot(df_signal.index, df_signal['HMA_45'], label='HMA_45', linewidth=1.2, alpha=0.9)
-        
-        # 标记买入信号
-        buy_signals = df_signal[df_signal['signal_change'] == 2]
-        ax.scatter(buy_signals.index, buy_signals['close'], 
-                  color='green', alpha=0.7, s=20, label='买入信号', marker='^')
+        idx = downsample_indices(close, hma)
+        ax.plot(times[idx], close[idx], label='ETH价格', linewidth=0.8, alpha=0.8)
+        ax.plot(times[idx], hma[idx], label='HMA_45', linewidth=1.2, alpha=0.9)
         
-        # 标记卖出信号
-        sell_signals = df_signal[df_signal['signal_change'] == -2]
-        ax.scatter(sell_signals.index, sell_signals['close'], 
-                  color='red', alpha=0.7, s=20, label='卖出信号', marker='v')
+        # 标记买卖信号: 单色无连线的 plot 走 Agg 的 draw_markers，同一标记字形只光栅化一次
+        # markersize 为 scatter 面积 s=20 对应的边长
+        ax.plot(times[cross_up_idx], close[cross_up_idx], linestyle='None', marker='^',
+                markersize=np.sqrt(20), color='green', alpha=0.7, label='买入信号')
+        ax.plot(times[cross_dn_idx], close[cross_dn_idx], linestyle='None', marker='v',
+                markersize=np.sqrt(20), color='red', alpha=0.7, label='卖出信号')
         
         ax.set_title(f'{interval} - HMA交易信号')
         ax.set_ylabel('价格 (USDT)')
@@ -129,8 +404,8 @@ def plot_trading_signals(data):
         ax.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('hma_trading_signals.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    plt.savefig('hma_trading_signals.png', dpi=SAVE_DPI, bbox_inches='tight')
+    plt.close(fig)
 
 def plot_volume_analysis(data):
     """绘制成交量分析"""
@@ -140,26 +415,52 @@ def plot_volume_analysis(data):
     for i, (interval, df) in enumerate(data.items()):
         # 成交量时间序列
         ax1 = axes[i, 0]
-        ax1.plot(df.index, df['volume'], linewidth=0.8, alpha=0.8, color='orange')
+        idx = downsample_indices(df['volume'])
+        ax1.plot(df.index[idx], df['volume'].values[idx], linewidth=0.8, alpha=0.8, color='orange')
         ax1.set_title(f'{interval} - 成交量走势')
         ax1.set_ylabel('成交量 (ETH)')
         ax1.grid(True, alpha=0.3)
         
         # 成交量与价格变化关系
         ax2 = axes[i, 1]
-        price_changes = df['price_change'].dropna() * 100
-        volumes = df['volume'].loc[price_changes.index]
+        price_changes = df['price_change'].to_numpy()
+        valid = ~np.isnan(price_changes)
+        # 布尔索引已经得到新数组，直接原地换算为百分比，不再为整列分配临时数组
+        price_changes = price_changes[valid]
+        np.multiply(price_changes, 100, out=price_changes)
+        volumes = df['volume'].to_numpy()[valid]
         
-        scatter = ax2.scatter(price_changes, volumes, alpha=0.5, s=10, c=price_changes, cmap='RdYlGn')
+        # 六边形分箱: 点数很多时逐点着色的散点图绘制很慢，分箱后只绘制一个集合
+        hb = ax2.hexbin(price_changes, volumes, gridsize=(80, 60), bins='log',
+                        cmap='RdYlGn', mincnt=1)
         ax2.set_title(f'{interval} - 成交量与价格变化关系')
         ax2.set_xlabel('价格变化 (%)')
         ax2.set_ylabel('成交量 (ETH)')
         ax2.grid(True, alpha=0.3)
-        plt.colorbar(scatter, ax=ax2, label='价格变化 (%)')
+        plt.colorbar(hb, ax=ax2, label='密度 (log)')
     
     plt.tight_layout()
-    plt.savefig('volume_analysis.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    plt.savefig('volume_analysis.png', dpi=SAVE_DPI, bbox_inches='tight')
+    plt.close(fig)
+
+def pairwise_corr(arr):
+    """
+    逐列对计算皮尔逊相关系数矩阵，每对列只使用两列都非NaN的行（与 DataFrame.corr 一致）
+
+    Args:
+        arr: (样本数, 列数) 数组
+
+    Returns:
+        (列数, 列数) float64 相关系数矩阵
+    """
+    n_cols = arr.shape[1]
+    valid = ~np.isnan(arr)
+    corr = np.eye(n_cols)
+    for i in range(n_cols):
+        for j in range(i + 1, n_cols):
+            both = valid[:, i] & valid[:, j]
+            corr[i, j] = corr[j, i] = np.corrcoef(arr[both, i], arr[both, j])[0, 1]
+    return corr
 
 def plot_correlation_analysis(data):
     """绘制相关性分析"""
@@ -169,18 +470,29 @@ def plot_correlation_analysis(data):
     for i, (interval, df) in enumerate(data.items()):
         ax = axes[i]
         
-        # 选择相关列
+        # 选择相关列（float32），按列对分别剔除NaN后计算相关系数
         corr_cols = ['close', 'HMA_45', 'price_change', 'hma_deviation', 'volume']
-        corr_data = df[corr_cols].corr()
+        corr = pairwise_corr(df[corr_cols].to_numpy(dtype=np.float32))
         
         # 绘制热力图
-        sns.heatmap(corr_data, annot=True, cmap='coolwarm', center=0, 
-                   square=True, linewidths=0.5, ax=ax, cbar_kws={"shrink": 0.8})
+        im = ax.imshow(corr, cmap='coolwarm', vmin=-1, vmax=1)
+        ax.set_xticks(range(len(corr_cols)))
+        ax.set_xticklabels(corr_cols, rotation=45, ha='right')
+        ax.set_yticks(range(len(corr_cols)))
+        ax.set_yticklabels(corr_cols)
+        ax.grid(False)
+        # 单元格数值: 深色背景用白字，浅色背景用黑字
+        rgb = im.cmap(im.norm(corr))[..., :3]
+        dark = rgb @ np.array([0.299, 0.587, 0.114]) < 0.5
+        for (r, c), v in np.ndenumerate(corr):
+            ax.text(c, r, f'{v:.2g}', ha='center', va='center',
+                    color='white' if dark[r, c] else 'black')
+        fig.colorbar(im, ax=ax, shrink=0.8)
         ax.set_title(f'{interval} - 变量相关性')
     
     plt.tight_layout()
-    plt.savefig('correlation_analysis.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    plt.savefig('correlation_analysis.png', dpi=SAVE_DPI, bbox_inches='tight')
+    plt.close(fig)
 
 def plot_hma_performance(data):
     """绘制HMA性能分析"""
@@ -190,14 +502,21 @@ def plot_hma_performance(data):
     for i, (interval, df) in enumerate(data.items()):
         # HMA跟踪误差
         ax1 = axes[i, 0]
-        hma = df['HMA_45'].dropna()
-        price = df['close'].loc[hma.index]
-        error = price - hma
+        # HMA只在开头的预热期为NaN: 从第一个有效值开始取连续切片（视图），不做布尔索引复制
+        hma = df['HMA_45'].to_numpy()
+        valid = ~np.isnan(hma)
+        first = int(valid.argmax()) if valid.any() else len(hma)
+        hma = hma[first:]
+        error = df['close'].to_numpy()[first:] - hma
+        times = df.index.values[first:]
+        error_std = error.std(ddof=1)
+        error_mean = error.mean()
         
-        ax1.plot(price.index, error, linewidth=0.8, alpha=0.8, color='purple')
+        idx = downsample_indices(error)
+        ax1.plot(times[idx], error[idx], linewidth=0.8, alpha=0.8, color='purple')
         ax1.axhline(y=0, color='black', linestyle='--', alpha=0.5)
-        ax1.axhline(y=error.std(), color='red', linestyle='--', alpha=0.5, label=f'+1σ: {error.std():.2f}')
-        ax1.axhline(y=-error.std(), color='red', linestyle='--', alpha=0.5, label=f'-1σ: {-error.std():.2f}')
+        ax1.axhline(y=error_std, color='red', linestyle='--', alpha=0.5, label=f'+1σ: {error_std:.2f}')
+        ax1.axhline(y=-error_std, color='red', linestyle='--', alpha=0.5, label=f'-1σ: {-error_std:.2f}')
         ax1.set_title(f'{interval} - HMA跟踪误差')
         ax1.set_ylabel('误差 (USDT)')
         ax1.legend()
@@ -205,10 +524,10 @@ def plot_hma_performance(data):
         
         # 误差分布
         ax2 = axes[i, 1]
-        ax2.hist(error, bins=50, alpha=0.7, color='lightblue', edgecolor='black')
+        draw_hist(ax2, error, bins=50, alpha=0.7, color='lightblue', edgecolor='black')
         ax2.axvline(x=0, color='red', linestyle='--', alpha=0.7)
-        ax2.axvline(x=error.mean(), color='green', linestyle='-', alpha=0.7, 
-                   label=f'平均值: {error.mean():.2f}')
+        ax2.axvline(x=error_mean, color='green', linestyle='-', alpha=0.7, 
+                   label=f'平均值: {error_mean:.2f}')
         ax2.set_title(f'{interval} - 跟踪误差分布')
         ax2.set_xlabel('误差 (USDT)')
         ax2.set_ylabel('频次')
@@ -216,23 +535,25 @@ def plot_hma_performance(data):
         ax2.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('hma_performance.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    plt.savefig('hma_performance.png', dpi=SAVE_DPI, bbox_inches='tight')
+    plt.close(fig)
 
 def plot_market_conditions(data):
     """绘制不同市场条件下的HMA表现"""
-    fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+    fig, axes = plt.subplots(2, 2, figsize=(15, 10), sharex='row')
     fig.suptitle('不同市场条件下的HMA表现', fontsize=16, fontweight='bold')
     
     for i, (interval, df) in enumerate(data.items()):
+        # 涨幅>1% / 跌幅>1% 的K线上HMA偏离度的分布和均值，同一行两图共用bin边界和x轴，柱子可以直接对比
+        edges, counts_up, counts_down, mean_up, mean_down = market_condition_stats(
+            df['price_change'].to_numpy(), df['hma_deviation'].to_numpy())
+        
         # 上涨市场
         ax1 = axes[i, 0]
-        up_market = df[df['price_change'] > 0.01]  # 涨幅>1%
-        if len(up_market) > 0:
-            up_deviation = up_market['hma_deviation'].dropna()
-            ax1.hist(up_deviation, bins=30, alpha=0.7, color='green', edgecolor='black')
-            ax1.axvline(x=up_deviation.mean(), color='darkgreen', linestyle='-', alpha=0.7,
-                       label=f'平均值: {up_deviation.mean():.3f}%')
+        if counts_up.sum() > 0:
+            draw_counts(ax1, counts_up, edges, alpha=0.7, color='green', edgecolor='black')
+            ax1.axvline(x=mean_up, color='darkgreen', linestyle='-', alpha=0.7,
+                       label=f'平均值: {mean_up:.3f}%')
             ax1.set_title(f'{interval} - 上涨市场HMA偏离度')
             ax1.set_xlabel('偏离度 (%)')
             ax1.set_ylabel('频次')
@@ -241,12 +562,10 @@ def plot_market_conditions(data):
         
         # 下跌市场
         ax2 = axes[i, 1]
-        down_market = df[df['price_change'] < -0.01]  # 跌幅>1%
-        if len(down_market) > 0:
-            down_deviation = down_market['hma_deviation'].dropna()
-            ax2.hist(down_deviation, bins=30, alpha=0.7, color='red', edgecolor='black')
-            ax2.axvline(x=down_deviation.mean(), color='darkred', linestyle='-', alpha=0.7,
-                       label=f'平均值: {down_deviation.mean():.3f}%')
+        if counts_down.sum() > 0:
+            draw_counts(ax2, counts_down, edges, alpha=0.7, color='red', edgecolor='black')
+            ax2.axvline(x=mean_down, color='darkred', linestyle='-', alpha=0.7,
+                       label=f'平均值: {mean_down:.3f}%')
             ax2.set_title(f'{interval} - 下跌市场HMA偏离度')
             ax2.set_xlabel('偏离度 (%)')
             ax2.set_ylabel('频次')
@@ -254,46 +573,52 @@ def plot_market_conditions(data):
             ax2.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('market_conditions_analysis.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    plt.savefig('market_conditions_analysis.png', dpi=SAVE_DPI, bbox_inches='tight')
+    plt.close(fig)
+
+def _render_plot(plot_func, files):
+    """进程池任务: 子进程按文件路径自行加载数据（读取Feather缓存）后绘制一张图表"""
+    plot_func(load_data(files))
 
 def main():
     """主函数"""
     print("🎨 ETH HMA 可视化分析")
     print("=" * 50)
     
-    # 加载数据
-    data = load_data()
-    if not data:
+    # 查找数据文件；主进程只负责刷新Feather缓存，数据由各子进程自行加载
+    files = discover_files()
+    if not files:
         print("❌ 没有找到可分析的数据文件")
         return
     
-    print(f"✅ 加载数据完成: {len(data)} 个时间间隔")
+    # 缓存过期时在启动子进程前重写，子进程只读缓存，不会同时重写同一个文件
+    for file_path in files.values():
+        refresh_cache(file_path)
+    
+    print(f"✅ 找到数据文件: {len(files)} 个时间间隔")
     
     # 创建图表目录
     Path('charts').mkdir(exist_ok=True)
     
-    # 生成各种图表
-    print("\n📊 生成价格与HMA对比图...")
-    plot_price_and_hma(data)
-    
-    print("📈 生成HMA偏离度分析图...")
-    plot_hma_deviation(data)
-    
-    print("🎯 生成交易信号分析图...")
-    plot_trading_signals(data)
-    
-    print("📊 生成成交量分析图...")
-    plot_volume_analysis(data)
-    
-    print("🔗 生成相关性分析图...")
-    plot_correlation_analysis(data)
-    
-    print("⚡ 生成HMA性能分析图...")
-    plot_hma_performance(data)
-    
-    print("📈 生成市场条件分析图...")
-    plot_market_conditions(data)
+    # 生成各种图表: 各图表相互独立，在进程池中并行绘制
+    # 子进程用spawn启动: 主进程刷新缓存时已启动Arrow线程池，fork会继承其线程状态
+    tasks = [
+        ("\n📊 生成价格与HMA对比图...", plot_price_and_hma),
+        ("📈 生成HMA偏离度分析图...", plot_hma_deviation),
+        ("🎯 生成交易信号分析图...", plot_trading_signals),
+        ("📊 生成成交量分析图...", plot_volume_analysis),
+        ("🔗 生成相关性分析图...", plot_correlation_analysis),
+        ("⚡ 生成HMA性能分析图...", plot_hma_performance),
+        ("📈 生成市场条件分析图...", plot_market_conditions),
+    ]
+    with ProcessPoolExecutor(max_workers=min(len(tasks), os.cpu_count() or 1),
+                             mp_context=multiprocessing.get_context('spawn')) as pool:
+        futures = []
+        for message, plot_func in tasks:
+            print(message)
+            futures.append(pool.submit(_render_plot, plot_func, files))
+        for future in futures:
+            future.result()
     
     print("\n✅ 所有图表生成完成！")
     print("📁 图表已保存到当前目录")
@@ -2,18 +2,124 @@
 数据采集部 (The Data Collector)
 专门负责从币安交易所获取原始数据
 """
+import asyncio
+import json
 import requests
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pathlib import Path
+from types import MappingProxyType
 import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import logging
 from ..utils.config import *
 
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    import h2  # noqa: F401  httpx 的 HTTP/2 支持依赖 h2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # 设置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 币安K线各字段及转换后的类型（与原先 to_datetime / to_numeric 处理的列一致，其余列保持原样）
+KLINE_SCHEMA = pa.schema([
+    ('open_time', pa.timestamp('ms')),
+    ('open', pa.float64()),
+    ('high', pa.float64()),
+    ('low', pa.float64()),
+    ('close', pa.float64()),
+    ('volume', pa.float64()),
+    ('close_time', pa.timestamp('ms')),
+    ('quote_asset_volume', pa.float64()),
+    ('trades_count', pa.int64()),
+    ('taker_buy_base_asset_volume', pa.string()),
+    ('taker_buy_quote_asset_volume', pa.string()),
+    ('ignore', pa.string()),
+])
+
+# 时间间隔对应的毫秒数（只读）
+_INTERVAL_MS = MappingProxyType({
+    '1m': 60 * 1000,
+    '5m': 5 * 60 * 1000,
+    '15m': 15 * 60 * 1000,
+    '30m': 30 * 60 * 1000,
+    '1h': 60 * 60 * 1000,
+    '4h': 4 * 60 * 60 * 1000,
+    '1d': 24 * 60 * 60 * 1000
+})
+
+# 流式写入原始数据时每个行组的行数（与档案管理部保存的文件一致）
+RAW_ROW_GROUP_SIZE = 100_000
+
+
+class _KlineBatchSink:
+    """
+    逐批接收K线数据: 每批立即转换为Arrow表（不再保留Python行列表），
+    指定 raw_path 时累计满一个行组就写入Parquet文件，采集结束后拼接为DataFrame
+    """
+    
+    def __init__(self, collector: 'DataCollector', raw_path: Optional[Path] = None,
+                 metadata: Optional[Dict[str, Any]] = None):
+        self.collector = collector
+        self.raw_path = raw_path
+        self.metadata = metadata or {}
+        self.tables = []
+        self.pending = []
+        self.pending_rows = 0
+        self.writer = None
+    
+    def add(self, klines_data: List[List]):
+        """接收一批K线（按时间顺序调用）"""
+        table = self.collector._klines_to_table(klines_data)
+        self.tables.append(table)
+        if self.raw_path is not None:
+            self.pending.append(table)
+            self.pending_rows += table.num_rows
+            if self.pending_rows >= RAW_ROW_GROUP_SIZE:
+                self._flush()
+    
+    def _flush(self):
+        """把累计的批次作为一个行组写入文件（首次写入时创建文件）"""
+        if not self.pending:
+            return
+        if self.writer is None:
+            schema = KLINE_SCHEMA.with_metadata({'metadata': json.dumps(self.metadata, ensure_ascii=False)})
+            self.writer = pq.ParquetWriter(self.raw_path, schema, compression='zstd')
+        self.writer.write_table(pa.concat_tables(self.pending), row_group_size=RAW_ROW_GROUP_SIZE)
+        self.pending = []
+        self.pending_rows = 0
+    
+    def close(self):
+        """写出剩余批次并关闭文件"""
+        if self.raw_path is not None:
+            self._flush()
+        if self.writer is not None:
+            self.writer.close()
+            logger.info(f"原始数据已流式写入: {self.raw_path}")
+    
+    def to_dataframe(self) -> pd.DataFrame:
+        """拼接所有批次为以 open_time 为索引的DataFrame"""
+        if not self.tables:
+            return pd.DataFrame()
+        return self.collector._table_to_dataframe(pa.concat_tables(self.tables))
+
 
 class DataCollector:
     """数据采集部 - 负责从币安获取ETH历史数据"""
@@ -33,19 +139,8 @@ class DataCollector:
         #     'https': 'https://proxy-server:port'
         # }
     
-    def get_klines_data(self, symbol: str, interval: str, start_time: int, end_time: int) -> List[List]:
-        """
-        从币安获取K线数据
-        
-        Args:
-            symbol: 交易对符号 (如 'ETHUSDT')
-            interval: 时间间隔 (如 '1h', '4h')
-            start_time: 开始时间戳 (毫秒)
-            end_time: 结束时间戳 (毫秒)
-            
-        Returns:
-            K线数据列表
-        """
+    def _klines_request(self, symbol: str, interval: str, start_time: int, end_time: int):
+        """K线请求的候选API端点（按优先级）和查询参数"""
         # 尝试多个API端点
         urls = [
             f"{self.base_url}{BINANCE_KLINES_ENDPOINT}",
@@ -59,6 +154,22 @@ class DataCollector:
             'endTime': end_time,
             'limit': 1000  # 币安单次最大返回1000条数据
         }
+        return urls, params
+    
+    def get_klines_data(self, symbol: str, interval: str, start_time: int, end_time: int) -> List[List]:
+        """
+        从币安获取K线数据
+        
+        Args:
+            symbol: 交易对符号 (如 'ETHUSDT')
+            interval: 时间间隔 (如 '1h', '4h')
+            start_time: 开始时间戳 (毫秒)
+            end_time: 结束时间戳 (毫秒)
+            
+        Returns:
+            K线数据列表
+        """
+        urls, params = self._klines_request(symbol, interval, start_time, end_time)
         
         # 尝试每个URL
         for url in urls:
@@ -86,7 +197,8 @@ class DataCollector:
         
         return []
     
-    def collect_historical_data(self, symbol: str, interval: str, years_back: int = 3) -> pd.DataFrame:
+    def collect_historical_data(self, symbol: str, interval: str, years_back: int = 3,
+                                raw_path: Optional[Path] = None) -> pd.DataFrame:
         """
         收集历史数据的主方法
         
@@ -94,13 +206,37 @@ class DataCollector:
             symbol: 交易对符号
             interval: 时间间隔
             years_back: 获取多少年的历史数据
+            raw_path: 可选，原始K线边采集边写入的Parquet文件路径（有数据时才创建）
             
         Returns:
             包含历史数据的DataFrame
         """
         logger.info(f"开始收集 {symbol} {interval} 历史数据")
+        start_time, end_time = self._get_time_range(years_back)
+        
+        sink = _KlineBatchSink(self, raw_path, metadata={
+            'created_at': datetime.now().isoformat(),
+            'data_type': 'raw',
+            'symbol': symbol,
+            'interval': interval,
+            'description': '从币安获取的原始K线数据'
+        })
+        try:
+            if self._can_collect_async():
+                asyncio.run(self._collect_concurrently(symbol, interval, start_time, end_time, sink))
+            else:
+                self._collect_sequentially(symbol, interval, start_time, end_time, sink)
+        finally:
+            sink.close()
+        
+        # 转换为DataFrame
+        df = sink.to_dataframe()
+        logger.info(f"数据收集完成，共获取 {len(df)} 条记录")
         
-        # 计算时间范围
+        return df
+    
+    def _get_time_range(self, years_back: int) -> Tuple[int, int]:
+        """根据配置计算采集的开始/结束时间戳 (毫秒)"""
         if START_DATE:
             # 使用配置中的特定开始时间
             start_dt = datetime.fromisoformat(START_DATE.replace('Z', '+00:00'))
@@ -119,7 +255,24 @@ class DataCollector:
             end_time = int(datetime.now().timestamp() * 1000)
             logger.info(f"使用当前时间作为结束时间")
         
-        all_data = []
+        return start_time, end_time
+    
+    def _can_collect_async(self) -> bool:
+        """
+        是否使用异步并发采集: 需要安装httpx、未配置代理，且当前线程没有正在运行的事件循环
+        （如Jupyter中 asyncio.run 不可用，此时回退到顺序采集）
+        """
+        if not HTTPX_AVAILABLE or self.proxies:
+            return False
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return True
+        return False
+    
+    def _collect_sequentially(self, symbol: str, interval: str, start_time: int, end_time: int,
+                              sink: _KlineBatchSink):
+        """逐批顺序采集: 每批从上一批最后一条K线的收盘时间之后开始"""
         current_start = start_time
         
         while current_start < end_time:
@@ -135,65 +288,133 @@ class DataCollector:
             if not batch_data:
                 break
                 
-            all_data.extend(batch_data)
+            sink.add(batch_data)
             
             # 更新下一个批次的开始时间
             current_start = batch_data[-1][6] + 1  # 使用最后一条数据的结束时间
             
             # 避免请求过于频繁 - 增加延迟
             time.sleep(REQUEST_DELAY * 2)  # 增加延迟时间
+    
+    def _batch_windows(self, interval: str, start_time: int, end_time: int, batch_size: int = 500) -> List[Tuple[int, int]]:
+        """
+        预先把 [start_time, end_time] 划分为互不重叠的批次时间窗口，每个窗口最多 batch_size 根K线
+        （币安的 endTime 包含端点，因此窗口结束时间为下一窗口开始时间减1毫秒）
+        """
+        step = batch_size * self._get_interval_ms(interval)
+        return [(batch_start, min(batch_start + step - 1, end_time))
+                for batch_start in range(start_time, end_time, step)]
+    
+    async def _collect_concurrently(self, symbol: str, interval: str, start_time: int, end_time: int,
+                                    sink: _KlineBatchSink):
+        """
+        并发采集所有批次: 用信号量限制同时进行的请求数，按窗口顺序把完成的批次交给 sink
+        某个窗口没有数据（如早于上市时间）时只是跳过该窗口；
+        某个窗口请求失败时与顺序采集一样在此停止，不跨过缺口拼接后面的批次
+        """
+        windows = self._batch_windows(interval, start_time, end_time)
+        logger.info(f"并发获取 {len(windows)} 个数据批次 (最多 {MAX_CONCURRENT_REQUESTS} 个同时请求)")
         
-        # 转换为DataFrame
-        df = self._convert_to_dataframe(all_data)
-        logger.info(f"数据收集完成，共获取 {len(df)} 条记录")
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        async with httpx.AsyncClient(http2=HTTP2_AVAILABLE, timeout=30,
+                                     headers={'User-Agent': 'ETH-HMA-Analyzer/1.0'}) as client:
+            tasks = [
+                asyncio.ensure_future(
+                    self._get_klines_data_async(client, semaphore, symbol, interval, batch_start, batch_end))
+                for batch_start, batch_end in windows
+            ]
+            try:
+                for (batch_start, batch_end), task in zip(windows, tasks):
+                    batch_data = await task
+                    if batch_data is None:
+                        logger.error(f"批次 {datetime.fromtimestamp(batch_start/1000)} - "
+                                     f"{datetime.fromtimestamp(batch_end/1000)} 获取失败，停止采集")
+                        break
+                    if batch_data:
+                        sink.add(batch_data)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                # 等待取消完成，再关闭客户端
+                await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _get_klines_data_async(self, client, semaphore: asyncio.Semaphore, symbol: str, interval: str,
+                                     start_time: int, end_time: int) -> Optional[List[List]]:
+        """
+        get_klines_data 的异步版本: 同样依次尝试各API端点，每个请求单独指数退避重试
         
-        return df
+        Returns:
+            K线数据列表；窗口内没有数据时为空列表，所有端点都请求失败时为None
+        """
+        urls, params = self._klines_request(symbol, interval, start_time, end_time)
+        
+        async with semaphore:
+            for url in urls:
+                for attempt in range(MAX_RETRIES):
+                    try:
+                        response = await client.get(url, params=params)
+                        response.raise_for_status()
+                        data = _json_loads(response.content)
+                        
+                        if not data:
+                            logger.warning(f"未获取到数据: {symbol} {interval} {start_time}-{end_time}")
+                            return []
+                        
+                        logger.info(f"✅ 成功从 {url} 获取 {len(data)} 条数据: {symbol} {interval}")
+                        # 占用并发名额期间保持请求间隔，避免触发限制
+                        await asyncio.sleep(REQUEST_DELAY)
+                        return data
+                    
+                    except (httpx.HTTPError, ValueError) as e:
+                        logger.error(f"请求失败 (尝试 {attempt + 1}/{MAX_RETRIES}): {e}")
+                        if attempt < MAX_RETRIES - 1:
+                            await asyncio.sleep(REQUEST_DELAY * (2 ** attempt))  # 指数退避
+                        else:
+                            logger.warning(f"端点 {url} 失败，尝试下一个端点")
+        
+        return None
     
     def _get_interval_ms(self, interval: str) -> int:
-        """将时间间隔转换为毫秒"""
-        interval_map = {
-            '1m': 60 * 1000,
-            '5m': 5 * 60 * 1000,
-            '15m': 15 * 60 * 1000,
-            '30m': 30 * 60 * 1000,
-            '1h': 60 * 60 * 1000,
-            '4h': 4 * 60 * 60 * 1000,
-            '1d': 24 * 60 * 60 * 1000
-        }
-        return interval_map.get(interval, 60 * 60 * 1000)
+        """将时间间隔转换为毫秒（未知间隔按1小时处理）"""
+        return _INTERVAL_MS.get(interval, _INTERVAL_MS['1h'])
     
-    def _convert_to_dataframe(self, klines_data: List[List]) -> pd.DataFrame:
+    def _klines_to_table(self, klines_data: List[List]) -> pa.Table:
         """
-        将币安K线数据转换为DataFrame
+        将币安K线数据转换为 KLINE_SCHEMA 类型的Arrow表
         
         币安K线数据格式:
         [
             [开盘时间, 开盘价, 最高价, 最低价, 收盘价, 成交量, 收盘时间, 成交额, 成交笔数, 主动买入成交量, 主动买入成交额, 忽略]
         ]
         """
-        if not klines_data:
-            return pd.DataFrame()
-        
-        df = pd.DataFrame(klines_data, columns=[
-            'open_time', 'open', 'high', 'low', 'close', 'volume',
-            'close_time', 'quote_asset_volume', 'trades_count',
-            'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'
-        ])
-        
-        # 转换数据类型
-        df['open_time'] = pd.to_datetime(df['open_time'], unit='ms')
-        df['close_time'] = pd.to_datetime(df['close_time'], unit='ms')
+        # 按列转置后交给Arrow: 数值字符串在C中一次解析为float64，毫秒时间戳直接转为时间类型
+        columns = []
+        for values, field in zip(zip(*klines_data), KLINE_SCHEMA):
+            array = pa.array(values)
+            if pa.types.is_timestamp(field.type):
+                array = array.cast(pa.int64()).cast(field.type)
+            else:
+                array = array.cast(field.type)
+            columns.append(array)
         
-        numeric_columns = ['open', 'high', 'low', 'close', 'volume', 'quote_asset_volume']
-        for col in numeric_columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
+        return pa.Table.from_arrays(columns, schema=KLINE_SCHEMA)
+    
+    def _table_to_dataframe(self, table: pa.Table) -> pd.DataFrame:
+        """K线Arrow表转换为以 open_time 为索引、按时间排序的DataFrame"""
+        df = table.to_pandas(self_destruct=True)
         
         # 设置时间索引
         df.set_index('open_time', inplace=True)
         df.sort_index(inplace=True)
         
         return df
-
+    
+    def _convert_to_dataframe(self, klines_data: List[List]) -> pd.DataFrame:
+        """将币安K线数据（行列表）转换为DataFrame"""
+        if not klines_data:
+            return pd.DataFrame()
+        
+        return self._table_to_dataframe(self._klines_to_table(klines_data))
 
 if __name__ == "__main__":
     # 测试数据采集部
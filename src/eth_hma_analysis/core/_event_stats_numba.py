@@ -0,0 +1,64 @@
+"""
+事件后续价格变化的逐周期统计内核
+输入为 (事件数, K) 的float32数组，末尾事件缺少的周期为NaN；
+安装numba时逐列编译计算，否则回退到 np.nanmean / np.nanstd
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _mean_std_axis0_numpy(buf: np.ndarray):
+    """NumPy实现: 忽略NaN的逐列均值和总体标准差(ddof=0)"""
+    return np.nanmean(buf, axis=0), np.nanstd(buf, axis=0)
+
+
+if NUMBA_AVAILABLE:
+    # 列数最多约200，prange收益可忽略；不用parallel/显式签名，避免导入时就在父进程初始化线程层
+    @njit(cache=True)
+    def _mean_std_axis0_numba(buf):
+        n_rows, n_cols = buf.shape
+        mean = np.empty(n_cols, dtype=np.float32)
+        std = np.empty(n_cols, dtype=np.float32)
+        for j in range(n_cols):
+            # 按float64累加，两遍法求方差
+            count = 0
+            total = 0.0
+            for i in range(n_rows):
+                v = buf[i, j]
+                if v == v:
+                    total += v
+                    count += 1
+            if count == 0:
+                mean[j] = np.nan
+                std[j] = np.nan
+                continue
+            m = total / count
+            squared = 0.0
+            for i in range(n_rows):
+                v = buf[i, j]
+                if v == v:
+                    squared += (v - m) * (v - m)
+            mean[j] = m
+            std[j] = np.sqrt(squared / count)
+        return mean, std
+
+
+def mean_std_axis0(buf: np.ndarray):
+    """
+    逐周期（列）统计事件后续价格变化，忽略NaN
+
+    Args:
+        buf: (事件数, K) 价格变化数组，缺失值为NaN
+
+    Returns:
+        (mean, std) 两个长度为K的float32数组，std为总体标准差；某列全为NaN时为NaN
+    """
+    buf = np.ascontiguousarray(buf, dtype=np.float32)
+    if NUMBA_AVAILABLE:
+        return _mean_std_axis0_numba(buf)
+    return _mean_std_axis0_numpy(buf)
@@ -0,0 +1,95 @@
+"""
+HMA斜率与拐点计算内核
+安装numba时使用JIT编译的单次循环，否则回退到等价的NumPy向量化实现
+
+斜率保持float64（阈值比较需要完整精度）；取值只有 -1/0/1(/NaN) 的辅助列使用窄类型：
+斜率符号float32（需保留NaN），符号变化和拐点int8
+"""
+import numpy as np
+
+try:
+    from numba import njit, literally
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _hma_slope_numpy(hma: np.ndarray, threshold: float):
+    """NumPy实现，语义与 diff / np.sign / diff().fillna(0) 完全一致"""
+    slope = np.empty_like(hma)
+    slope[:1] = np.nan
+    np.subtract(hma[1:], hma[:-1], out=slope[1:])
+
+    sign = np.sign(slope).astype(np.float32)
+    change = np.zeros_like(sign)
+    np.subtract(sign[1:], sign[:-1], out=change[1:])
+    change[np.isnan(change)] = 0.0
+    change = change.astype(np.int8)
+
+    turning_point = np.zeros(len(hma), dtype=np.int8)
+    turning_point[change == 2.0] = 1
+    turning_point[change == -2.0] = -1
+    if threshold > 0:
+        turning_point[~(np.abs(slope) >= threshold)] = 0
+
+    return slope, sign, change, turning_point
+
+
+if NUMBA_AVAILABLE:
+    # 不启用fastmath: 需要严格的NaN语义（HMA前导NaN不能产生拐点）
+    # filter_threshold 作为编译期常量(literally)，是否按阈值过滤拐点各编译一个特化版本，
+    # 循环内不再判断该分支；两个版本都会缓存到磁盘
+    @njit(cache=True)
+    def _hma_slope_numba(hma, threshold, filter_threshold):
+        literally(filter_threshold)
+        n = hma.shape[0]
+        slope = np.empty(n)
+        sign = np.empty(n, dtype=np.float32)
+        change = np.zeros(n, dtype=np.int8)
+        turning_point = np.zeros(n, dtype=np.int8)
+        if n == 0:
+            return slope, sign, change, turning_point
+
+        slope[0] = np.nan
+        sign[0] = np.nan
+        for i in range(1, n):
+            s = hma[i] - hma[i - 1]
+            slope[i] = s
+            if s > 0:
+                sign[i] = 1.0
+            elif s < 0:
+                sign[i] = -1.0
+            elif s == 0:
+                sign[i] = 0.0
+            else:
+                sign[i] = np.nan
+
+            c = sign[i] - sign[i - 1]
+            if c == c:
+                change[i] = np.int8(c)
+            if filter_threshold and not abs(s) >= threshold:
+                continue
+            if c == 2.0:
+                turning_point[i] = 1
+            elif c == -2.0:
+                turning_point[i] = -1
+
+        return slope, sign, change, turning_point
+
+
+def hma_slope(hma: np.ndarray, threshold: float = 0.0):
+    """
+    计算HMA斜率、斜率符号、符号变化和拐点
+
+    Args:
+        hma: HMA数值数组
+        threshold: 斜率阈值，拐点处|斜率|低于该值时被过滤（<=0表示不过滤）
+
+    Returns:
+        (slope, slope_sign, slope_change, turning_point) 四个等长数组，
+        dtype分别为 float64 / float32 / int8 / int8
+    """
+    hma = np.ascontiguousarray(hma, dtype=np.float64)
+    if NUMBA_AVAILABLE:
+        return _hma_slope_numba(hma, float(threshold), bool(threshold > 0))
+    return _hma_slope_numpy(hma, float(threshold))
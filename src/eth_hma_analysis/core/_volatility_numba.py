@@ -0,0 +1,80 @@
+"""
+事件窗口波动率计算内核
+安装numba时按事件并行(prange)计算，否则回退到等价的NumPy向量化实现
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# 年化系数（按1小时K线）
+ANNUALIZATION = np.sqrt(252 * 24)
+
+
+def _event_volatility_numpy(close: np.ndarray, event_pos: np.ndarray,
+                            window_before: int, window_after: int) -> np.ndarray:
+    """NumPy实现: 以 (事件数, 窗口长度) 的二维收集数组做带掩码的两遍样本标准差"""
+    n = len(close)
+    returns = np.full(n, np.nan)
+    returns[1:] = close[1:] / close[:-1] - 1
+    return_pos = event_pos[:, None] + np.arange(1 - window_before, window_after + 1)
+    return_valid = (return_pos >= 1) & (return_pos < n)
+    window_returns = np.where(return_valid, returns[np.clip(return_pos, 0, n - 1)], 0.0)
+    n_returns = return_valid.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_returns = window_returns.sum(axis=1) / n_returns
+        squared = np.where(return_valid, (window_returns - mean_returns[:, None]) ** 2, 0.0)
+        volatility = np.sqrt(squared.sum(axis=1) / (n_returns - 1)) * ANNUALIZATION
+    return np.where(n_returns > 1, volatility, np.nan)
+
+
+if NUMBA_AVAILABLE:
+    # 不启用fastmath: 窗口内的NaN收盘价必须让该事件的波动率为NaN
+    @njit(parallel=True, cache=True)
+    def _event_volatility_numba(close, event_pos, window_before, window_after):
+        n = close.shape[0]
+        out = np.empty(event_pos.shape[0])
+        for k in prange(event_pos.shape[0]):
+            # 收益率 r[i] = close[i] / close[i-1] - 1，i 取窗口内且 >= 1 的位置
+            start = max(event_pos[k] - window_before + 1, 1)
+            stop = min(event_pos[k] + window_after + 1, n)
+            count = stop - start
+            if count < 2:
+                out[k] = np.nan
+                continue
+
+            total = 0.0
+            for i in range(start, stop):
+                total += close[i] / close[i - 1] - 1
+            mean = total / count
+
+            squared = 0.0
+            for i in range(start, stop):
+                d = close[i] / close[i - 1] - 1 - mean
+                squared += d * d
+            out[k] = np.sqrt(squared / (count - 1)) * ANNUALIZATION
+        return out
+
+
+def event_volatility(close: np.ndarray, event_pos: np.ndarray,
+                     window_before: int, window_after: int) -> np.ndarray:
+    """
+    计算每个事件窗口 [事件-window_before, 事件+window_after] 内收益率的年化样本标准差
+
+    Args:
+        close: 收盘价数组
+        event_pos: 事件位置（整数数组）
+        window_before: 事件前窗口
+        window_after: 事件后窗口
+
+    Returns:
+        与 event_pos 等长的波动率数组，窗口内收益率不足2个时为NaN
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    event_pos = np.ascontiguousarray(event_pos, dtype=np.int64)
+    if NUMBA_AVAILABLE:
+        return _event_volatility_numba(close, event_pos, int(window_before), int(window_after))
+    return _event_volatility_numpy(close, event_pos, window_before, window_after)
@@ -12,9 +12,23 @@ import numpy as np
 import logging
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
-import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ._slope_numba import hma_slope
+from ._volatility_numba import event_volatility
+
+try:
+    import numexpr as ne
+    NUMEXPR_AVAILABLE = True
+except ImportError:
+    NUMEXPR_AVAILABLE = False
+
+try:
+    import bottleneck as bn
+    BOTTLENECK_AVAILABLE = True
+except ImportError:
+    BOTTLENECK_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +63,23 @@ class EventAnalysis:
     volatility: float  # 事件窗口内的波动率
     consistency: float  # 后续走势一致性
 
+# generate_trend_report 中用于统计的区间/事件字段
+_INTERVAL_STATS_DTYPE = np.dtype([
+    ('is_up', np.bool_), ('duration', np.int64), ('price_change_pct', np.float64),
+    ('pfe_pct', np.float64), ('mae_pct', np.float64)
+])
+_EVENT_STATS_DTYPE = np.dtype([
+    ('is_up', np.bool_), ('volatility', np.float64), ('consistency', np.float64),
+    ('price_change_1h', np.float64), ('price_change_5h', np.float64)
+])
+
+
+def _nanmean(values: np.ndarray) -> float:
+    """忽略NaN的均值；安装bottleneck时单次遍历完成，不生成掩码和筛选后的副本"""
+    if BOTTLENECK_AVAILABLE:
+        return bn.nanmean(values)
+    return np.mean(values[~np.isnan(values)])
+
 class TrendAnalyzer:
     """趋势分析器"""
     
@@ -82,36 +113,22 @@ class TrendAnalyzer:
         if hma_col not in df.columns:
             raise ValueError(f"HMA列 {hma_col} 不存在")
         
-        # 计算HMA斜率（一阶差分）
-        df['HMA_slope'] = df[hma_col].diff()
-        
         # 基于HMA斜率变化识别趋势转换点
         # 你的核心逻辑：
         # 上涨趋势（HMA斜率由负转正）→ 做多 → 研究最大涨幅（理想值）和最大跌幅（风险值）
         # 下跌趋势（HMA斜率由正转负）→ 做空 → 研究最大跌幅（理想值）和最大涨幅（风险值）
-        df['turning_point'] = 0
-        
-        # 计算斜率符号变化
-        df['slope_sign'] = np.sign(df['HMA_slope'])
-        df['slope_change'] = df['slope_sign'].diff().fillna(0)
-        
-        # 上涨趋势开始：斜率由负转正（做多信号）
-        uptrend_start = df['slope_change'] == 2.0  # 从-1变为+1
-        df.loc[uptrend_start, 'turning_point'] = 1  # 上拐点
-        
-        # 下跌趋势开始：斜率由正转负（做空信号）
-        downtrend_start = df['slope_change'] == -2.0  # 从+1变为-1
-        df.loc[downtrend_start, 'turning_point'] = -1  # 下拐点
-        
-        # 过滤噪音：只保留斜率变化幅度足够大的拐点
-        if self.slope_threshold > 0:
-            slope_magnitude = df['HMA_slope'].abs()
-            valid_turns = (df['turning_point'] != 0) & (slope_magnitude >= self.slope_threshold)
-            df.loc[~valid_turns, 'turning_point'] = 0
-        
-        # 统计拐点数量
-        up_turns = (df['turning_point'] == 1).sum()
-        down_turns = (df['turning_point'] == -1).sum()
+        # 斜率为一阶差分；斜率符号由-1变为+1为上拐点，由+1变为-1为下拐点；
+        # |斜率|低于阈值的拐点视为噪音过滤掉
+        # 只写回斜率和拐点两列；斜率符号及其变化只是内核的中间量，不再作为辅助列保存
+        slope, _, _, turning_point = hma_slope(
+            df[hma_col].to_numpy(dtype=np.float64), self.slope_threshold
+        )
+        df['HMA_slope'] = slope
+        df['turning_point'] = turning_point
+        
+        # 统计拐点数量（直接在内核输出的数组上计数）
+        up_turns = np.count_nonzero(turning_point == 1)
+        down_turns = np.count_nonzero(turning_point == -1)
         
         logger.info(f"识别到 {up_turns} 个上拐点, {down_turns} 个下拐点")
         
@@ -131,130 +148,171 @@ class TrendAnalyzer:
         """
         logger.info(f"开始事件分析 - 窗口: {window_before}前, {window_after}后")
         
-        events = []
-        turning_points = df[df['turning_point'] != 0].copy()
+        close = df['close'].to_numpy(dtype=np.float64)
+        turning_point = df['turning_point'].to_numpy()
+        index = df.index
+        n = len(close)
         
-        for idx, row in turning_points.iterrows():
-            event_type = 'up_turn' if row['turning_point'] == 1 else 'down_turn'
-            
-            # 获取数值索引
-            numeric_idx = df.index.get_loc(idx)
-            
-            # 定义分析窗口
-            start_idx = max(0, numeric_idx - window_before)
-            end_idx = min(len(df), numeric_idx + window_after + 1)
-            
-            window_data = df.iloc[start_idx:end_idx].copy()
-            
-            # 计算价格变化
-            price_at_event = row['close']
-            price_changes = []
-            
-            for i in range(1, window_after + 1):
-                if numeric_idx + i < len(df):
-                    future_price = df.iloc[numeric_idx + i]['close']
-                    change_pct = (future_price / price_at_event - 1) * 100
-                    price_changes.append(change_pct)
-            
-            # 计算波动率
-            returns = window_data['close'].pct_change().dropna()
-            volatility = returns.std() * np.sqrt(252 * 24)  # 年化波动率
-            
-            # 计算一致性
-            if event_type == 'up_turn':
-                consistency = sum(1 for change in price_changes if change > 0) / len(price_changes) if price_changes else 0
-            else:
-                consistency = sum(1 for change in price_changes if change < 0) / len(price_changes) if price_changes else 0
-            
-            event = EventAnalysis(
-                event_type=event_type,
-                event_time=row.name,
-                price_at_event=price_at_event,
-                price_changes=price_changes,
-                volatility=volatility,
-                consistency=consistency
+        # 所有拐点一次性处理: 每行对应一个事件
+        event_pos = np.flatnonzero(turning_point != 0)
+        if n == 0 or len(event_pos) == 0:
+            logger.info("完成事件分析 - 共分析 0 个事件")
+            return []
+        prices_at_event = close[event_pos]
+        is_up = turning_point[event_pos] == 1
+        
+        # 事件后第1..window_after个周期相对事件价格的变化:
+        # 末尾补NaN后取长度为 window_after+1 的滑动窗口视图（不复制数据），按事件位置收集成 (事件数, window_after+1)，
+        # 超出数据末尾的位置为NaN
+        padded = np.concatenate([close, np.full(window_after, np.nan)])
+        future_prices = sliding_window_view(padded, window_after + 1)[event_pos]
+        price_changes = (future_prices[:, 1:] / future_prices[:, :1] - 1) * 100
+        n_changes = np.minimum(window_after, n - 1 - event_pos)
+        
+        # 计算波动率: 窗口 [事件-window_before, 事件+window_after] 内收益率的年化样本标准差
+        volatility = event_volatility(close, event_pos, window_before, window_after)
+        
+        # 计算一致性: 后续价格变化与拐点方向一致的比例
+        # （补齐的NaN位置比较结果为False，不计入）
+        agree = np.where(is_up[:, None], price_changes > 0, price_changes < 0)
+        n_agree = agree.sum(axis=1)
+        
+        events = [
+            EventAnalysis(
+                event_type='up_turn' if up else 'down_turn',
+                event_time=index[pos],
+                price_at_event=price,
+                price_changes=changes[:count].tolist(),
+                volatility=vol,
+                consistency=agree_count / count if count else 0
+            )
+            for pos, up, price, changes, count, vol, agree_count in zip(
+                event_pos, is_up, prices_at_event, price_changes, n_changes, volatility, n_agree
             )
-            events.append(event)
+        ]
         
         logger.info(f"完成事件分析 - 共分析 {len(events)} 个事件")
         return events
     
-    def analyze_trend_intervals(self, df: pd.DataFrame) -> List[TrendInterval]:
+    @staticmethod
+    def _compute_intervals(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        一次性计算所有相邻拐点区间 [拐点i, 拐点i+1] 的基础数据（按列存放的数组）
+        区间分析和上涨/下跌专项分析共用，拐点定位和分段归约只做一遍
+        
+        Args:
+            df: 包含turning_point/close/high/low列的DataFrame
+            
+        Returns:
+            数组字典: start_idx, end_idx, start_close, end_close, high_max, low_min, is_up，
+            长度均为 max(拐点数-1, 0)
+        """
+        turning_point = df['turning_point'].to_numpy()
+        tp_pos = np.flatnonzero(turning_point != 0)
+        if len(tp_pos) < 2:
+            no_index = np.empty(0, dtype=np.intp)
+            no_price = np.empty(0, dtype=np.float64)
+            return {
+                'start_idx': no_index, 'end_idx': no_index,
+                'start_close': no_price, 'end_close': no_price,
+                'high_max': no_price, 'low_min': no_price,
+                'is_up': np.empty(0, dtype=bool),
+            }
+        
+        close = df['close'].to_numpy(dtype=np.float64)
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        
+        # reduceat 在 [tp_pos[i], tp_pos[i+1]) 上归约（丢弃最后一个拐点之后的尾段），
+        # 再并入右端拐点本身；fmax/fmin 与pandas一样忽略NaN
+        start_idx = tp_pos[:-1]
+        end_idx = tp_pos[1:]
+        return {
+            'start_idx': start_idx,
+            'end_idx': end_idx,
+            'start_close': close[start_idx],
+            'end_close': close[end_idx],
+            'high_max': np.fmax(np.fmax.reduceat(high, tp_pos)[:-1], high[end_idx]),
+            'low_min': np.fmin(np.fmin.reduceat(low, tp_pos)[:-1], low[end_idx]),
+            'is_up': turning_point[start_idx] == 1,
+        }
+    
+    @staticmethod
+    def _excursion_pct(is_up: np.ndarray, start: np.ndarray, high: np.ndarray,
+                       low: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        按趋势方向计算PFE/MAE百分比
+        最大涨幅 (high/start-1)*100，最大跌幅 (start/low-1)*100；
+        安装numexpr时每个结果在一次遍历中完成除法、减法和方向选择，不产生中间数组
+        """
+        if NUMEXPR_AVAILABLE:
+            operands = {'up': is_up, 's': start, 'h': high, 'l': low}
+            pfe = ne.evaluate("where(up, (h / s - 1) * 100, (s / l - 1) * 100)", local_dict=operands)
+            mae = ne.evaluate("where(up, (s / l - 1) * 100, (h / s - 1) * 100)", local_dict=operands)
+            return pfe, mae
+        
+        max_rise_pct = (high / start - 1) * 100
+        max_drop_pct = (start / low - 1) * 100
+        return np.where(is_up, max_rise_pct, max_drop_pct), np.where(is_up, max_drop_pct, max_rise_pct)
+    
+    def analyze_trend_intervals(self, df: pd.DataFrame,
+                                soa: Optional[Dict[str, np.ndarray]] = None) -> List[TrendInterval]:
         """
         分析趋势区间，计算最大涨幅/跌幅捕获 - 改进版本
         基于趋势转换时刻的价格作为起始点，完整捕捉趋势期间的PFE和MAE
         
         Args:
             df: 包含拐点数据的DataFrame
+            soa: 已由 _compute_intervals 计算好的区间数组，省略时现场计算
             
         Returns:
             趋势区间分析结果列表
         """
         logger.info("开始趋势区间分析")
         
-        # 获取所有拐点
-        turning_points = df[df['turning_point'] != 0].copy()
-        
-        if len(turning_points) < 2:
+        # 一次分段归约得到每个区间 [拐点i, 拐点i+1] 的起止位置、收盘价、最高价和最低价
+        if soa is None:
+            soa = self._compute_intervals(df)
+        if not len(soa['start_idx']):
             logger.warning("拐点数量不足，无法进行区间分析")
             return []
         
-        intervals = []
-        
-        # 遍历连续的拐点对
-        for i in range(len(turning_points) - 1):
-            start_point = turning_points.iloc[i]
-            end_point = turning_points.iloc[i + 1]
-            
-            start_time = start_point.name
-            end_time = end_point.name
-            
-            # 获取数值索引
-            start_idx = df.index.get_loc(start_time)
-            end_idx = df.index.get_loc(end_time)
-            
-            # 确定趋势方向
-            trend_direction = 'up' if start_point['turning_point'] == 1 else 'down'
-            
-            # 获取区间数据（从趋势转换时刻到下一次转换）
-            interval_data = df.iloc[start_idx:end_idx + 1]
-            
-            # 使用趋势转换时刻的价格作为起始价格
-            start_price = start_point['close']  # 趋势转换时刻的收盘价
-            end_price = end_point['close']      # 下一次转换时刻的收盘价
-            
-            # 获取区间内的最高价和最低价
-            high_price = interval_data['high'].max()
-            low_price = interval_data['low'].min()
-            
-            # 计算基本指标
-            duration = end_idx - start_idx
-            duration_hours = (end_time - start_time).total_seconds() / 3600  # 转换为小时
-            price_change = end_price - start_price
-            price_change_pct = (end_price / start_price - 1) * 100
-            
-            # 策略导向的PFE和MAE计算
-            if trend_direction == 'up':
-                # 上涨趋势（做多）：研究最大涨幅（理想值）和最大跌幅（风险值）
-                pfe = (high_price / start_price - 1) * 100  # 最大涨幅（做多理想收益）
-                mae = (start_price / low_price - 1) * 100  # 最大跌幅（做多风险损失）
-            else:
-                # 下跌趋势（做空）：研究最大跌幅（理想值）和最大涨幅（风险值）
-                pfe = (start_price / low_price - 1) * 100  # 最大跌幅（做空理想收益）
-                mae = (high_price / start_price - 1) * 100  # 最大涨幅（做空风险损失）
-            
-            interval = TrendInterval(
+        # 相邻拐点构成区间: 起点为当前拐点，终点为下一个拐点
+        # 使用趋势转换时刻的收盘价作为起始/结束价格
+        start_pos = soa['start_idx']
+        end_pos = soa['end_idx']
+        start_times = df.index[start_pos]
+        end_times = df.index[end_pos]
+        start_prices = soa['start_close']
+        end_prices = soa['end_close']
+        high_prices = soa['high_max']
+        low_prices = soa['low_min']
+        is_up = soa['is_up']
+        
+        # 计算基本指标
+        durations = end_pos - start_pos
+        duration_hours = (end_times - start_times).total_seconds() / 3600  # 转换为小时
+        price_changes = end_prices - start_prices
+        price_change_pcts = (end_prices / start_prices - 1) * 100
+        
+        # 策略导向的PFE和MAE
+        # 上涨趋势（做多）：PFE为最大涨幅（理想收益），MAE为最大跌幅（风险损失）
+        # 下跌趋势（做空）：PFE为最大跌幅（理想收益），MAE为最大涨幅（风险损失）
+        pfe_pct, mae_pct = self._excursion_pct(is_up, start_prices, high_prices, low_prices)
+        
+        intervals = [
+            TrendInterval(
                 start_idx=start_idx,
                 end_idx=end_idx,
                 start_time=start_time,
                 end_time=end_time,
-                trend_direction=trend_direction,
+                trend_direction='up' if up else 'down',
                 start_price=start_price,
                 end_price=end_price,
                 high_price=high_price,
                 low_price=low_price,
                 duration=duration,
-                duration_hours=duration_hours,
+                duration_hours=hours,
                 price_change=price_change,
                 price_change_pct=price_change_pct,
                 pfe=pfe,
@@ -262,51 +320,56 @@ class TrendAnalyzer:
                 pfe_pct=pfe,
                 mae_pct=mae
             )
-            intervals.append(interval)
+            for (start_idx, end_idx, start_time, end_time, up, start_price, end_price,
+                 high_price, low_price, duration, hours, price_change, price_change_pct, pfe, mae)
+            in zip(start_pos.tolist(), end_pos.tolist(), start_times, end_times, is_up.tolist(),
+                   start_prices.tolist(), end_prices.tolist(), high_prices.tolist(), low_prices.tolist(),
+                   durations.tolist(), duration_hours.tolist(), price_changes.tolist(),
+                   price_change_pcts.tolist(), pfe_pct.tolist(), mae_pct.tolist())
+        ]
         
         logger.info(f"完成趋势区间分析 - 共分析 {len(intervals)} 个区间")
         return intervals
     
-    def analyze_downtrend_metrics(self, df: pd.DataFrame) -> Dict:
+    def analyze_downtrend_metrics(self, df: pd.DataFrame,
+                                  soa: Optional[Dict[str, np.ndarray]] = None) -> Dict:
         """
         专门分析下跌趋势的完整指标
         包括：做空收益、做多损失、最大下跌幅度、最大上涨幅度
         
         Args:
             df: 包含拐点数据的DataFrame
+            soa: 已由 _compute_intervals 计算好的区间数组，省略时现场计算
             
         Returns:
             下跌趋势分析结果字典
         """
         logger.info("开始下跌趋势专项分析")
         
-        # 获取所有下跌趋势区间
-        turning_points = df[df['turning_point'] != 0].copy()
+        # 所有区间共用一次分段归约的结果，按方向筛选出下跌趋势（下拐点开始）的区间
+        if soa is None:
+            soa = self._compute_intervals(df)
         downtrend_intervals = []
         
-        for i in range(len(turning_points) - 1):
-            start_point = turning_points.iloc[i]
-            end_point = turning_points.iloc[i + 1]
+        if len(soa['start_idx']):
+            mask = ~soa['is_up']
+            start_pos = soa['start_idx'][mask]
+            end_pos = soa['end_idx'][mask]
+            start_prices = soa['start_close'][mask]
+            end_prices = soa['end_close'][mask]
+            high_prices = soa['high_max'][mask]
+            low_prices = soa['low_min'][mask]
             
-            # 只分析下跌趋势（下拐点开始）
-            if start_point['turning_point'] == -1:
-                start_time = start_point.name
-                end_time = end_point.name
-                
-                # 获取数值索引
-                start_idx = df.index.get_loc(start_time)
-                end_idx = df.index.get_loc(end_time)
-                
-                # 获取区间数据
-                interval_data = df.iloc[start_idx:end_idx + 1]
-                
-                # 趋势转换时刻的价格
-                start_price = start_point['close']
-                end_price = end_point['close']
-                
-                # 区间内的最高价和最低价
-                high_price = interval_data['high'].max()
-                low_price = interval_data['low'].min()
+            # 最大跌幅/最大涨幅（比例），下面各指标共用
+            declines = start_prices / low_prices - 1
+            rallies = high_prices / start_prices - 1
+            
+            for start_idx, end_idx, start_price, end_price, high_price, low_price, decline, rally in zip(
+                start_pos.tolist(), end_pos.tolist(), start_prices.tolist(), end_prices.tolist(),
+                high_prices.tolist(), low_prices.tolist(), declines.tolist(), rallies.tolist()
+            ):
+                start_time = df.index[start_idx]
+                end_time = df.index[end_idx]
                 
                 # 计算下跌趋势的完整指标（做空策略分析）
                 downtrend_metrics = {
@@ -318,16 +381,16 @@ class TrendAnalyzer:
                     'low_price': low_price,
                     
                     # 做空策略分析
-                    'short_ideal_profit': (start_price / low_price - 1) * 100,  # 最大跌幅（做空理想收益）
+                    'short_ideal_profit': decline * 100,  # 最大跌幅（做空理想收益）
                     'short_actual_profit': (start_price / end_price - 1) * 100,  # 实际做空收益
-                    'short_risk_loss': (high_price / start_price - 1) * 100,    # 最大涨幅（做空风险损失）
+                    'short_risk_loss': rally * 100,    # 最大涨幅（做空风险损失）
                     
                     # 价格波动指标
-                    'max_decline': (start_price / low_price - 1) * 100,  # 最大下跌幅度
-                    'max_rally': (high_price / start_price - 1) * 100,   # 最大上涨幅度
+                    'max_decline': decline * 100,  # 最大下跌幅度
+                    'max_rally': rally * 100,   # 最大上涨幅度
                     
                     # 风险收益比
-                    'risk_reward_ratio': (start_price / low_price - 1) / (high_price / start_price - 1) if (high_price / start_price - 1) > 0 else float('inf'),
+                    'risk_reward_ratio': decline / rally if rally > 0 else float('inf'),
                     
                     # 持续时间
                     'duration': end_idx - start_idx,
@@ -360,46 +423,45 @@ class TrendAnalyzer:
         logger.info(f"完成下跌趋势分析 - 共分析 {len(downtrend_intervals)} 个下跌趋势")
         return summary
     
-    def analyze_uptrend_metrics(self, df: pd.DataFrame) -> Dict:
+    def analyze_uptrend_metrics(self, df: pd.DataFrame,
+                                soa: Optional[Dict[str, np.ndarray]] = None) -> Dict:
         """
         专门分析上涨趋势的完整指标
         包括：做多收益、做多损失、最大涨幅、最大跌幅
         
         Args:
             df: 包含拐点数据的DataFrame
+            soa: 已由 _compute_intervals 计算好的区间数组，省略时现场计算
             
         Returns:
             上涨趋势分析结果字典
         """
         logger.info("开始上涨趋势专项分析")
         
-        # 获取所有上涨趋势区间
-        turning_points = df[df['turning_point'] != 0].copy()
+        # 所有区间共用一次分段归约的结果，按方向筛选出上涨趋势（上拐点开始）的区间
+        if soa is None:
+            soa = self._compute_intervals(df)
         uptrend_intervals = []
         
-        for i in range(len(turning_points) - 1):
-            start_point = turning_points.iloc[i]
-            end_point = turning_points.iloc[i + 1]
+        if len(soa['start_idx']):
+            mask = soa['is_up']
+            start_pos = soa['start_idx'][mask]
+            end_pos = soa['end_idx'][mask]
+            start_prices = soa['start_close'][mask]
+            end_prices = soa['end_close'][mask]
+            high_prices = soa['high_max'][mask]
+            low_prices = soa['low_min'][mask]
             
-            # 只分析上涨趋势（上拐点开始）
-            if start_point['turning_point'] == 1:
-                start_time = start_point.name
-                end_time = end_point.name
-                
-                # 获取数值索引
-                start_idx = df.index.get_loc(start_time)
-                end_idx = df.index.get_loc(end_time)
-                
-                # 获取区间数据
-                interval_data = df.iloc[start_idx:end_idx + 1]
-                
-                # 趋势转换时刻的价格
-                start_price = start_point['close']
-                end_price = end_point['close']
-                
-                # 区间内的最高价和最低价
-                high_price = interval_data['high'].max()
-                low_price = interval_data['low'].min()
+            # 最大涨幅/最大跌幅（比例），下面各指标共用
+            rallies = high_prices / start_prices - 1
+            declines = start_prices / low_prices - 1
+            
+            for start_idx, end_idx, start_price, end_price, high_price, low_price, decline, rally in zip(
+                start_pos.tolist(), end_pos.tolist(), start_prices.tolist(), end_prices.tolist(),
+                high_prices.tolist(), low_prices.tolist(), declines.tolist(), rallies.tolist()
+            ):
+                start_time = df.index[start_idx]
+                end_time = df.index[end_idx]
                 
                 # 计算上涨趋势的完整指标（做多策略分析）
                 uptrend_metrics = {
@@ -411,16 +473,16 @@ class TrendAnalyzer:
                     'low_price': low_price,
                     
                     # 做多策略分析
-                    'long_ideal_profit': (high_price / start_price - 1) * 100,  # 最大涨幅（做多理想收益）
+                    'long_ideal_profit': rally * 100,  # 最大涨幅（做多理想收益）
                     'long_actual_profit': (end_price / start_price - 1) * 100,  # 实际做多收益
-                    'long_risk_loss': (start_price / low_price - 1) * 100,      # 最大跌幅（做多风险损失）
+                    'long_risk_loss': decline * 100,      # 最大跌幅（做多风险损失）
                     
                     # 价格波动指标
-                    'max_rally': (high_price / start_price - 1) * 100,   # 最大上涨幅度
-                    'max_decline': (start_price / low_price - 1) * 100,  # 最大下跌幅度
+                    'max_rally': rally * 100,   # 最大上涨幅度
+                    'max_decline': decline * 100,  # 最大下跌幅度
                     
                     # 风险收益比
-                    'risk_reward_ratio': (high_price / start_price - 1) / (start_price / low_price - 1) if (start_price / low_price - 1) > 0 else float('inf'),
+                    'risk_reward_ratio': rally / decline if decline > 0 else float('inf'),
                     
                     # 持续时间
                     'duration': end_idx - start_idx,
@@ -469,13 +531,57 @@ class TrendAnalyzer:
         if not intervals:
             return {"error": "没有可分析的区间数据"}
         
+        # 区间和事件各转换为一个结构化数组（每个对象只访问一次），之后的统计都是数组归约
+        interval_stats = np.array(
+            [(i.trend_direction == 'up', i.duration, i.price_change_pct, i.pfe_pct, i.mae_pct)
+             for i in intervals],
+            dtype=_INTERVAL_STATS_DTYPE
+        )
+        event_stats = np.array(
+            [(e.event_type == 'up_turn', e.volatility, e.consistency,
+              e.price_changes[0] if len(e.price_changes) > 0 else np.nan,
+              e.price_changes[4] if len(e.price_changes) > 4 else np.nan)
+             for e in events],
+            dtype=_EVENT_STATS_DTYPE
+        )
+        
         # 分离上升和下降趋势
-        up_intervals = [i for i in intervals if i.trend_direction == 'up']
-        down_intervals = [i for i in intervals if i.trend_direction == 'down']
+        up_intervals = interval_stats[interval_stats['is_up']]
+        down_intervals = interval_stats[~interval_stats['is_up']]
         
         # 分离上升和下降事件
-        up_events = [e for e in events if e.event_type == 'up_turn']
-        down_events = [e for e in events if e.event_type == 'down_turn']
+        up_events = event_stats[event_stats['is_up']]
+        down_events = event_stats[~event_stats['is_up']]
+        
+        def interval_summary(trends: np.ndarray, win: np.ndarray) -> Dict:
+            if not len(trends):
+                return {"count": 0, "avg_duration": 0, "avg_price_change_pct": 0, "max_price_change_pct": 0,
+                        "min_price_change_pct": 0, "avg_pfe_pct": 0, "max_pfe_pct": 0,
+                        "avg_mae_pct": 0, "max_mae_pct": 0, "win_rate": 0}
+            return {
+                "count": len(trends),
+                "avg_duration": trends['duration'].mean(),
+                "avg_price_change_pct": trends['price_change_pct'].mean(),
+                "max_price_change_pct": trends['price_change_pct'].max(),
+                "min_price_change_pct": trends['price_change_pct'].min(),
+                "avg_pfe_pct": trends['pfe_pct'].mean(),
+                "max_pfe_pct": trends['pfe_pct'].max(),
+                "avg_mae_pct": trends['mae_pct'].mean(),
+                "max_mae_pct": trends['mae_pct'].max(),
+                "win_rate": int(win.sum()) / len(trends)
+            }
+        
+        def event_summary(turns: np.ndarray) -> Dict:
+            if not len(turns):
+                return {"count": 0, "avg_volatility": 0, "avg_consistency": 0,
+                        "avg_price_change_1h": 0, "avg_price_change_5h": 0}
+            return {
+                "count": len(turns),
+                "avg_volatility": turns['volatility'].mean(),
+                "avg_consistency": turns['consistency'].mean(),
+                "avg_price_change_1h": _nanmean(turns['price_change_1h']),
+                "avg_price_change_5h": _nanmean(turns['price_change_5h'])
+            }
         
         report = {
             "summary": {
@@ -487,67 +593,36 @@ class TrendAnalyzer:
                 "down_events": len(down_events)
             },
             "interval_analysis": {
-                "up_trends": {
-                    "count": len(up_intervals),
-                    "avg_duration": np.mean([i.duration for i in up_intervals]) if up_intervals else 0,
-                    "avg_price_change_pct": np.mean([i.price_change_pct for i in up_intervals]) if up_intervals else 0,
-                    "max_price_change_pct": np.max([i.price_change_pct for i in up_intervals]) if up_intervals else 0,
-                    "min_price_change_pct": np.min([i.price_change_pct for i in up_intervals]) if up_intervals else 0,
-                    "avg_pfe_pct": np.mean([i.pfe_pct for i in up_intervals]) if up_intervals else 0,
-                    "max_pfe_pct": np.max([i.pfe_pct for i in up_intervals]) if up_intervals else 0,
-                    "avg_mae_pct": np.mean([i.mae_pct for i in up_intervals]) if up_intervals else 0,
-                    "max_mae_pct": np.max([i.mae_pct for i in up_intervals]) if up_intervals else 0,
-                    "win_rate": sum(1 for i in up_intervals if i.price_change_pct > 0) / len(up_intervals) if up_intervals else 0
-                },
-                "down_trends": {
-                    "count": len(down_intervals),
-                    "avg_duration": np.mean([i.duration for i in down_intervals]) if down_intervals else 0,
-                    "avg_price_change_pct": np.mean([i.price_change_pct for i in down_intervals]) if down_intervals else 0,
-                    "max_price_change_pct": np.max([i.price_change_pct for i in down_intervals]) if down_intervals else 0,
-                    "min_price_change_pct": np.min([i.price_change_pct for i in down_intervals]) if down_intervals else 0,
-                    "avg_pfe_pct": np.mean([i.pfe_pct for i in down_intervals]) if down_intervals else 0,
-                    "max_pfe_pct": np.max([i.pfe_pct for i in down_intervals]) if down_intervals else 0,
-                    "avg_mae_pct": np.mean([i.mae_pct for i in down_intervals]) if down_intervals else 0,
-                    "max_mae_pct": np.max([i.mae_pct for i in down_intervals]) if down_intervals else 0,
-                    "win_rate": sum(1 for i in down_intervals if i.price_change_pct < 0) / len(down_intervals) if down_intervals else 0
-                }
+                "up_trends": interval_summary(up_intervals, up_intervals['price_change_pct'] > 0),
+                "down_trends": interval_summary(down_intervals, down_intervals['price_change_pct'] < 0)
             },
             "event_analysis": {
-                "up_turns": {
-                    "count": len(up_events),
-                    "avg_volatility": np.mean([e.volatility for e in up_events]) if up_events else 0,
-                    "avg_consistency": np.mean([e.consistency for e in up_events]) if up_events else 0,
-                    "avg_price_change_1h": np.mean([e.price_changes[0] for e in up_events if len(e.price_changes) > 0]) if up_events else 0,
-                    "avg_price_change_5h": np.mean([e.price_changes[4] for e in up_events if len(e.price_changes) > 4]) if up_events else 0
-                },
-                "down_turns": {
-                    "count": len(down_events),
-                    "avg_volatility": np.mean([e.volatility for e in down_events]) if down_events else 0,
-                    "avg_consistency": np.mean([e.consistency for e in down_events]) if down_events else 0,
-                    "avg_price_change_1h": np.mean([e.price_changes[0] for e in down_events if len(e.price_changes) > 0]) if down_events else 0,
-                    "avg_price_change_5h": np.mean([e.price_changes[4] for e in down_events if len(e.price_changes) > 4]) if down_events else 0
-                }
+                "up_turns": event_summary(up_events),
+                "down_turns": event_summary(down_events)
             }
         }
         
         # 计算盈亏比
-        if up_intervals and down_intervals:
-            avg_up_profit = np.mean([i.price_change_pct for i in up_intervals if i.price_change_pct > 0])
-            avg_down_loss = abs(np.mean([i.price_change_pct for i in down_intervals if i.price_change_pct < 0]))
+        if len(up_intervals) and len(down_intervals):
+            up_changes = up_intervals['price_change_pct']
+            down_changes = down_intervals['price_change_pct']
+            avg_up_profit = np.mean(up_changes[up_changes > 0])
+            avg_down_loss = abs(np.mean(down_changes[down_changes < 0]))
             report["interval_analysis"]["profit_loss_ratio"] = avg_up_profit / avg_down_loss if avg_down_loss > 0 else float('inf')
         
         logger.info("趋势分析报告生成完成")
         return report
     
-    def run_complete_analysis(self, df: pd.DataFrame) -> Dict:
+    def run_complete_analysis(self, df: pd.DataFrame, return_details: bool = False):
         """
         运行完整的趋势分析，包括改进的算法和下跌趋势专项分析
         
         Args:
             df: 包含HMA数据的DataFrame
+            return_details: 是否同时返回事件和趋势区间列表（供可视化复用，无需再次分析）
             
         Returns:
-            完整的分析结果字典
+            完整的分析结果字典；return_details=True 时为 (结果字典, 事件列表, 区间列表)
         """
         logger.info("开始完整趋势分析")
         
@@ -557,14 +632,17 @@ class TrendAnalyzer:
         # 2. 分析事件
         events = self.analyze_events(df_with_slopes)
         
+        # 区间的分段归约只做一次，以下三项分析共用
+        soa = self._compute_intervals(df_with_slopes)
+        
         # 3. 分析趋势区间
-        intervals = self.analyze_trend_intervals(df_with_slopes)
+        intervals = self.analyze_trend_intervals(df_with_slopes, soa)
         
         # 4. 专项分析上涨趋势（做多策略）
-        uptrend_analysis = self.analyze_uptrend_metrics(df_with_slopes)
+        uptrend_analysis = self.analyze_uptrend_metrics(df_with_slopes, soa)
         
         # 5. 专项分析下跌趋势（做空策略）
-        downtrend_analysis = self.analyze_downtrend_metrics(df_with_slopes)
+        downtrend_analysis = self.analyze_downtrend_metrics(df_with_slopes, soa)
         
         # 6. 生成基础报告
         base_report = self.generate_trend_report(intervals, events)
@@ -583,4 +661,6 @@ class TrendAnalyzer:
         }
         
         logger.info("完整趋势分析完成")
+        if return_details:
+            return complete_report, events, intervals
         return complete_report
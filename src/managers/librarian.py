@@ -13,6 +13,9 @@ import json
 
 logger = logging.getLogger(__name__)
 
+# 每个行组的行数: 按时间排序后各行组带有min/max统计，按时间过滤时可整组跳过
+ROW_GROUP_SIZE = 100_000
+
 
 class Librarian:
     """档案管理部 - 负责数据存储和文件管理"""
@@ -79,15 +82,22 @@ class Librarian:
             if metadata:
                 file_metadata.update(metadata)
             
-            # 保存为Parquet格式
+            # 保存为Parquet格式，按时间列排序以便行组统计可用于谓词下推
             table = pa.Table.from_pandas(df_to_save)
+            table = table.sort_by(df_to_save.columns[0])
             
             # 添加元数据到Parquet文件
             table = table.replace_schema_metadata({
                 'metadata': json.dumps(file_metadata, ensure_ascii=False)
             })
             
-            pq.write_table(table, file_path, compression='snappy')
+            pq.write_table(
+                table, file_path,
+                row_group_size=ROW_GROUP_SIZE,
+                use_dictionary=True,
+                compression='zstd',
+                write_statistics=True
+            )
             
             logger.info(f"数据保存成功: {file_path}")
             logger.info(f"文件大小: {file_path.stat().st_size / 1024 / 1024:.2f} MB")
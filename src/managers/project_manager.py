@@ -66,7 +66,9 @@ class ProjectManager:
         try:
             # 第一步：数据采集部工作
             logger.info("📥 命令数据采集部：获取原始数据")
-            raw_data = self.data_collector.collect_historical_data(symbol, interval, years_back)
+            # 原始数据边采集边写入档案目录，不再在采集结束后整体保存一遍
+            raw_file = self.librarian.data_dir / self.librarian.generate_filename(symbol, interval, "raw")
+            raw_data = self.data_collector.collect_historical_data(symbol, interval, years_back, raw_path=raw_file)
             
             if raw_data.empty:
                 raise ValueError("数据采集部未获取到任何数据")
@@ -77,8 +79,6 @@ class ProjectManager:
                 'end': raw_data.index.max().isoformat()
             }
             
-            # 保存原始数据
-            raw_file = self.librarian.save_raw_data(raw_data, symbol, interval)
             result['files_created'].append(str(raw_file))
             logger.info(f"✅ 原始数据已保存: {raw_file.name}")
             
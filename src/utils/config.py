@@ -36,3 +36,4 @@ END_DATE = None  # 结束时间：现在（None表示当前时间）
 # 请求配置
 REQUEST_DELAY = 0.5  # 请求间隔，避免触发限制（增加延迟）
 MAX_RETRIES = 3  # 最大重试次数
+MAX_CONCURRENT_REQUESTS = 5  # 异步采集时同时进行的请求数（远低于币安IP权重限制）
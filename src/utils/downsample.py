@@ -0,0 +1,41 @@
+"""
+时间序列降采样工具
+绘图前减少折线的点数，同时保留价格序列的峰谷形态
+"""
+
+import numpy as np
+
+
+def lttb_indices(y, n_out):
+    """
+    Largest-Triangle-Three-Buckets降采样，返回保留点的位置索引
+
+    以位置作为x轴（K线等间隔），保留首尾点，中间每个桶选出与前一选中点、
+    下一桶均值构成三角形面积最大的点，能保住价格序列的峰谷形态
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # 每个桶的均值点，作为上一桶选点时的第三个顶点
+    bucket_x = (edges[:-1] + edges[1:] - 1) / 2.0
+    bucket_y = np.add.reduceat(y[:n - 1], edges[:-1]) / np.diff(edges)
+
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    prev = 0
+    for b in range(n_out - 2):
+        start, stop = edges[b], edges[b + 1]
+        if b + 1 < n_out - 2:
+            next_x, next_y = bucket_x[b + 1], bucket_y[b + 1]
+        else:
+            next_x, next_y = n - 1, y[n - 1]
+        xs = np.arange(start, stop)
+        area = np.abs((prev - next_x) * (y[start:stop] - y[prev])
+                      - (prev - xs) * (next_y - y[prev]))
+        prev = start + int(np.argmax(area))
+        indices[b + 1] = prev
+    return indices
@@ -0,0 +1,77 @@
+"""
+处理后数据文件的读取工具
+按文件名发现各周期最新的Parquet文件，并按批次流式读取为DataFrame
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+
+def read_parquet_batched(file_path, columns=None, filter_expr=None, batch_size=262144,
+                         optional_columns=(), dtypes=None):
+    """
+    按批次流式读取Parquet，逐批写入预分配的NumPy数组
+
+    峰值内存约为最终DataFrame加一个批次，而不是Arrow表与DataFrame各一份
+    optional_columns 中的列仅在文件中存在时读取；dtypes 指定的列按该类型存储
+    """
+    dtypes = dtypes or {}
+    dataset = ds.dataset(str(file_path), format='parquet')
+    columns = list(columns or dataset.schema.names)
+    columns += [name for name in optional_columns if name in dataset.schema.names]
+    n_rows = dataset.count_rows(filter=filter_expr)
+
+    buffers = {
+        name: np.empty(n_rows, dtype=dtypes.get(name) or dataset.schema.field(name).type.to_pandas_dtype())
+        for name in columns
+    }
+    offset = 0
+    for batch in dataset.to_batches(columns=columns, filter=filter_expr, batch_size=batch_size):
+        end = offset + batch.num_rows
+        for name, array in zip(columns, batch.columns):
+            values = array.to_numpy(zero_copy_only=False)
+            if (name not in dtypes and values.dtype != buffers[name].dtype
+                    and not np.can_cast(values.dtype, buffers[name].dtype)):
+                # 含空值的整数列会被转换为浮点
+                buffers[name] = buffers[name].astype(values.dtype)
+            buffers[name][offset:end] = values
+        offset = end
+
+    return pd.DataFrame(buffers, copy=False)
+
+
+# 数据文件按 {交易对}_{周期}_{类型}_{时间戳}.parquet 命名，由文件名前缀解析出分区字段
+_FILENAME_PARTITIONING = ds.FilenamePartitioning(pa.schema([
+    ('symbol', pa.string()), ('interval', pa.string()), ('data_type', pa.string())
+]))
+
+
+def discover_processed_files(data_dir, intervals, symbol='ETHUSDT'):
+    """
+    发现各周期最新的处理后数据文件
+
+    文件名前缀作为分区字段交给 pyarrow.dataset 解析，按分区条件筛选文件，
+    同一周期有多个文件时取时间戳最新的一个
+
+    Returns:
+        {周期: 文件路径}
+    """
+    files = sorted(str(path) for path in Path(data_dir).glob('*.parquet'))
+    if not files:
+        return {}
+
+    dataset = ds.dataset(files, format='parquet', partitioning=_FILENAME_PARTITIONING)
+    wanted = ((ds.field('symbol') == symbol) & (ds.field('data_type') == 'processed')
+              & ds.field('interval').isin(list(intervals)))
+    latest = {}
+    for fragment in dataset.get_fragments(filter=wanted):
+        keys = ds.get_partition_keys(fragment.partition_expression)
+        if keys.get('data_type') != 'processed':
+            # 文件名不符合命名规则时没有分区字段
+            continue
+        latest[keys['interval']] = fragment.path  # 文件按名称排序，后出现的时间戳更新
+    return latest
@@ -5,7 +5,6 @@
 
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-import seaborn as sns
 import pandas as pd
 import numpy as np
 from datetime import datetime
@@ -45,7 +44,8 @@ class StrategyVisualizer:
         self.output_dir = output_dir
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        # 设置图表样式
+        # 设置图表样式（seaborn只用于调色板，创建可视化器时才导入）
+        import seaborn as sns
         plt.style.use('seaborn-v0_8')
         sns.set_palette("husl")
         